@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+
+from logic.linktree import link_tree
+
+# Total size of the extracted trees kept before the least recently used go
+DEFAULT_ARCHIVE_CACHE_BYTES = 2 * 1024**3
+
+# Guards inserts, evictions and links out of the cache across jobs
+_CACHE_LOCK = threading.Lock()
+
+
+def file_digest(path) -> str:
+    """Returns the SHA-256 of a file, read as a stream."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _tree_size(path) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            total += os.lstat(os.path.join(dirpath, name)).st_size
+    return total
+
+
+class ArchiveCache:
+    """
+    An LRU cache of extracted archive trees, bounded by their total size.
+
+    Each entry is a directory named after its key, holding the extracted
+    "tree" and a "meta.json" with whatever the extractor needs to rebuild
+    its result. The entry directory's mtime records when it was last used.
+    """
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_ARCHIVE_CACHE_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def peek(self, key):
+        """
+        Reads the metadata cached under key without materializing its tree
+        or marking it as used.
+
+        Returns:
+            dict | None: The entry's metadata, or None on a cache miss.
+        """
+        with _CACHE_LOCK:
+            try:
+                return json.loads((self.cache_dir / key / "meta.json").read_text())
+            except (OSError, ValueError):
+                return None
+
+    def get(self, key, target_dir):
+        """
+        Materializes the tree cached under key into target_dir.
+
+        Returns:
+            dict | None: The entry's metadata, or None on a cache miss.
+        """
+        entry = self.cache_dir / key
+        with _CACHE_LOCK:
+            if not entry.exists():
+                return None
+            meta = json.loads((entry / "meta.json").read_text())
+            link_tree(str(entry / "tree"), str(target_dir))
+            os.utime(entry)
+        print(f"Reused extracted archive {key[:12]} from {entry}")
+        return meta
+
+    def put(self, key, extract, target_dir):
+        """
+        Fills the entry for key by calling extract(tree_dir) -> meta, then
+        materializes it into target_dir and evicts old entries if needed.
+
+        Returns:
+            dict: The metadata returned by extract.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        staging = self.cache_dir / f".tmp-{uuid.uuid4().hex[:8]}"
+        try:
+            (staging / "tree").mkdir(parents=True)
+            meta = extract(str(staging / "tree"))
+            meta["bytes"] = _tree_size(staging / "tree")
+            (staging / "meta.json").write_text(json.dumps(meta))
+
+            entry = self.cache_dir / key
+            with _CACHE_LOCK:
+                try:
+                    os.rename(staging, entry)
+                except OSError:
+                    # Another job stored the same archive in the meantime
+                    if not entry.exists():
+                        raise
+                os.utime(entry)
+                link_tree(str(entry / "tree"), str(target_dir))
+                self._evict(keep=key)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return meta
+
+    def _evict(self, keep=None):
+        """Removes the least recently used entries until the cache fits."""
+        entries = []
+        total = 0
+        for entry in self.cache_dir.iterdir():
+            if entry.name.startswith(".") or not entry.is_dir():
+                continue
+            try:
+                size = json.loads((entry / "meta.json").read_text())["bytes"]
+            except (OSError, ValueError, KeyError):
+                size = _tree_size(entry)
+            entries.append((entry.stat().st_mtime, entry, size))
+            total += size
+
+        for _, entry, size in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            if entry.name == keep:
+                continue
+            print(f"Evicting extracted archive {entry.name[:12]} ({size} bytes)")
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
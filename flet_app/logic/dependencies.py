@@ -0,0 +1,281 @@
+import hashlib
+import os
+import posixpath
+import re
+import threading
+import tomllib
+
+# Manifests read by resolve_dependencies, in merge order
+PYTHON_MANIFESTS = ["requirements.txt", "pyproject.toml", "Pipfile", "uv.lock"]
+
+_NAME_RE = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[([^\]]*)\])?\s*(.*)$")
+_EGG_RE = re.compile(r"[#&]egg=([A-Za-z0-9][A-Za-z0-9._-]*)")
+
+# Parsed manifests by (kind, SHA-256 of the content), and the SHA-256 of files
+# on disk by (path, mtime, size), so an unchanged file is neither re-read
+# nor re-parsed
+_PARSE_CACHE = {}
+_DIGEST_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def normalize_name(name: str) -> str:
+    """Normalizes a distribution name as PEP 503 does ("Flask_Login" -> "flask-login")."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def parse_requirement(spec: str):
+    """
+    Parses one PEP 508 requirement ("name[extras] specifier ; marker").
+
+    Returns:
+        dict | None: name, extras, specifier and marker; None if spec doesn't
+                     name a distribution (an option or a bare URL).
+    """
+    spec, _, marker = spec.partition(";")
+    egg = _EGG_RE.search(spec)
+    if egg:  # -e git+https://...#egg=name
+        return {"name": normalize_name(egg.group(1)), "extras": [], "specifier": "", "marker": marker.strip()}
+    match = _NAME_RE.match(spec)
+    if not match or "://" in match.group(1):
+        return None
+    name, extras, specifier = match.groups()
+    specifier = specifier.strip()
+    if "://" in specifier and not specifier.startswith("@"):
+        return None
+    return {
+        "name": normalize_name(name),
+        "extras": sorted(e.strip() for e in (extras or "").split(",") if e.strip()),
+        "specifier": specifier,
+        "marker": marker.strip(),
+    }
+
+
+def _parse_requirements_file(content):
+    """
+    Returns (requirements, includes, constraints) of a requirements file,
+    where includes and constraints are the paths given with -r and -c.
+    """
+    requirements, includes, constraints = [], [], []
+    # Backslash continuations join lines before anything else
+    for line in content.replace("\\\n", " ").splitlines():
+        line = re.sub(r"(^|\s)#.*$", "", line).strip()
+        if not line:
+            continue
+        option = re.match(r"^(-r|--requirement|-c|--constraint)[\s=]+(\S+)", line)
+        if option:
+            target = includes if option.group(1) in ("-r", "--requirement") else constraints
+            target.append(option.group(2))
+            continue
+        if line.startswith(("-e ", "--editable")):
+            line = line.split(None, 1)[1] if " " in line else ""
+        elif line.startswith("-"):
+            continue  # --index-url, --hash, -f ...
+        line = re.sub(r"\s--hash[=\s]\S+", "", line)
+        requirement = parse_requirement(line)
+        if requirement:
+            requirements.append(requirement)
+    return requirements, includes, constraints
+
+
+def _parse_pyproject(content):
+    data = tomllib.loads(content)
+    requirements = [
+        requirement
+        for spec in data.get("project", {}).get("dependencies", [])
+        if (requirement := parse_requirement(spec))
+    ]
+    poetry = data.get("tool", {}).get("poetry", {}).get("dependencies", {})
+    for name, constraint in poetry.items():
+        if name.lower() == "python":
+            continue
+        if isinstance(constraint, dict):
+            extras = sorted(constraint.get("extras", []))
+            marker = constraint.get("markers", "")
+            constraint = constraint.get("version", "")
+        else:
+            extras, marker = [], ""
+        requirements.append(
+            {
+                "name": normalize_name(name),
+                "extras": extras,
+                "specifier": "" if constraint == "*" else constraint,
+                "marker": marker,
+            }
+        )
+    return requirements
+
+
+def _parse_pipfile(content):
+    requirements = []
+    for name, constraint in tomllib.loads(content).get("packages", {}).items():
+        marker = ""
+        extras = []
+        if isinstance(constraint, dict):
+            extras = sorted(constraint.get("extras", []))
+            marker = constraint.get("markers", "")
+            constraint = constraint.get("version", "")
+        requirements.append(
+            {
+                "name": normalize_name(name),
+                "extras": extras,
+                "specifier": "" if constraint == "*" else constraint,
+                "marker": marker,
+            }
+        )
+    return requirements
+
+
+def _parse_uv_lock(content):
+    requirements = []
+    for package in tomllib.loads(content).get("package", []):
+        source = package.get("source", {})
+        # The project itself is locked too, as an editable or virtual package
+        if "editable" in source or "virtual" in source:
+            continue
+        requirements.append(
+            {
+                "name": normalize_name(package["name"]),
+                "extras": [],
+                "specifier": f"=={package['version']}" if "version" in package else "",
+                "marker": "",
+            }
+        )
+    return requirements
+
+
+_PARSERS = {
+    "requirements": _parse_requirements_file,
+    "pyproject.toml": _parse_pyproject,
+    "Pipfile": _parse_pipfile,
+    "uv.lock": _parse_uv_lock,
+}
+
+
+def _stat_key(view, path):
+    """Returns (absolute path, mtime, size) for views backed by a folder on disk."""
+    root = getattr(view, "root", None)
+    if root is None:
+        return None
+    full_path = os.path.abspath(os.path.join(root, path))
+    try:
+        stat = os.stat(full_path)
+    except OSError:
+        return None
+    return full_path, stat.st_mtime_ns, stat.st_size
+
+
+def _parse(kind, view, path):
+    """
+    Parses a manifest, reusing the result for content parsed before.
+
+    Returns:
+        The parser's result, or None if the manifest doesn't exist.
+    """
+    if not view.exists(path) or view.isdir(path):
+        return None
+
+    # An unchanged (mtime, size) on disk skips even reading the file
+    stat_key = _stat_key(view, path)
+    with _CACHE_LOCK:
+        digest = _DIGEST_CACHE.get(stat_key)
+        if digest is not None and (kind, digest) in _PARSE_CACHE:
+            return _PARSE_CACHE[(kind, digest)]
+
+    with view.open(path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    key = (kind, digest)
+    with _CACHE_LOCK:
+        if stat_key is not None:
+            _DIGEST_CACHE[stat_key] = digest
+        if key in _PARSE_CACHE:
+            return _PARSE_CACHE[key]
+    content = raw.decode("utf-8", errors="replace")
+    try:
+        parsed = _PARSERS[kind](content)
+    except (tomllib.TOMLDecodeError, KeyError, TypeError, AttributeError) as e:
+        print(f"Could not parse {path}: {e}")
+        parsed = ([], [], []) if kind == "requirements" else []
+    with _CACHE_LOCK:
+        _PARSE_CACHE[key] = parsed
+    return parsed
+
+
+def resolve_dependencies(view):
+    """
+    Merges the Python dependencies declared by a project into one set.
+
+    Reads requirements.txt (following -r includes and -c constraint files),
+    pyproject.toml (PEP 621 and Poetry), Pipfile and uv.lock through a
+    project view. Each manifest is parsed once per distinct content, so
+    repeated calls on an unchanged tree are cheap.
+
+    Args:
+        view: A DirectoryProjectView, ProjectIndex or ArchiveProjectView.
+
+    Returns:
+        dict: normalized name -> {"name", "extras", "specifiers", "markers",
+              "sources", "constraints"}, where sources lists the manifests
+              declaring it and constraints the specifiers -c files put on
+              it. As with pip, a constrained package that no manifest
+              declares isn't included.
+    """
+    merged = {}
+
+    def add(requirement, source):
+        entry = merged.setdefault(
+            requirement["name"],
+            {
+                "name": requirement["name"],
+                "extras": [],
+                "specifiers": [],
+                "markers": [],
+                "sources": [],
+                "constraints": [],
+            },
+        )
+        for key, value in (
+            ("extras", requirement["extras"]),
+            ("specifiers", [requirement["specifier"]] if requirement["specifier"] else []),
+            ("markers", [requirement["marker"]] if requirement["marker"] else []),
+            ("sources", [source]),
+        ):
+            for item in value:
+                if item not in entry[key]:
+                    entry[key].append(item)
+
+    # (path, whether it was given with -c); everything a constraint file
+    # includes only constrains too
+    pending = [("requirements.txt", False)]
+    constraints = []
+    seen = set()
+    while pending:
+        path, is_constraint = pending.pop(0)
+        path = posixpath.normpath(path)
+        if (path, is_constraint) in seen or path.startswith(".."):
+            continue
+        seen.add((path, is_constraint))
+        parsed = _parse("requirements", view, path)
+        if parsed is None:
+            continue
+        requirements, includes, constraint_files = parsed
+        for requirement in requirements:
+            if is_constraint:
+                constraints.append(requirement)
+            else:
+                add(requirement, path)
+        base = posixpath.dirname(path)
+        pending.extend((posixpath.join(base, include), is_constraint) for include in includes)
+        pending.extend((posixpath.join(base, include), True) for include in constraint_files)
+
+    for manifest in PYTHON_MANIFESTS[1:]:
+        for requirement in _parse(manifest, view, manifest) or []:
+            add(requirement, manifest)
+
+    # Constraints only narrow what the manifests above declare
+    for requirement in constraints:
+        entry = merged.get(requirement["name"])
+        if entry and requirement["specifier"] and requirement["specifier"] not in entry["constraints"]:
+            entry["constraints"].append(requirement["specifier"])
+    return merged
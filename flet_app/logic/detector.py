@@ -0,0 +1,141 @@
+import json
+
+from logic.dependencies import resolve_dependencies
+from logic.java_build import read_java_build
+
+# Display names of the framework ids used across the wizard
+FRAMEWORK_NAMES = {
+    "flask": "Flask",
+    "django": "Django",
+    "fastapi": "FastAPI",
+    "go": "Go",
+    "expressjs": "Express.js",
+    "spring-boot": "Spring Boot",
+}
+
+# Python packages that identify a framework when declared as a dependency
+PYTHON_FRAMEWORK_PACKAGES = {"flask": "flask", "django": "django", "fastapi": "fastapi"}
+
+# Below this confidence the detection is reported but not preselected
+MIN_CONFIDENCE = 0.6
+
+# Points per kind of evidence; a declared dependency outweighs a bare file
+_DEPENDENCY_SCORE = 3
+_ENTRYPOINT_SCORE = 2
+_MANIFEST_SCORE = 1
+
+# A winner with fewer points than this has its confidence scaled down by the
+# shortfall: a bare package.json or pom.xml (a React frontend, a plain Maven
+# library) wins alone but says little, so it must not be preselected
+FULL_CONFIDENCE_SCORE = _DEPENDENCY_SCORE
+
+
+class FrameworkDetector:
+    """
+    Guesses a project's framework from its marker files and dependency
+    manifests in the project root.
+
+    Only the manifests are read (the Python ones via resolve_dependencies,
+    package.json, go.mod, pom.xml, build.gradle), through the same view
+    interface ApplicationProcessor uses, so detection costs a handful of
+    small reads whatever the size of the tree.
+    """
+
+    def __init__(self, view):
+        """
+        Args:
+            view: A DirectoryProjectView, ProjectIndex or ArchiveProjectView.
+        """
+        self.view = view
+        self.scores = {framework: 0 for framework in FRAMEWORK_NAMES}
+        self.evidence = {framework: [] for framework in FRAMEWORK_NAMES}
+
+    def _add(self, framework, points, reason):
+        self.scores[framework] += points
+        self.evidence[framework].append(reason)
+
+    def _read(self, path):
+        if not self.view.exists(path):
+            return None
+        with self.view.open(path, "rb") as f:
+            return f.read().decode("utf-8", errors="replace")
+
+    def detect(self):
+        """
+        Scores every framework and picks the best one.
+
+        Returns:
+            dict: framework (None if nothing matched), name, confidence (the
+                  winner's share of all points, 0 to 1, scaled down if the
+                  winner has under FULL_CONFIDENCE_SCORE points), preselect
+                  (whether confidence reaches MIN_CONFIDENCE), scores and
+                  evidence.
+        """
+        self._detect_python()
+        self._detect_node()
+        self._detect_go()
+        self._detect_java()
+
+        total = sum(self.scores.values())
+        best = max(self.scores, key=self.scores.get)
+        if not total:
+            best = None
+        confidence = 0.0
+        if best:
+            share = self.scores[best] / total
+            strength = min(1.0, self.scores[best] / FULL_CONFIDENCE_SCORE)
+            confidence = round(share * strength, 2)
+        result = {
+            "framework": best,
+            "name": FRAMEWORK_NAMES.get(best),
+            "confidence": confidence,
+            "preselect": confidence >= MIN_CONFIDENCE,
+            "scores": {fw: score for fw, score in self.scores.items() if score},
+            "evidence": {fw: reasons for fw, reasons in self.evidence.items() if reasons},
+        }
+        print(f"Framework detection: {result}")
+        return result
+
+    def _detect_python(self):
+        dependencies = resolve_dependencies(self.view)
+        for package, framework in PYTHON_FRAMEWORK_PACKAGES.items():
+            if package in dependencies:
+                sources = ", ".join(dependencies[package]["sources"])
+                self._add(framework, _DEPENDENCY_SCORE, f"{package} in {sources}")
+        if self.view.exists("manage.py"):
+            self._add("django", _ENTRYPOINT_SCORE, "manage.py")
+
+    def _detect_node(self):
+        content = self._read("package.json")
+        if content is None:
+            return
+        self._add("expressjs", _MANIFEST_SCORE, "package.json")
+        try:
+            data = json.loads(content)
+        except ValueError:
+            return
+        if not isinstance(data, dict):
+            return
+        # Sections that aren't objects (null, a list) declare nothing
+        dependencies = {}
+        for section in ("dependencies", "devDependencies"):
+            if isinstance(data.get(section), dict):
+                dependencies.update(data[section])
+        if "express" in dependencies:
+            self._add("expressjs", _DEPENDENCY_SCORE, "express in package.json")
+
+    def _detect_go(self):
+        if self.view.exists("go.mod"):
+            self._add("go", _DEPENDENCY_SCORE, "go.mod")
+
+    def _detect_java(self):
+        try:
+            build = read_java_build(self.view)
+        except ValueError:
+            # An unreadable pom.xml still says it's a Maven project
+            build = {"build_file": "pom.xml", "spring_boot": False, "evidence": []}
+        if build is None:
+            return
+        self._add("spring-boot", _MANIFEST_SCORE, build["build_file"])
+        if build["spring_boot"]:
+            self._add("spring-boot", _DEPENDENCY_SCORE, f"Spring Boot in {build['evidence'][0]}")
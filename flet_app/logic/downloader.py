@@ -1,60 +1,1004 @@
+import difflib
+import hashlib
+import json
 import os
+import posixpath
+import re
 import shutil
+import signal
 import subprocess
+import tarfile
+import tempfile
+import threading
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from urllib.parse import urlparse
+from urllib.parse import quote, urlparse
 
-# TODO:
-# - When it can not find the subfolder in git it doesn't error out here
-# it errors in processor and thinks requirements.txt is not there
+from logic.ignore import IgnoreRules
+from logic.linktree import link_tree
+
+_SHA_RE = re.compile(r"^[0-9a-f]{40}$")
+
+# Matches git's --progress lines, e.g.
+#   "Receiving objects:  45% (450/1000), 1.20 MiB | 2.00 MiB/s"
+#   "remote: Enumerating objects: 5, done."
+_PROGRESS_RE = re.compile(
+    r"^(?:remote: )?(?P<phase>[A-Z][A-Za-z ]+?):\s+"
+    r"(?:(?P<percent>\d+)% \((?P<objects>\d+)/(?P<total>\d+)\)|(?P<count>\d+))"
+    r"(?:, (?P<size>[\d.]+) (?P<size_unit>bytes|[KMGT]iB))?"
+    r"(?: \| (?P<rate>[\d.]+) (?P<rate_unit>bytes|[KMGT]iB)/s)?"
+    r"(?P<done>, done\.?)?"
+)
+_UNITS = {"bytes": 1, "KiB": 1024, "MiB": 1024**2, "GiB": 1024**3, "TiB": 1024**4}
+
+
+def parse_git_progress(line: str) -> dict | None:
+    """
+    Parses one line of git --progress output.
+
+    Returns:
+        dict: phase, percent, objects, total_objects, bytes, bytes_per_second
+              and done, or None if the line is not a progress line. Fields git
+              did not report are None.
+    """
+    match = _PROGRESS_RE.match(line.strip())
+    if not match:
+        return None
+    percent = match.group("percent")
+    objects = match.group("objects") or match.group("count")
+    total = match.group("total")
+    size = match.group("size")
+    rate = match.group("rate")
+    return {
+        "phase": match.group("phase"),
+        "percent": int(percent) if percent else None,
+        "objects": int(objects),
+        "total_objects": int(total) if total else None,
+        "bytes": int(float(size) * _UNITS[match.group("size_unit")]) if size else None,
+        "bytes_per_second": (
+            int(float(rate) * _UNITS[match.group("rate_unit")]) if rate else None
+        ),
+        "done": bool(match.group("done")),
+    }
+
+
+# One lock per mirror so concurrent downloads of the same repo don't fetch into
+# the same bare repository at the same time.
+_MIRROR_LOCKS = {}
+_MIRROR_LOCKS_GUARD = threading.Lock()
+
+
+def _mirror_lock(mirror_path):
+    with _MIRROR_LOCKS_GUARD:
+        return _MIRROR_LOCKS.setdefault(str(mirror_path), threading.Lock())
+
+
+# Default deadlines in seconds for each phase of a git download
+DEFAULT_TIMEOUTS = {
+    "resolve": 60,  # ls-remote
+    "fetch": 1800,  # clone / fetch
+    "checkout": 600,  # checkout, including lazily fetched blobs
+    "setup": 60,  # local commands: init, config, ls-tree, ...
+}
+
+# Options that take a value before the git subcommand
+_GIT_GLOBAL_OPTIONS_WITH_VALUE = {"--git-dir", "--work-tree", "-c", "-C"}
+
+
+def _git_phase(args) -> str:
+    """Maps a git command line to its DEFAULT_TIMEOUTS phase."""
+    args = iter(args)
+    for arg in args:
+        if arg in _GIT_GLOBAL_OPTIONS_WITH_VALUE:
+            next(args, None)
+        elif not arg.startswith("-"):
+            break
+    else:
+        return "setup"
+    if arg == "ls-remote":
+        return "resolve"
+    if arg in ("fetch", "clone", "pull"):
+        return "fetch"
+    if arg in ("checkout", "sparse-checkout"):
+        return "checkout"
+    return "setup"
+
+
+def _kill_process_group(process):
+    """Kills a process started with start_new_session=True and all its children."""
+    if process.poll() is not None:
+        return
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass
+
+
+_LFS_POINTER_PREFIX = b"version https://git-lfs.github.com/spec/v1"
+# LFS pointer files are ~130 bytes; anything much larger is real content
+_LFS_POINTER_MAX_SIZE = 1024
+
+
+def lfs_rules(attributes) -> IgnoreRules | None:
+    """
+    Builds the rules matching the paths Git LFS manages.
+
+    Args:
+        attributes: (base, text) of every .gitattributes file that applies,
+                    base being its "/"-separated folder in the repository.
+
+    Returns:
+        IgnoreRules | None: Rules matching the paths with filter=lfs, or None
+                            if no .gitattributes uses LFS.
+    """
+    rules = IgnoreRules()
+    for base, text in attributes:
+        patterns = []
+        for line in text.splitlines():
+            fields = line.split()
+            if fields and not fields[0].startswith("#") and "filter=lfs" in fields[1:]:
+                patterns.append(fields[0])
+        rules.add(patterns, base)
+    return rules if rules.rules else None
+
+
+def find_lfs_pointers(root, candidates) -> list[dict]:
+    """
+    Finds Git LFS pointer files (left in place instead of the real content)
+    among candidates; only small files are opened.
+
+    Args:
+        root (str): The folder the candidate paths are relative to.
+        candidates: "/"-separated paths that .gitattributes routes through LFS.
+
+    Returns:
+        list[dict]: path (relative to root) and size of the real object.
+    """
+    pointers = []
+    for rel_path in candidates:
+        path = os.path.join(root, rel_path)
+        if (
+            os.path.islink(path)
+            or not os.path.isfile(path)
+            or os.path.getsize(path) > _LFS_POINTER_MAX_SIZE
+        ):
+            continue
+        with open(path, "rb") as f:
+            content = f.read()
+        if not content.startswith(_LFS_POINTER_PREFIX):
+            continue
+        match = re.search(rb"^size (\d+)$", content, re.MULTILINE)
+        pointers.append(
+            {"path": rel_path, "size": int(match.group(1)) if match else None}
+        )
+    return pointers
+
+
+class DownloadCancelled(Exception):
+    """Raised when a download is stopped through its CancelToken."""
+
+
+class CancelToken:
+    """Thread-safe flag used to cancel a running download from another thread."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+class _ProgressReader:
+    """File-like wrapper that reports download progress while it is read."""
+
+    def __init__(
+        self, stream, total_bytes, progress_callback, check_cancelled, timeout
+    ):
+        self.stream = stream
+        self.check_cancelled = check_cancelled
+        self.timeout = timeout
+        self.total_bytes = total_bytes
+        self.progress_callback = progress_callback
+        self.bytes_read = 0
+        self.members = 0
+        self.started = time.monotonic()
+        self.last_report = 0.0
+
+    def read(self, size=-1):
+        self.check_cancelled()
+        if self.timeout and time.monotonic() - self.started > self.timeout:
+            raise subprocess.TimeoutExpired("archive download", self.timeout)
+        data = self.stream.read(size)
+        self.bytes_read += len(data)
+        now = time.monotonic()
+        if now - self.last_report >= 0.1:
+            self.last_report = now
+            self._report(done=False)
+        return data
+
+    def finish(self):
+        self._report(done=True)
+
+    def _report(self, done):
+        elapsed = time.monotonic() - self.started
+        self.progress_callback(
+            {
+                "phase": "Downloading archive",
+                "percent": (
+                    min(100, self.bytes_read * 100 // self.total_bytes)
+                    if self.total_bytes
+                    else None
+                ),
+                "objects": self.members,
+                "total_objects": None,
+                "bytes": self.bytes_read,
+                "bytes_per_second": int(self.bytes_read / elapsed) if elapsed else None,
+                "done": done,
+            }
+        )
 
 
 class GithubDownloader:
-    def __init__(self, repo_url: str, branch: str, subfolder: str | None):
+    def __init__(
+        self,
+        repo_url: str,
+        branch: str,
+        subfolder: str | None,
+        cache_dir: str | Path | None = None,
+        partial_clone: bool = False,
+        method: str = "git",
+        cancel_token: "CancelToken | None" = None,
+        timeouts: dict | None = None,
+        skip_lfs: bool = True,
+        max_blob_size: int | None = None,
+    ):
         # if not repo_url:
         #     raise ValueError("Repository URL cannot be empty.")
         self.repo_url = repo_url if repo_url else "https://github.com/canonical/paas-charm"
         self.branch = branch
         self.subfolder = subfolder if repo_url else "examples/flask-minimal/flask_minimal_app"
+        # When set, repositories are kept as bare mirrors under this directory
+        # and only fetched incrementally on later downloads.
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        # Blob-less partial clones only transfer commits and trees up front;
+        # file contents are fetched for the checked-out paths only.
+        self.partial_clone = partial_clone
+        # "git" or "tarball"; the latter streams a .tar.gz of the ref over HTTP
+        # and never runs git at all.
+        if method not in ("git", "tarball"):
+            raise ValueError(f"Unknown download method: {method}")
+        self.method = method
+        # Cancellation and per-phase deadlines (see DEFAULT_TIMEOUTS)
+        self.cancel_token = cancel_token
+        self.timeouts = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+        # Large-file policy. LFS content is irrelevant for packing, so smudging
+        # is off by default and pointer files are left in place. With
+        # max_blob_size, partial clones use a blob:limit filter instead of
+        # blob:none: blobs above the limit are never transferred nor checked
+        # out, at the cost of also fetching the small blobs outside the
+        # subfolder.
+        self.skip_lfs = skip_lfs
+        self.max_blob_size = max_blob_size
+        # Set for the duration of download()
+        self._status_callback = None
+        self._progress_callback = None
+
+    def _status(self, message):
+        print(message)
+        if self._status_callback:
+            self._status_callback(message)
+
+    def _check_cancelled(self):
+        if self.cancel_token and self.cancel_token.cancelled:
+            raise DownloadCancelled("Download cancelled.")
+
+    def _git(self, args, cwd=None, env=None):
+        """
+        Runs a git command and returns its stdout.
+
+        stderr is streamed; when a progress callback is set, every --progress
+        line is parsed and passed to it as it arrives. The command runs in its
+        own process group, which is killed as a whole (including helpers such
+        as git-remote-https) when the phase deadline passes or the download is
+        cancelled.
+
+        Raises:
+            DownloadCancelled: If the cancel token was triggered.
+            subprocess.TimeoutExpired: If the phase deadline passed.
+            subprocess.CalledProcessError: If git failed.
+        """
+        self._check_cancelled()
+        phase = _git_phase(args)
+        timeout = self.timeouts.get(phase)
+        env = dict(env or os.environ)
+        if self.skip_lfs:
+            env["GIT_LFS_SKIP_SMUDGE"] = "1"
+
+        process = subprocess.Popen(
+            ["git"] + args,
+            cwd=cwd,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=True,
+        )
+        # Drain stdout on the side so a chatty command can't block on a full pipe
+        stdout_chunks = []
+        stdout_reader = threading.Thread(
+            target=lambda: stdout_chunks.append(process.stdout.read()), daemon=True
+        )
+        stdout_reader.start()
+
+        # Reading stderr blocks, so deadlines and cancellation are enforced by
+        # a watchdog that kills the process group, which ends the read.
+        finished = threading.Event()
+        kill_reason = []
+
+        def watchdog():
+            deadline = time.monotonic() + timeout if timeout else None
+            while not finished.wait(0.1):
+                if self.cancel_token and self.cancel_token.cancelled:
+                    kill_reason.append("cancelled")
+                elif deadline and time.monotonic() > deadline:
+                    kill_reason.append("timeout")
+                else:
+                    continue
+                _kill_process_group(process)
+                return
+
+        watchdog_thread = threading.Thread(target=watchdog, daemon=True)
+        watchdog_thread.start()
+
+        # Progress lines are terminated by \r while they update, \n when done
+        stderr_lines = []
+        buffer = b""
+        try:
+            while True:
+                chunk = process.stderr.read1(4096)
+                if not chunk:
+                    break
+                buffer += chunk
+                *lines, buffer = re.split(rb"[\r\n]", buffer)
+                for raw in lines:
+                    line = raw.decode(errors="replace")
+                    progress = parse_git_progress(line)
+                    if progress:
+                        self._progress(progress)
+                    elif line.strip():
+                        stderr_lines.append(line)
+            if buffer.strip():
+                stderr_lines.append(buffer.decode(errors="replace"))
+            process.stderr.close()
+            return_code = process.wait()
+        except BaseException:
+            _kill_process_group(process)
+            raise
+        finally:
+            finished.set()
+            watchdog_thread.join()
+            stdout_reader.join()
+
+        if kill_reason == ["cancelled"]:
+            raise DownloadCancelled("Download cancelled.")
+        if kill_reason == ["timeout"]:
+            raise subprocess.TimeoutExpired(["git"] + args, timeout)
+
+        stdout = b"".join(stdout_chunks).decode(errors="replace")
+        if return_code != 0:
+            raise subprocess.CalledProcessError(
+                return_code, ["git"] + args, stdout, "\n".join(stderr_lines)
+            )
+        return stdout
+
+    def _normalized_url(self) -> str:
+        return self.repo_url.strip().rstrip("/").removesuffix(".git")
+
+    def _blob_filter(self) -> str:
+        """Returns the object filter used for partial clones."""
+        return f"blob:limit={self.max_blob_size}" if self.max_blob_size else "blob:none"
+
+    def _mirror_path(self) -> Path:
+        """Returns the cache location of the bare mirror for this repository."""
+        normalized = self._normalized_url()
+        key_source = normalized
+        # Mirrors with different filters hold different objects, keep them apart
+        if self.partial_clone and self.max_blob_size:
+            key_source += f"\0{self._blob_filter()}"
+        key = hashlib.sha256(key_source.encode()).hexdigest()[:16]
+        name = os.path.basename(urlparse(normalized).path) or "repo"
+        return self.cache_dir / "mirrors" / f"{name}-{key}.git"
+
+    def _snapshot_path(self, sha: str) -> Path:
+        """Returns the store location of the tree for (repo_url, sha, subfolder)."""
+        subfolder = self.subfolder.strip("/") if self.subfolder else ""
+        max_blob_size = self.max_blob_size if self.partial_clone else None
+        policy = f"\0lfs={self.skip_lfs}\0max={max_blob_size}"
+        key = hashlib.sha256(
+            f"{self._normalized_url()}\0{sha}\0{subfolder}{policy}".encode()
+        ).hexdigest()[:32]
+        return self.cache_dir / "snapshots" / key
+
+    def resolve_commit(self) -> str:
+        """
+        Resolves self.branch to a commit SHA on the remote with git ls-remote.
+
+        Nothing but the ref advertisement is transferred.
+        """
+        if _SHA_RE.match(self.branch):
+            return self.branch
+
+        output = self._git(["ls-remote", self.repo_url, self.branch])
+        refs = {}
+        for line in output.splitlines():
+            sha, ref = line.split("\t", 1)
+            refs[ref] = sha
+        # Branches win over tags; annotated tags resolve to their peeled commit
+        for ref in (
+            f"refs/heads/{self.branch}",
+            f"refs/tags/{self.branch}^{{}}",
+            f"refs/tags/{self.branch}",
+        ):
+            if ref in refs:
+                return refs[ref]
+        raise ValueError(f"Branch '{self.branch}' not found in {self.repo_url}")
+
+    def update_mirror(self) -> Path:
+        """
+        Creates the bare mirror on first use, otherwise fetches only what changed.
+
+        Returns:
+            Path: The path to the bare mirror repository.
+        """
+        mirror = self._mirror_path()
+        lock = _mirror_lock(mirror)
+        # Another download may hold the mirror for a while; stay cancellable
+        while not lock.acquire(timeout=0.2):
+            self._check_cancelled()
+        try:
+            if mirror.exists():
+                self._status(f"Updating cached mirror {mirror}...")
+                self._git(
+                    [
+                        "--git-dir",
+                        str(mirror),
+                        "fetch",
+                        "--progress",
+                        "--prune",
+                        "origin",
+                    ]
+                )
+                return mirror
+
+            self._status(f"Creating cached mirror {mirror}...")
+            mirror.parent.mkdir(parents=True, exist_ok=True)
+            # Build the mirror next to its final location and rename it into
+            # place, so an interrupted first fetch never leaves a broken cache.
+            staging = mirror.with_name(f"{mirror.name}.tmp-{uuid.uuid4().hex[:8]}")
+            try:
+                self._git(["init", "--bare", "--quiet", str(staging)])
+                self._git(
+                    [
+                        "--git-dir",
+                        str(staging),
+                        "remote",
+                        "add",
+                        "origin",
+                        self.repo_url,
+                    ]
+                )
+                # Only branches and tags: GitHub also advertises refs/pull/*,
+                # which would make the mirror much larger than the repo itself.
+                self._git(
+                    [
+                        "--git-dir",
+                        str(staging),
+                        "config",
+                        "--replace-all",
+                        "remote.origin.fetch",
+                        "+refs/heads/*:refs/heads/*",
+                    ]
+                )
+                self._git(
+                    [
+                        "--git-dir",
+                        str(staging),
+                        "config",
+                        "--add",
+                        "remote.origin.fetch",
+                        "+refs/tags/*:refs/tags/*",
+                    ]
+                )
+                fetch_args = [
+                    "--git-dir",
+                    str(staging),
+                    "fetch",
+                    "--progress",
+                    "origin",
+                ]
+                if self.partial_clone:
+                    # Mark origin as a promisor so that blobs missing from the
+                    # mirror are fetched lazily, and only when checked out.
+                    self._git(
+                        [
+                            "--git-dir",
+                            str(staging),
+                            "config",
+                            "remote.origin.promisor",
+                            "true",
+                        ]
+                    )
+                    self._git(
+                        [
+                            "--git-dir",
+                            str(staging),
+                            "config",
+                            "remote.origin.partialclonefilter",
+                            self._blob_filter(),
+                        ]
+                    )
+                    fetch_args.append(f"--filter={self._blob_filter()}")
+                self._git(fetch_args)
+                os.rename(staging, mirror)
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+            return mirror
+        finally:
+            lock.release()
+
+    def verify_subfolder(self, rev: str, git_args=(), cwd=None):
+        """
+        Checks that self.subfolder is a directory in the tree of rev.
+
+        Only the commit's trees are read (git ls-tree), so this works before
+        anything is checked out and without blobs in partial clones.
+
+        Raises:
+            ValueError: If the subfolder is missing or is not a directory.
+        """
+        git_args = list(git_args)
+        path = self.subfolder.strip("/")
+        sha = self._git(git_args + ["rev-parse", f"{rev}^{{commit}}"], cwd=cwd).strip()
+        location = f"{self.repo_url} at {self.branch} ({sha[:12]})"
+
+        entries = self._git(git_args + ["ls-tree", "-z", sha, "--", path], cwd=cwd)
+        for entry in entries.split("\0"):
+            if not entry:
+                continue
+            meta, name = entry.split("\t", 1)
+            if name == path:
+                if meta.split()[1] != "tree":
+                    raise ValueError(f"'{path}' is a file, not a folder, in {location}")
+                return
+
+        # List the parent folder to point at a likely typo
+        parent = os.path.dirname(path)
+        listing = [
+            "ls-tree",
+            "-z",
+            "-d",
+            "--name-only",
+            sha,
+            "--",
+            f"{parent}/" if parent else ".",
+        ]
+        siblings = self._git(git_args + listing, cwd=cwd).split("\0")
+        suggestions = difflib.get_close_matches(path, [s for s in siblings if s], n=1)
+        hint = f" Did you mean '{suggestions[0]}'?" if suggestions else ""
+        raise ValueError(f"Subfolder '{path}' not found in {location}.{hint}")
+
+    def _oversized_paths(
+        self, sha: str, pathspec: str, git_args=(), cwd=None
+    ) -> list[str]:
+        """
+        Returns the paths under pathspec whose blobs the blob:limit filter left
+        on the remote. They are excluded from checkout so they are never fetched.
+        """
+        if not (self.partial_clone and self.max_blob_size):
+            return []
+        git_args = list(git_args)
+        tree = f"{sha}:{pathspec}" if pathspec != "." else f"{sha}^{{tree}}"
+        # --missing=print lists absent objects without lazily fetching them
+        objects = self._git(
+            git_args + ["rev-list", "--objects", "--missing=print", tree], cwd=cwd
+        )
+        missing = {line[1:] for line in objects.splitlines() if line.startswith("?")}
+        if not missing:
+            return []
+
+        paths = []
+        listing = self._git(
+            git_args + ["ls-tree", "-r", "-z", sha, "--", pathspec], cwd=cwd
+        )
+        for entry in listing.split("\0"):
+            if not entry:
+                continue
+            meta, path = entry.split("\t", 1)
+            if meta.split()[2] in missing:
+                paths.append(path)
+        return paths
 
-    def download(self, target_dir):
+    def _lfs_pointers(
+        self, root, sha: str, pathspec: str, git_args=(), cwd=None
+    ) -> list[dict]:
+        """
+        Returns the LFS pointer files checked out into root from commit sha.
+
+        Only the tree listing is read: unless a .gitattributes under or above
+        pathspec routes paths through filter=lfs, nothing on disk is opened,
+        and then only the matching paths are.
+        """
+        git_args = list(git_args)
+        listing = self._git(
+            git_args + ["ls-tree", "-r", "-z", "--name-only", sha, "--", pathspec],
+            cwd=cwd,
+        )
+        paths = [path for path in listing.split("\0") if path]
+        attribute_files = [
+            path for path in paths if posixpath.basename(path) == ".gitattributes"
+        ]
+        if pathspec != ".":
+            # The .gitattributes of the folders above pathspec apply too
+            parts = pathspec.split("/")
+            above = [
+                posixpath.join(*parts[:depth], ".gitattributes")
+                for depth in range(len(parts))
+            ]
+            listing = self._git(
+                git_args + ["ls-tree", "-z", "--name-only", sha, "--"] + above, cwd=cwd
+            )
+            attribute_files = [
+                path for path in listing.split("\0") if path
+            ] + attribute_files
+
+        attributes = [
+            (
+                posixpath.dirname(path),
+                self._git(git_args + ["cat-file", "blob", f"{sha}:{path}"], cwd=cwd),
+            )
+            for path in attribute_files
+        ]
+        rules = lfs_rules(attributes)
+        if rules is None:
+            return []
+        return find_lfs_pointers(root, [path for path in paths if rules.excludes(path)])
+
+    def _skipped_report(self, lfs_pointers, oversized) -> dict:
+        """
+        Summarizes what the large-file policy kept out of target_dir.
+
+        Sizes of blobs skipped by max_blob_size are unknown locally, so they
+        count as max_blob_size + 1 and bytes_saved is a lower bound then.
+        """
+        skipped = [
+            {"path": pointer["path"], "reason": "lfs", "size": pointer["size"]}
+            for pointer in lfs_pointers
+        ]
+        skipped += [
+            {"path": path, "reason": "size-limit", "size": None} for path in oversized
+        ]
+        bytes_saved = sum(
+            item["size"] if item["size"] is not None else (self.max_blob_size or 0) + 1
+            for item in skipped
+        )
+        return {"files": skipped, "bytes_saved": bytes_saved}
+
+    def _checkout_from_mirror(self, mirror: Path, target_dir, sha: str) -> list[str]:
+        """
+        Writes the tree of commit sha from the mirror into target_dir.
+
+        The job directory gets plain files only; the objects stay in the mirror.
+        Returns the paths left out because of max_blob_size.
+        """
+        try:
+            self._git(
+                ["--git-dir", str(mirror), "rev-parse", "--verify", f"{sha}^{{commit}}"]
+            )
+        except subprocess.CalledProcessError:
+            raise ValueError(
+                f"Commit {sha[:12]} of '{self.branch}' not found in {self.repo_url}"
+            ) from None
+
+        pathspec = self.subfolder.strip("/") if self.subfolder else "."
+        oversized = self._oversized_paths(
+            sha, pathspec, git_args=["--git-dir", str(mirror)]
+        )
+        excludes = [f":(exclude,literal){path}" for path in oversized]
+        # A private index keeps concurrent checkouts from the same mirror apart.
+        index_fd, index_path = tempfile.mkstemp(prefix="index-", dir=mirror.parent)
+        os.close(index_fd)
+        os.remove(index_path)
+        try:
+            env = dict(os.environ, GIT_INDEX_FILE=index_path)
+            self._git(
+                [
+                    "--git-dir",
+                    str(mirror),
+                    "--work-tree",
+                    str(target_dir),
+                    "checkout",
+                    "--progress",
+                    sha,
+                    "--",
+                    pathspec,
+                ]
+                + excludes,
+                cwd=target_dir,
+                env=env,
+            )
+        finally:
+            if os.path.exists(index_path):
+                os.remove(index_path)
+        return oversized
+
+    def _materialize_snapshot(self, sha: str) -> tuple[Path, list[str], list[dict]]:
+        """
+        Returns the snapshot of commit sha, checking it out from the mirror first
+        if no earlier download has stored it yet, the paths it left out
+        because of max_blob_size and the LFS pointers it contains.
+        """
+        snapshot = self._snapshot_path(sha)
+        # The oversized paths can't be recomputed from plain files, and the
+        # LFS pointers would need the tree listing again, so both reports are
+        # stored next to the snapshot and a hit reads neither the tree nor git
+        oversized_file = snapshot.with_name(f"{snapshot.name}.oversized.json")
+        lfs_file = snapshot.with_name(f"{snapshot.name}.lfs.json")
+        if snapshot.exists():
+            self._status(f"Reusing snapshot of {sha[:12]} from {snapshot}")
+            oversized = []
+            if oversized_file.exists():
+                oversized = json.loads(oversized_file.read_text())
+            lfs_pointers = []
+            if lfs_file.exists():
+                lfs_pointers = json.loads(lfs_file.read_text())
+            return snapshot, oversized, lfs_pointers
+
+        mirror = self.update_mirror()
+        if self.subfolder:
+            self.verify_subfolder(sha, git_args=["--git-dir", str(mirror)])
+        snapshot.parent.mkdir(parents=True, exist_ok=True)
+        staging = snapshot.with_name(f"{snapshot.name}.tmp-{uuid.uuid4().hex[:8]}")
+        try:
+            staging.mkdir()
+            oversized = self._checkout_from_mirror(mirror, staging, sha)
+            pathspec = self.subfolder.strip("/") if self.subfolder else "."
+            lfs_pointers = self._lfs_pointers(
+                str(staging), sha, pathspec, git_args=["--git-dir", str(mirror)]
+            )
+            if oversized:
+                oversized_file.write_text(json.dumps(oversized))
+            if lfs_pointers:
+                lfs_file.write_text(json.dumps(lfs_pointers))
+            try:
+                os.rename(staging, snapshot)
+            except OSError:
+                # Another download stored the same snapshot in the meantime
+                if not snapshot.exists():
+                    raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return snapshot, oversized, lfs_pointers
+
+    def archive_url(self) -> str:
+        """Returns the URL of the .tar.gz archive of self.branch (GitHub layout)."""
+        return f"{self._normalized_url()}/archive/{quote(self.branch, safe='/')}.tar.gz"
+
+    def _download_tarball(self, target_dir):
+        """
+        Streams the branch archive straight into a tar reader.
+
+        Nothing is written to disk except the members under self.subfolder, which
+        keep their repository-relative paths inside target_dir.
+
+        Returns:
+            list[dict]: The LFS pointers among the extracted files, found from
+                        the member list without walking target_dir.
+        """
+        url = self.archive_url()
+        subfolder = self.subfolder.strip("/") if self.subfolder else ""
+        self._status(f"Downloading archive {url}...")
+
+        # The socket timeout only catches stalls; the reader enforces the deadline
+        with urllib.request.urlopen(url, timeout=self.timeouts["resolve"]) as response:
+            total = response.headers.get("Content-Length")
+            reader = _ProgressReader(
+                response,
+                int(total) if total else None,
+                self._progress,
+                self._check_cancelled,
+                self.timeouts.get("fetch"),
+            )
+            files = []
+            attribute_files = []
+            with tarfile.open(fileobj=reader, mode="r|gz") as tar:
+                for member in tar:
+                    # Archives wrap everything in a "<repo>-<ref>/" folder
+                    _, _, rel_path = member.name.partition("/")
+                    if not rel_path:
+                        continue
+                    is_attributes = (
+                        posixpath.basename(rel_path) == ".gitattributes"
+                        and member.isfile()
+                    )
+                    if (
+                        subfolder
+                        and rel_path != subfolder
+                        and not rel_path.startswith(subfolder + "/")
+                    ):
+                        # Those of the folders above the subfolder apply too
+                        parent = posixpath.dirname(rel_path)
+                        if is_attributes and (
+                            not parent or subfolder.startswith(parent + "/")
+                        ):
+                            attribute_files.append(
+                                (
+                                    parent,
+                                    tar.extractfile(member)
+                                    .read()
+                                    .decode(errors="replace"),
+                                )
+                            )
+                        continue
+                    if member.isfile():
+                        files.append(rel_path)
+                    member.name = rel_path
+                    if member.islnk():
+                        member.linkname = member.linkname.partition("/")[2]
+                    reader.members += 1
+                    if hasattr(tarfile, "data_filter"):
+                        tar.extract(member, target_dir, filter="data")
+                    else:
+                        tar.extract(member, target_dir)
+                    # A stream can't be read twice, so these come back from disk
+                    if is_attributes:
+                        with open(
+                            os.path.join(target_dir, rel_path), "r", errors="replace"
+                        ) as f:
+                            attribute_files.append(
+                                (posixpath.dirname(rel_path), f.read())
+                            )
+            reader.finish()
+
+        if subfolder and not os.path.isdir(os.path.join(target_dir, subfolder)):
+            raise ValueError(f"Subfolder '{subfolder}' not found in {url}")
+
+        rules = lfs_rules(attribute_files)
+        if rules is None:
+            return []
+        return find_lfs_pointers(
+            target_dir, [path for path in files if rules.excludes(path)]
+        )
+
+    def _progress(self, progress):
+        if self._progress_callback:
+            self._progress_callback(progress)
+
+    def download(self, target_dir, status_callback=None, progress_callback=None):
         """
         Clones the entire repo or just a specific directory using sparse checkout.
 
+        With a cache_dir the branch is first resolved to a commit SHA. If that
+        commit (and subfolder) was downloaded before, the stored snapshot is
+        linked into target_dir without any transfer. Otherwise it is checked
+        out from a local mirror that is refreshed with an incremental fetch.
+        With partial_clone, only the blobs under the subfolder are transferred.
+        With method="tarball", the ref's archive is streamed over HTTP instead.
+
         Args:
             target_dir (str): The directory where the content will be placed.
             self.subfolder (str, optional): The path within the repo to download.
                                          If None, clones the entire repo.
+            status_callback: Optional callback for phase messages.
+            progress_callback: Optional callback receiving the parse_git_progress()
+                               dict of every progress update git reports.
+
+        Raises:
+            DownloadCancelled: If self.cancel_token was cancelled.
+            subprocess.TimeoutExpired: If a phase exceeded its deadline.
         """
+        self._status_callback = status_callback
+        self._progress_callback = progress_callback
+        try:
+            return self._download(target_dir)
+        except (DownloadCancelled, subprocess.TimeoutExpired):
+            # Don't leave a half-written job directory behind
+            shutil.rmtree(target_dir, ignore_errors=True)
+            raise
+        finally:
+            self._status_callback = None
+            self._progress_callback = None
+
+    def _download(self, target_dir):
         # Ensure the target directory exists and is empty
         if os.path.exists(target_dir):
             shutil.rmtree(target_dir)
         os.makedirs(target_dir)
 
-        if self.subfolder:
+        commit = None
+        oversized = []
+        lfs_pointers = None
+        if self.method == "tarball":
+            # --- HTTP Archive, extracted while streaming ---
+            lfs_pointers = self._download_tarball(target_dir)
+            if self.subfolder:
+                project_path = os.path.join(target_dir, self.subfolder.strip("/"))
+            else:
+                project_path = target_dir
+
+        elif self.cache_dir:
+            # --- Snapshot store, backed by the cached mirror ---
+            commit = self.resolve_commit()
+            snapshot, oversized, lfs_pointers = self._materialize_snapshot(commit)
+            link_tree(str(snapshot), target_dir)
+            if self.subfolder:
+                project_path = os.path.join(target_dir, self.subfolder.strip("/"))
+            else:
+                project_path = target_dir
+
+        elif self.subfolder and self.partial_clone:
+            # --- Blob-less Partial Clone + Cone-mode Sparse Checkout ---
+            self._status(f"Performing partial clone for directory: {self.subfolder}")
+            dir_pattern = self.subfolder.strip("/")
+
+            # 1. Fetch commits and trees only, without checking anything out
+            self._git(
+                [
+                    "clone",
+                    "--progress",
+                    f"--filter={self._blob_filter()}",
+                    "--no-checkout",
+                    "--depth=1",
+                    "--sparse",
+                    "--branch",
+                    self.branch,
+                    self.repo_url,
+                    target_dir,
+                ]
+            )
+
+            # 2. Make sure the subfolder exists before transferring any blobs
+            self.verify_subfolder("HEAD", cwd=target_dir)
+
+            # 3. Restrict the working tree to the subfolder (cone mode). Cone
+            # mode can't exclude single files, so oversized blobs switch to
+            # equivalent non-cone patterns with exclusions.
+            oversized = self._oversized_paths("HEAD", dir_pattern, cwd=target_dir)
+            if oversized:
+                patterns = [f"/{dir_pattern}/"] + [f"!/{path}" for path in oversized]
+                self._git(
+                    ["sparse-checkout", "set", "--no-cone"] + patterns, cwd=target_dir
+                )
+            else:
+                self._git(
+                    ["sparse-checkout", "set", "--cone", dir_pattern], cwd=target_dir
+                )
+
+            # 4. Checkout, which fetches the blobs under the subfolder only
+            self._git(["checkout", "--progress", self.branch], cwd=target_dir)
+
+            project_path = os.path.join(target_dir, dir_pattern)
+
+        elif self.subfolder:
             # --- Sparse Checkout ---
-            print(f"Performing sparse checkout for directory: {self.subfolder}")
+            self._status(f"Performing sparse checkout for directory: {self.subfolder}")
 
             # 1. Init empty repo
-            subprocess.run(
-                ["git", "init"], cwd=target_dir, check=True, capture_output=True
-            )
+            self._git(["init"], cwd=target_dir)
 
             # 2. Add remote
-            subprocess.run(
-                ["git", "remote", "add", "origin", self.repo_url],
-                cwd=target_dir,
-                check=True,
-                capture_output=True,
-            )
+            self._git(["remote", "add", "origin", self.repo_url], cwd=target_dir)
 
             # 3. Enable sparse checkout
-            subprocess.run(
-                ["git", "config", "core.sparseCheckout", "true"],
-                cwd=target_dir,
-                check=True,
-                capture_output=True,
-            )
+            self._git(["config", "core.sparseCheckout", "true"], cwd=target_dir)
 
             # 4. Define the directory to checkout
             sparse_checkout_file = (
@@ -70,39 +1014,22 @@ class GithubDownloader:
                 f.write(f"{dir_pattern}/**\n")
             print(f"Wrote patterns to {sparse_checkout_file}")
 
-            # 5. Pull only the specified directory (shallowly)
-            # Replace 'main' with the desired branch if needed
+            # 5. Fetch only the tip commit of the branch (shallowly)
             try:
-                print("Pulling sparse checkout...")
-                subprocess.run(
-                    [
-                        "git",
-                        "pull",
-                        "--depth=1",
-                        "origin",
-                        self.branch,
-                    ],
+                self._status("Fetching sparse checkout...")
+                self._git(
+                    ["fetch", "--progress", "--depth=1", "origin", self.branch],
                     cwd=target_dir,
-                    check=True,
-                    capture_output=True,
-                    text=True,  # Capture output as text
                 )
             except subprocess.CalledProcessError as e:
-                # It's common for the first sparse pull to report an error even if it works
-                # Check stderr for common "ignorable" messages
-                if (
-                    "error: Not possible to fast-forward, aborting." in e.stderr
-                    or "fatal: refusing to merge unrelated histories" in e.stderr
-                ):
-                    print(
-                        "Sparse checkout completed with expected non-fatal Git messages."
-                    )
-                else:
-                    # If it's a different error, re-raise it
-                    print(
-                        f"Sparse checkout failed: STDOUT={e.stdout}, STDERR={e.stderr}"
-                    )
-                    raise e
+                print(f"Sparse checkout failed: STDOUT={e.stdout}, STDERR={e.stderr}")
+                raise e
+
+            # 6. Fail fast if the subfolder isn't in the fetched commit
+            self.verify_subfolder("FETCH_HEAD", cwd=target_dir)
+
+            # 7. Check out the specified directory only
+            self._git(["checkout", "--progress", "FETCH_HEAD"], cwd=target_dir)
 
             # The files will be inside target_dir/path/to/your/directory
             # We might want to adjust the returned path to point directly to the content
@@ -110,23 +1037,28 @@ class GithubDownloader:
 
         else:
             # --- Full Clone (Original Behavior) ---
-            print("Performing full clone...")
-            subprocess.run(
+            self._status("Performing full clone...")
+            self._git(
                 [
-                    "git",
                     "clone",
+                    "--progress",
                     "--branch",
                     self.branch,
                     "--depth",
                     "1",
                     self.repo_url,
                     target_dir,
-                ],
-                check=True,
-                capture_output=True,
+                ]
             )
             project_path = target_dir  # For full clone, the target is the project path
 
+        if lfs_pointers is None:
+            # Clones keep their .git, so the tree listing comes from there
+            pathspec = self.subfolder.strip("/") if self.subfolder else "."
+            lfs_pointers = self._lfs_pointers(
+                target_dir, "HEAD", pathspec, cwd=target_dir
+            )
+
         project_name = os.path.splitext(os.path.basename(urlparse(self.repo_url).path))[
             0
         ]
@@ -139,4 +1071,87 @@ class GithubDownloader:
                 .replace(" ", "-")
             )
 
-        return {"path": project_path, "project_name": project_name}
+        return {
+            "path": project_path,
+            "project_name": project_name,
+            "commit": commit,
+            "skipped": self._skipped_report(lfs_pointers, oversized),
+        }
+
+
+class BatchDownloader:
+    """Downloads a manifest of repositories concurrently with a bounded worker pool."""
+
+    def __init__(self, entries, max_workers: int = 4, **downloader_options):
+        """
+        Args:
+            entries: Iterable of (repo_url, branch, subfolder) tuples, or dicts
+                     with those keys. subfolder may be None.
+            max_workers (int): Maximum number of downloads running at once.
+            downloader_options: Passed to every GithubDownloader, e.g.
+                                cache_dir, partial_clone or method.
+        """
+        self.entries = []
+        for entry in entries:
+            if isinstance(entry, dict):
+                entry = (entry["repo_url"], entry["branch"], entry.get("subfolder"))
+            repo_url, branch, subfolder = entry
+            self.entries.append((repo_url, branch, subfolder or None))
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.downloader_options = downloader_options
+
+    def _download_one(self, index, entry, target_root, result_callback):
+        repo_url, branch, subfolder = entry
+        target_dir = os.path.join(target_root, f"{index:03d}")
+        result = {
+            "repo_url": repo_url,
+            "branch": branch,
+            "subfolder": subfolder,
+            "target_dir": target_dir,
+            "path": None,
+            "project_name": None,
+            "commit": None,
+            "skipped": None,
+            "error": None,
+            "seconds": 0.0,
+        }
+        started = time.monotonic()
+        try:
+            downloader = GithubDownloader(
+                repo_url, branch, subfolder, **self.downloader_options
+            )
+            result.update(downloader.download(target_dir))
+        except Exception as e:
+            # One bad entry must not stop the rest of the batch
+            result["error"] = str(e) or type(e).__name__
+            shutil.rmtree(target_dir, ignore_errors=True)
+        result["seconds"] = time.monotonic() - started
+        if result_callback:
+            result_callback(result)
+        return result
+
+    def download(self, target_root, result_callback=None) -> list[dict]:
+        """
+        Downloads every entry into its own folder under target_root.
+
+        Args:
+            target_root (str): Directory that receives one folder per entry.
+            result_callback: Optional callback called with each result as soon
+                             as that entry finishes.
+
+        Returns:
+            list[dict]: One result per entry, in manifest order, with the
+            download() fields plus target_dir, error (None on success) and
+            seconds.
+        """
+        os.makedirs(target_root, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(
+                    self._download_one, index, entry, target_root, result_callback
+                )
+                for index, entry in enumerate(self.entries)
+            ]
+            return [future.result() for future in futures]
@@ -0,0 +1,334 @@
+import json
+import os
+import shutil
+import statistics
+import time
+
+from logic.dependencies import resolve_dependencies
+from logic.java_build import read_java_build
+
+# Baseline cost of packing each kind of rock: seconds, peak memory of the
+# build and size of the .rock, before any dependency is counted
+FRAMEWORK_BASELINES = {
+    "python": {"seconds": 240, "peak_rss": 1024**3, "output": 80 * 1024**2},
+    "expressjs": {"seconds": 300, "peak_rss": 1536 * 1024**2, "output": 120 * 1024**2},
+    "go": {"seconds": 240, "peak_rss": 1536 * 1024**2, "output": 40 * 1024**2},
+    "spring-boot": {"seconds": 480, "peak_rss": 2560 * 1024**2, "output": 250 * 1024**2},
+}
+
+# Added per declared dependency, by ecosystem
+DEPENDENCY_COSTS = {
+    "python": {"seconds": 6, "peak_rss": 8 * 1024**2, "output": 15 * 1024**2},
+    "expressjs": {"seconds": 2, "peak_rss": 4 * 1024**2, "output": 2 * 1024**2},
+    "go": {"seconds": 3, "peak_rss": 8 * 1024**2, "output": 1024**2},
+    "spring-boot": {"seconds": 4, "peak_rss": 16 * 1024**2, "output": 3 * 1024**2},
+}
+
+# Python packages that often build or ship native code; each one costs far
+# more time, memory and space than a pure-Python dependency
+NATIVE_PACKAGES = {
+    "numpy", "scipy", "pandas", "scikit-learn", "torch", "tensorflow",
+    "psycopg2", "psycopg", "mysqlclient", "lxml", "cryptography", "grpcio",
+    "pillow", "opencv-python", "pyarrow", "matplotlib", "uvloop", "orjson",
+    "pydantic-core", "gevent", "cffi", "bcrypt",
+}
+NATIVE_PACKAGE_COST = {"seconds": 45, "peak_rss": 300 * 1024**2, "output": 40 * 1024**2}
+
+# Seconds added per MiB of source copied into the build
+SECONDS_PER_SOURCE_MIB = 0.2
+
+# Calibration uses the most recent packs of the same framework only
+HISTORY_SAMPLES = 10
+
+# Refuse below the first fraction of the estimate, warn below the second
+MEMORY_REFUSE_RATIO = 0.5
+MEMORY_WARN_RATIO = 1.0
+# A pack needs room for the build cache and layers besides the .rock itself
+DISK_REFUSE_RATIO = 2
+DISK_WARN_RATIO = 4
+
+
+def _ecosystem(framework):
+    if framework in ("flask", "django", "fastapi"):
+        return "python"
+    if framework in ("springboot", "spring-boot"):
+        return "spring-boot"
+    return framework if framework in FRAMEWORK_BASELINES else "python"
+
+
+def available_memory(meminfo_path="/proc/meminfo"):
+    """
+    Returns the memory a build could use, in bytes: MemAvailable plus free
+    swap from /proc/meminfo, or None where that file doesn't exist.
+    """
+    try:
+        with open(meminfo_path, "r") as f:
+            values = {
+                key: int(value.split()[0]) * 1024
+                for key, value in (line.split(":", 1) for line in f if ":" in line)
+            }
+    except (OSError, ValueError):
+        return None
+    if "MemAvailable" not in values:
+        return None
+    return values["MemAvailable"] + values.get("SwapFree", 0)
+
+
+def check_resources(estimate, path, meminfo_path="/proc/meminfo"):
+    """
+    Compares an estimate with the memory and disk space of this machine.
+
+    Args:
+        estimate (dict): What PackEstimator.estimate() returned.
+        path (str): Where the rock is packed; its file system is checked.
+        meminfo_path (str): Read instead of /proc/meminfo in tests.
+
+    Returns:
+        dict: ok (False if the pack should be refused), errors, warnings,
+              memory_available and disk_free (bytes, None if unknown).
+    """
+    errors, warnings = [], []
+    memory = available_memory(meminfo_path)
+    if memory is not None:
+        needed = estimate["peak_rss"]
+        if memory < needed * MEMORY_REFUSE_RATIO:
+            errors.append(
+                f"Only {_format_bytes(memory)} of memory is available; packing needs about {_format_bytes(needed)}."
+            )
+        elif memory < needed * MEMORY_WARN_RATIO:
+            warnings.append(
+                f"Packing may run out of memory: {_format_bytes(memory)} available, about {_format_bytes(needed)} needed."
+            )
+
+    disk = shutil.disk_usage(path).free
+    needed = estimate["output_bytes"]
+    if disk < needed * DISK_REFUSE_RATIO:
+        errors.append(
+            f"Only {_format_bytes(disk)} of disk space is free; packing needs at least {_format_bytes(needed * DISK_REFUSE_RATIO)}."
+        )
+    elif disk < needed * DISK_WARN_RATIO:
+        warnings.append(
+            f"Disk space is low: {_format_bytes(disk)} free, the rock alone is about {_format_bytes(needed)}."
+        )
+    return {
+        "ok": not errors,
+        "errors": errors,
+        "warnings": warnings,
+        "memory_available": memory,
+        "disk_free": disk,
+    }
+
+
+def _format_bytes(num):
+    for unit in ["B", "KiB", "MiB"]:
+        if abs(num) < 1024.0:
+            return f"{num:.1f} {unit}"
+        num /= 1024.0
+    return f"{num:.1f} GiB"
+
+
+class PackEstimator:
+    """
+    Predicts how long `rockcraft pack` will take, its peak memory and the size
+    of the rock, before it runs.
+
+    The prediction starts from a per-framework model (project size, number of
+    dependencies, native Python packages, node_modules, Maven or Go modules)
+    and is scaled by how far the model was off for the last packs of the same
+    framework, as recorded in a JSON-lines history.
+    """
+
+    def __init__(self, index, framework, history_path=None):
+        """
+        Args:
+            index (ProjectIndex): The job's project index.
+            framework (str): The framework id selected in the wizard.
+            history_path (str | Path, optional): JSON-lines file of past packs,
+                                                 read for calibration and
+                                                 appended to by record().
+        """
+        self.index = index
+        self.framework = framework
+        self.ecosystem = _ecosystem(framework)
+        self.history_path = history_path
+        self._features = None
+
+    def _read(self, path):
+        if not self.index.exists(path):
+            return None
+        with self.index.open(path, "rb") as f:
+            return f.read().decode("utf-8", errors="replace")
+
+    def features(self):
+        """
+        Returns what the model is based on: source_bytes, file_count,
+        node_modules_bytes, dependencies and native_dependencies.
+        """
+        if self._features is not None:
+            return self._features
+
+        source_bytes = node_modules_bytes = 0
+        for path, info in self.index.files():
+            if path.startswith(".git/"):
+                continue
+            if path.startswith("node_modules/"):
+                node_modules_bytes += info["size"]
+            else:
+                source_bytes += info["size"]
+
+        native = []
+        if self.ecosystem == "python":
+            names = set(resolve_dependencies(self.index))
+            native = sorted(names & NATIVE_PACKAGES)
+            count = len(names)
+        elif self.ecosystem == "expressjs":
+            count = self._count_node_dependencies()
+        elif self.ecosystem == "go":
+            count = self._count_go_dependencies()
+        else:
+            count = self._count_java_dependencies()
+
+        self._features = {
+            "source_bytes": source_bytes,
+            "file_count": self.index.file_count,
+            "node_modules_bytes": node_modules_bytes,
+            "dependencies": count,
+            "native_dependencies": native,
+        }
+        return self._features
+
+    def _count_node_dependencies(self):
+        content = self._read("package.json")
+        try:
+            data = json.loads(content) if content else {}
+        except ValueError:
+            return 0
+        # Anything but an object with a "dependencies" object declares nothing
+        if not isinstance(data, dict) or not isinstance(data.get("dependencies"), dict):
+            return 0
+        return len(data["dependencies"])
+
+    def _count_go_dependencies(self):
+        content = self._read("go.mod") or ""
+        count = 0
+        in_block = False
+        for line in content.splitlines():
+            line = line.split("//")[0].strip()
+            if in_block:
+                if line == ")":
+                    in_block = False
+                elif line:
+                    count += 1
+            elif line.startswith("require"):
+                rest = line[len("require"):].strip()
+                if rest == "(":
+                    in_block = True
+                elif rest:
+                    count += 1
+        return count
+
+    def _count_java_dependencies(self):
+        try:
+            build = read_java_build(self.index)
+        except ValueError:
+            return 0
+        return build["dependencies"] if build else 0
+
+    def model(self):
+        """Returns the uncalibrated prediction: seconds, peak_rss and output_bytes."""
+        features = self.features()
+        baseline = FRAMEWORK_BASELINES[self.ecosystem]
+        per_dependency = DEPENDENCY_COSTS[self.ecosystem]
+        native = len(features["native_dependencies"])
+        copied = features["source_bytes"] + features["node_modules_bytes"]
+
+        def cost(key):
+            return (
+                baseline[key]
+                + per_dependency[key] * features["dependencies"]
+                + NATIVE_PACKAGE_COST[key] * native
+            )
+
+        return {
+            "seconds": cost("seconds") + SECONDS_PER_SOURCE_MIB * copied / 1024**2,
+            "peak_rss": cost("peak_rss"),
+            "output_bytes": cost("output") + copied,
+        }
+
+    def _history(self):
+        """Returns the last HISTORY_SAMPLES packs of this framework's ecosystem."""
+        if not self.history_path or not os.path.exists(self.history_path):
+            return []
+        entries = []
+        with open(self.history_path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get("ecosystem") == self.ecosystem and entry.get("model"):
+                    entries.append(entry)
+        return entries[-HISTORY_SAMPLES:]
+
+    def estimate(self):
+        """
+        Predicts the cost of packing this project.
+
+        Returns:
+            dict: seconds, peak_rss and output_bytes (ints), samples (the
+                  number of past packs used for calibration) and features.
+        """
+        model = self.model()
+        history = self._history()
+        result = dict(model)
+        for key, actual in (("seconds", "seconds"), ("output_bytes", "output_bytes")):
+            ratios = [
+                entry[actual] / entry["model"][key]
+                for entry in history
+                if entry.get(actual) and entry["model"].get(key)
+            ]
+            if ratios:
+                result[key] = model[key] * statistics.median(ratios)
+        estimate = {key: int(value) for key, value in result.items()}
+        estimate.update(model=model, samples=len(history), features=self.features())
+        print(f"Pack estimate for {self.framework}: {estimate}")
+        return estimate
+
+    def record(self, estimate, seconds, output_bytes):
+        """
+        Appends a finished pack to the history, so later estimates of the same
+        framework are scaled by how far this one was off.
+
+        Args:
+            estimate (dict): What estimate() returned before the pack.
+            seconds (float): How long the pack took.
+            output_bytes (int): Size of the .rock file.
+        """
+        if not self.history_path:
+            return
+        entry = {
+            "timestamp": time.time(),
+            "framework": self.framework,
+            "ecosystem": self.ecosystem,
+            "seconds": seconds,
+            "output_bytes": output_bytes,
+            "model": estimate["model"],
+            "features": estimate["features"],
+        }
+        with open(self.history_path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    @staticmethod
+    def describe(estimate):
+        """Returns a one-line summary of an estimate for the status log."""
+        minutes = max(1, round(estimate["seconds"] / 60))
+        basis = (
+            f"calibrated on {estimate['samples']} previous pack(s)"
+            if estimate["samples"]
+            else "no previous packs to calibrate on"
+        )
+        return (
+            f"Estimated pack: about {minutes} min, peak memory about "
+            f"{_format_bytes(estimate['peak_rss'])}, rock about "
+            f"{_format_bytes(estimate['output_bytes'])} ({basis})."
+        )
@@ -1,45 +1,856 @@
+import base64
+import contextlib
+import hashlib
+import errno
+import heapq
+import json
+import mmap
 import os
+import posixpath
 import tarfile
+import threading
+import time
 import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import zstandard
+
+from logic.archive_cache import ArchiveCache, DEFAULT_ARCHIVE_CACHE_BYTES, file_digest
+from logic.ignore import IgnoreRules
+from logic.processor import MARKER_FILES
+
+# Marker files larger than this are not read during inspection
+MAX_MARKER_SIZE = 1024 * 1024
+
+# Vendored, cached and build trees that are never worth extracting
+DEFAULT_ARCHIVE_EXCLUDES = [
+    "__MACOSX/",
+    ".DS_Store",
+    ".git/",
+    "node_modules/",
+    ".venv/",
+    "venv/",
+    "__pycache__/",
+    "*.pyc",
+    "target/",
+]
+
+
+# Tarball suffixes and the stream mode each one is opened with
+TAR_EXTENSIONS = {
+    ".tar": "r|",
+    ".tar.gz": "r|gz",
+    ".tgz": "r|gz",
+    ".tar.xz": "r|xz",
+    ".txz": "r|xz",
+    ".tar.bz2": "r|bz2",
+    ".tbz2": "r|bz2",
+    ".tar.zst": "zst",
+    ".tzst": "zst",
+}
+ARCHIVE_EXTENSIONS = (".zip",) + tuple(TAR_EXTENSIONS)
+
+# Below this many files a thread pool costs more than it saves
+PARALLEL_EXTRACT_MIN_FILES = 64
+
+# Bounds on what one upload may write to TEMP_STORAGE_PATH
+DEFAULT_EXTRACTION_LIMITS = {
+    "max_bytes": 4 * 1024**3,  # total uncompressed size of extracted files
+    "max_members": 200_000,  # entries in the archive, extracted or not
+    "max_ratio": 200,  # uncompressed bytes per byte of archive
+    "max_depth": 64,  # path components of a member
+}
+
+# The ratio is only meaningful once this much has been declared
+_RATIO_MIN_BYTES = 16 * 1024 * 1024
+
+
+class ExtractionLimitError(ValueError):
+    """
+    Raised when an archive breaks one of the extraction limits or tries to
+    write outside the target directory. report describes what was hit:
+    {"limit", "value", "maximum", "member"}.
+    """
+
+    def __init__(self, message, report):
+        super().__init__(message)
+        self.report = report
+
+
+class _ExtractionGuard:
+    """Checks each member against the limits before anything is written."""
+
+    def __init__(self, archive_path, limits):
+        self.limits = limits
+        self.archive_size = max(os.path.getsize(archive_path), 1)
+        self.members = 0
+        self.bytes = 0
+
+    def fail(self, limit, value, maximum, member, message):
+        report = {"limit": limit, "value": value, "maximum": maximum, "member": member}
+        print(f"Extraction aborted: {report}")
+        raise ExtractionLimitError(f"{message} (at '{member}')", report)
+
+    def check_member(self, name):
+        """Called for every entry in the archive."""
+        self.members += 1
+        if self.members > self.limits["max_members"]:
+            self.fail(
+                "max_members", self.members, self.limits["max_members"], name,
+                f"Archive has more than {self.limits['max_members']} entries",
+            )
+
+        parts = name.replace("\\", "/").split("/")
+        if name.startswith("/") or os.path.splitdrive(name)[0] or ".." in parts:
+            self.fail(
+                "path", name, None, name,
+                "Archive entry points outside the extraction folder",
+            )
+        depth = len([part for part in parts if part not in ("", ".")])
+        if depth > self.limits["max_depth"]:
+            self.fail(
+                "max_depth", depth, self.limits["max_depth"], name,
+                f"Archive entry is nested deeper than {self.limits['max_depth']} folders",
+            )
+
+    def check_file(self, name, size):
+        """Called for every file that will be written, with its declared size."""
+        self.bytes += size
+        if self.bytes > self.limits["max_bytes"]:
+            self.fail(
+                "max_bytes", self.bytes, self.limits["max_bytes"], name,
+                f"Archive expands to more than {self.limits['max_bytes']} bytes",
+            )
+        ratio = self.bytes / self.archive_size
+        if self.bytes >= _RATIO_MIN_BYTES and ratio > self.limits["max_ratio"]:
+            self.fail(
+                "max_ratio", round(ratio, 1), self.limits["max_ratio"], name,
+                f"Archive compression ratio is above {self.limits['max_ratio']}:1",
+            )
+
+
+def _is_hidden(name):
+    return name.startswith(".") or name == "__MACOSX"
+
+
+# Number of members listed in the metrics as the slowest to extract
+SLOWEST_MEMBERS = 5
+
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class _ExtractionMetrics:
+    """
+    Collects the numbers reported for one extraction. Updated from the zip
+    worker threads, so decompress and write times are summed across threads
+    (thread-seconds) while "total" is wall-clock time.
+    """
+
+    def __init__(self, archive_path, original_filename, archive_type):
+        self.lock = threading.Lock()
+        self.slowest = []
+        self.data = {
+            "archive": original_filename,
+            "format": archive_type,
+            "archive_bytes": os.path.getsize(archive_path),
+            "bytes_read": 0,
+            "bytes_written": 0,
+            "members": 0,
+            "files_written": 0,
+            "excluded_files": 0,
+            "zero_copy_files": 0,
+            "cache_hit": False,
+            "seconds": {
+                "inspect": 0.0,
+                "decompress": 0.0,
+                "write": 0.0,
+                "link": 0.0,
+                "total": 0.0,
+            },
+            "slowest_members": [],
+        }
+
+    def add_member(self, name, size, decompress_seconds, write_seconds):
+        with self.lock:
+            self.data["files_written"] += 1
+            self.data["bytes_written"] += size
+            self.data["seconds"]["decompress"] += decompress_seconds
+            self.data["seconds"]["write"] += write_seconds
+            entry = (decompress_seconds + write_seconds, name, size)
+            if len(self.slowest) < SLOWEST_MEMBERS:
+                heapq.heappush(self.slowest, entry)
+            else:
+                heapq.heappushpop(self.slowest, entry)
+
+    def finish(self):
+        """Returns the metrics as a plain dict, times rounded to the microsecond."""
+        self.data["seconds"] = {
+            phase: round(seconds, 6) for phase, seconds in self.data["seconds"].items()
+        }
+        self.data["slowest_members"] = [
+            {"name": name, "bytes": size, "seconds": round(seconds, 6)}
+            for seconds, name, size in sorted(self.slowest, reverse=True)
+        ]
+        return self.data
+
+
+def _copy_member(src, path, name, metrics):
+    """
+    Copies one member's stream to path, timing reads (decompression) and
+    writes separately.
+    """
+    decompress_seconds = write_seconds = 0.0
+    size = 0
+    with open(path, "wb") as dst:
+        while True:
+            started = time.perf_counter()
+            chunk = src.read(_COPY_CHUNK_SIZE)
+            read_done = time.perf_counter()
+            decompress_seconds += read_done - started
+            if not chunk:
+                break
+            dst.write(chunk)
+            write_seconds += time.perf_counter() - read_done
+            size += len(chunk)
+    metrics.add_member(name, size, decompress_seconds, write_seconds)
+
+
+# Layout of a zip local file header: signature, then the name and extra
+# field lengths at offsets 26 and 28 of its 30 fixed bytes
+_ZIP_LOCAL_HEADER_SIZE = 30
+_ZIP_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+
+# Errors meaning the kernel can't copy between these two files directly
+_NO_KERNEL_COPY = {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP}
+
+
+def _kernel_copy(src_fd, dst_fd, offset, count):
+    """
+    Copies count bytes at offset in src_fd to dst_fd without passing them
+    through user space: copy_file_range, else sendfile. Returns False if
+    neither is available, so the caller can fall back to a plain write.
+    """
+    for copy in ("copy_file_range", "sendfile"):
+        if not hasattr(os, copy):
+            continue
+        copied = 0
+        try:
+            while copied < count:
+                if copy == "copy_file_range":
+                    n = os.copy_file_range(
+                        src_fd, dst_fd, count - copied, offset + copied
+                    )
+                else:
+                    n = os.sendfile(dst_fd, src_fd, offset + copied, count - copied)
+                if n == 0:
+                    raise ValueError("Zip member data is truncated")
+                copied += n
+            return True
+        except OSError as e:
+            if e.errno not in _NO_KERNEL_COPY or copied:
+                raise
+    return False
+
+
+def _zip_member_path(target_dir, name):
+    """
+    Returns where a zip member is written, sanitized the same way as
+    ZipFile.extract (no drive, no absolute path, no "." or ".."). Names that
+    need it are rejected by the extraction guard first.
+    """
+    parts = [
+        part
+        for part in os.path.splitdrive(name.replace("/", os.sep))[1].split(os.sep)
+        if part not in ("", os.curdir, os.pardir)
+    ]
+    return os.path.join(target_dir, *parts)
 
 
 class ArchiveExtractor:
-    def __init__(self, archive_path, original_filename):
+    def __init__(
+        self,
+        archive_path,
+        original_filename,
+        excludes=None,
+        includes=None,
+        max_workers=None,
+        cache_dir=None,
+        cache_max_bytes=DEFAULT_ARCHIVE_CACHE_BYTES,
+        limits=None,
+        metrics_callback=None,
+        metrics_log=None,
+    ):
+        """
+        Args:
+            archive_path (str): Path of the uploaded archive.
+            original_filename (str): Name the archive was uploaded with.
+            excludes (list[str], optional): .gitignore-style patterns of entries
+                                            to skip. Defaults to
+                                            DEFAULT_ARCHIVE_EXCLUDES.
+            includes (list[str], optional): If given, only entries matching one
+                                            of these patterns are extracted.
+            max_workers (int, optional): Threads used to extract zip members.
+                                         Defaults to the number of CPUs.
+            cache_dir (str | Path, optional): If set, extracted trees are kept
+                                              there, keyed by the archive's
+                                              digest, and re-uploads of the
+                                              same archive are linked from it.
+            cache_max_bytes (int): Size bound of the cache; the least recently
+                                   used trees are evicted beyond it.
+            limits (dict, optional): Overrides for DEFAULT_EXTRACTION_LIMITS.
+            metrics_callback (callable, optional): Called with the metrics dict
+                                                   of each extraction.
+            metrics_log (str | Path, optional): JSON-lines file each metrics
+                                                dict is appended to.
+        """
         self.archive_path = archive_path
         self.original_filename = original_filename
+        self.exclude_patterns = list(
+            DEFAULT_ARCHIVE_EXCLUDES if excludes is None else excludes
+        )
+        self.include_patterns = list(includes) if includes else None
+        self.excludes = IgnoreRules(self.exclude_patterns)
+        self.includes = IgnoreRules(includes) if includes else None
+        self.max_workers = max_workers or min(32, os.cpu_count() or 1)
+        self.cache = ArchiveCache(cache_dir, cache_max_bytes) if cache_dir else None
+        self.limits = {**DEFAULT_EXTRACTION_LIMITS, **(limits or {})}
+        self.metrics_callback = metrics_callback
+        self.metrics_log = metrics_log
+        self._inspection = None
+        self._inspect_seconds = 0.0
+        self._cache_key = None
+        self._metrics = None
+
+    def _get_cache_key(self):
+        """
+        Returns the cache key: the archive's digest plus everything else that
+        changes what an extraction produces.
+        """
+        if self._cache_key is None:
+            options = json.dumps(
+                [self._archive_type(), self.exclude_patterns, self.include_patterns]
+            )
+            digest = file_digest(self.archive_path)
+            self._cache_key = hashlib.sha256(
+                f"{digest}\0{options}".encode()
+            ).hexdigest()[:32]
+        return self._cache_key
 
     def extract(self, target_dir):
-        """Extracts an archive to a target directory."""
-        if self.original_filename.endswith(".zip"):
-            with zipfile.ZipFile(self.archive_path, "r") as zip_ref:
-                zip_ref.extractall(target_dir)
-        elif self.original_filename.endswith((".tar.gz", ".tar")):
-            with tarfile.open(self.archive_path) as tar_ref:
-                tar_ref.extractall(target_dir)
-        else:
-            raise ValueError("Unsupported archive format")
+        """
+        Extracts an archive to a target directory.
 
-        return self._find_project_root(target_dir)
+        Entries matching the exclude rules (or missing the include rules) are
+        skipped as the members are read, so they never reach the disk. Rules
+        are matched against paths relative to the project root. Every member
+        is checked against self.limits before it is written, and the first
+        one over a limit aborts with ExtractionLimitError. With a cache,
+        an archive extracted before is hardlinked or reflinked from there
+        instead of being decompressed again.
 
-    def _find_project_root(self, base_path):
-        """Finds a nested project root if one exists."""
-        items = [
-            name
-            for name in os.listdir(base_path)
-            if not name.startswith(".") and name != "__MACOSX"
-        ]
-        if len(items) == 1 and os.path.isdir(os.path.join(base_path, items[0])):
+        Metrics (bytes read and written, member counts, inspect, decompress,
+        write and link times, and the slowest members) are passed to
+        metrics_callback and appended to metrics_log once it's done.
+
+        Returns:
+            dict: root_path, project_name and excluded, a report of the
+                  skipped entries: {"rules": {pattern: {"files", "bytes"}},
+                  "files", "bytes"}.
+        """
+        started = time.perf_counter()
+        self._metrics = _ExtractionMetrics(
+            self.archive_path, self.original_filename, self._archive_type()
+        )
+        result = self._extract_cached(target_dir)
+        self._metrics.data["seconds"]["inspect"] = self._inspect_seconds
+        self._metrics.data["seconds"]["total"] = time.perf_counter() - started
+        self._emit_metrics(self._metrics.finish())
+        return result
+
+    def _emit_metrics(self, metrics):
+        seconds = metrics["seconds"]
+        print(
+            f"Extracted {metrics['files_written']} files "
+            f"({metrics['bytes_written']} bytes) from {metrics['archive']} in "
+            f"{seconds['total']:.3f}s: decompress {seconds['decompress']:.3f}s, "
+            f"write {seconds['write']:.3f}s, link {seconds['link']:.3f}s"
+        )
+        if self.metrics_log:
+            with open(self.metrics_log, "a") as f:
+                f.write(json.dumps(dict(metrics, timestamp=time.time())) + "\n")
+        if self.metrics_callback:
+            self.metrics_callback(metrics)
+
+    def _extract_cached(self, target_dir):
+        if self.cache is None:
+            return self._extract(target_dir)
+
+        def fill(tree_dir):
+            result = self._extract(tree_dir)
             return {
-                "root_path": os.path.join(base_path, items[0]),
-                "project_name": items[0],
+                "root": os.path.relpath(result["root_path"], tree_dir),
+                "excluded": result["excluded"],
+                "inspection": self._dump_inspection(self._get_inspection()),
             }
 
-        project_name = (
-            self.original_filename.replace(".zip", "")
-            .replace(".tar.gz", "")
-            .replace(".tar", "")
-            .replace("_", "-")
+        key = self._get_cache_key()
+        linking = time.perf_counter()
+        meta = self.cache.get(key, target_dir)
+        if meta is not None:
+            self._metrics.data["cache_hit"] = True
+            self._metrics.data["seconds"]["link"] = time.perf_counter() - linking
+        else:
+            meta = self.cache.put(key, fill, target_dir)
+        if self._inspection is None:
+            self._inspection = self._load_inspection(meta["inspection"])
+        if meta["root"] == ".":
+            return {
+                "root_path": target_dir,
+                "project_name": self._default_project_name(),
+                "excluded": meta["excluded"],
+            }
+        return {
+            "root_path": os.path.join(target_dir, meta["root"]),
+            "project_name": os.path.basename(meta["root"]),
+            "excluded": meta["excluded"],
+        }
+
+    @staticmethod
+    def _dump_inspection(inspection):
+        return dict(
+            inspection,
+            markers={
+                name: base64.b64encode(content).decode()
+                for name, content in inspection["markers"].items()
+            },
+        )
+
+    def _load_inspection(self, stored):
+        inspection = dict(
+            stored,
+            markers={
+                name: base64.b64decode(content)
+                for name, content in stored["markers"].items()
+            },
+        )
+        # A flat archive is named after the file it was uploaded as this time
+        if not inspection["root_prefix"]:
+            inspection["project_name"] = self._default_project_name()
+        return inspection
+
+    def _extract(self, target_dir):
+        root_prefix = self._get_inspection()["root_prefix"]
+        excluded = {"rules": {}, "files": 0, "bytes": 0}
+        guard = _ExtractionGuard(self.archive_path, self.limits)
+        metrics = self._metrics
+
+        def keep(name, is_dir, size):
+            metrics.data["members"] += 1
+            guard.check_member(name)
+            rule = self._excluded_by(name.removeprefix("./"), is_dir, root_prefix)
+            if rule is None:
+                if not is_dir:
+                    guard.check_file(name, size)
+                return True
+            stats = excluded["rules"].setdefault(rule, {"files": 0, "bytes": 0})
+            if not is_dir:
+                stats["files"] += 1
+                stats["bytes"] += size
+                excluded["files"] += 1
+                excluded["bytes"] += size
+                metrics.data["excluded_files"] += 1
+            return False
+
+        if self._archive_type() == "zip":
+            # The central directory declares every size, so a zip is checked
+            # in full before the first byte is written
+            with zipfile.ZipFile(self.archive_path, "r") as zip_ref:
+                members = [
+                    info
+                    for info in zip_ref.infolist()
+                    if keep(info.filename, info.is_dir(), info.file_size)
+                ]
+            metrics.data["bytes_read"] = sum(info.compress_size for info in members)
+            self._extract_zip_members(members, target_dir)
+        else:
+            with self._open_tar() as tar_ref:
+                for member in tar_ref:
+                    if not keep(member.name, member.isdir(), member.size):
+                        continue
+                    try:
+                        # Rejects links out of the target, device files...
+                        safe_member = tarfile.data_filter(member, target_dir)
+                    except tarfile.FilterError as e:
+                        guard.fail(
+                            "path", member.name, None, member.name,
+                            f"Archive entry points outside the extraction folder: {e}",
+                        )
+                    if safe_member.isreg():
+                        self._extract_tar_file(tar_ref, member, safe_member, target_dir)
+                    else:
+                        tar_ref.extract(safe_member, target_dir, filter="data")
+            # A stream is read from start to end
+            metrics.data["bytes_read"] = metrics.data["archive_bytes"]
+
+        if excluded["files"]:
+            print(
+                f"Skipped {excluded['files']} excluded files "
+                f"({excluded['bytes']} bytes): {excluded['rules']}"
+            )
+        # The root found from the member names, so that a view of the archive
+        # and the extracted tree always agree
+        inspection = self._get_inspection()
+        root_path = target_dir
+        if inspection["root_prefix"]:
+            root_path = os.path.join(target_dir, inspection["root_prefix"].rstrip("/"))
+            os.makedirs(root_path, exist_ok=True)
+        return {
+            "root_path": root_path,
+            "project_name": inspection["project_name"],
+            "excluded": excluded,
+        }
+
+    def _extract_zip_members(self, members, target_dir):
+        """
+        Writes zip members to target_dir, in parallel for large archives.
+
+        Zip members are compressed independently, so each worker thread opens
+        its own handle on the archive and inflates its members without
+        sharing any state. All directories are created up front so workers
+        never race on makedirs.
+        """
+        files = []
+        directories = {target_dir}
+        for info in members:
+            path = _zip_member_path(target_dir, info.filename)
+            if info.is_dir():
+                directories.add(path)
+            else:
+                directories.add(os.path.dirname(path))
+                files.append((info, path))
+        for directory in sorted(directories):
+            os.makedirs(directory, exist_ok=True)
+
+        local = threading.local()
+        handles = []
+        handles_lock = threading.Lock()
+
+        def write_member(item):
+            info, path = item
+            if mapping is not None and self._copy_stored_member(
+                mapping, archive.fileno(), info, path
+            ):
+                return
+            zip_ref = getattr(local, "zip_ref", None)
+            if zip_ref is None:
+                zip_ref = local.zip_ref = zipfile.ZipFile(self.archive_path, "r")
+                with handles_lock:
+                    handles.append(zip_ref)
+            with zip_ref.open(info) as src:
+                _copy_member(src, path, info.filename, self._metrics)
+
+        workers = self.max_workers if len(files) >= PARALLEL_EXTRACT_MIN_FILES else 1
+        # Stored members are served straight from a read-only mapping of the
+        # archive, which every worker can share
+        archive = open(self.archive_path, "rb")
+        mapping = None
+        if os.fstat(archive.fileno()).st_size:
+            mapping = mmap.mmap(archive.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if workers == 1:
+                for item in files:
+                    write_member(item)
+            else:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    # list() re-raises the first worker error, if any
+                    list(executor.map(write_member, files))
+        finally:
+            for zip_ref in handles:
+                zip_ref.close()
+            if mapping is not None:
+                mapping.close()
+            archive.close()
+
+    def _copy_stored_member(self, mapping, archive_fd, info, path):
+        """
+        Writes a stored (uncompressed) member by having the kernel copy its
+        bytes from the archive, then checks its CRC against the mapping.
+
+        Returns:
+            bool: False if the member must go through ZipFile instead
+                  (compressed, encrypted, or an unexpected header).
+        """
+        if info.compress_type != zipfile.ZIP_STORED or info.flag_bits & 0x1:
+            return False
+        header = mapping[info.header_offset : info.header_offset + _ZIP_LOCAL_HEADER_SIZE]
+        if len(header) < _ZIP_LOCAL_HEADER_SIZE or header[:4] != _ZIP_LOCAL_HEADER_SIGNATURE:
+            return False
+        name_length = int.from_bytes(header[26:28], "little")
+        extra_length = int.from_bytes(header[28:30], "little")
+        start = info.header_offset + _ZIP_LOCAL_HEADER_SIZE + name_length + extra_length
+        end = start + info.file_size
+        if end > len(mapping):
+            raise ValueError(f"Zip member '{info.filename}' is truncated")
+
+        started = time.perf_counter()
+        with memoryview(mapping) as view, view[start:end] as data:
+            if zlib.crc32(data) != info.CRC:
+                raise ValueError(f"Bad CRC-32 for zip member '{info.filename}'")
+            with open(path, "wb") as dst:
+                if not _kernel_copy(archive_fd, dst.fileno(), start, info.file_size):
+                    dst.write(data)
+        self._metrics.add_member(
+            info.filename, info.file_size, 0.0, time.perf_counter() - started
+        )
+        with self._metrics.lock:
+            self._metrics.data["zero_copy_files"] += 1
+        return True
+
+    def _extract_tar_file(self, tar_ref, member, safe_member, target_dir):
+        """
+        Writes a regular tar member like TarFile.extract would, but through
+        _copy_member so decompression and write times are measured apart.
+        """
+        path = os.path.join(target_dir, safe_member.name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with tar_ref.extractfile(member) as src:
+            _copy_member(src, path, member.name, self._metrics)
+        if safe_member.mode is not None:
+            os.chmod(path, safe_member.mode)
+        if safe_member.mtime is not None:
+            os.utime(path, (safe_member.mtime, safe_member.mtime))
+
+    def _excluded_by(self, name, is_dir, root_prefix):
+        """Returns the rule that skips an entry, or None to extract it."""
+        name = name.rstrip("/")
+        if root_prefix and name + "/" == root_prefix:
+            return None
+        if root_prefix and name.startswith(root_prefix):
+            path = name[len(root_prefix):]
+        else:
+            path = name
+        rule = self.excludes.excluded_by(path, is_dir)
+        if rule is None and self.includes is not None and not is_dir:
+            if not self.includes.excludes(path):
+                rule = "(not included)"
+        return rule
+
+    def members(self):
+        """
+        Lists the entries extract() would write under the project root,
+        without reading more than inspect() does.
+
+        Returns:
+            list[tuple[str, bool]]: ("/"-separated path, is_dir) pairs.
+        """
+        root_prefix = self._get_inspection()["root_prefix"]
+        entries = []
+        for name in self._get_inspection()["names"]:
+            is_dir = name.endswith("/")
+            path = name.rstrip("/")
+            if not path.startswith(root_prefix) or path + "/" == root_prefix:
+                continue
+            if self._excluded_by(path, is_dir, root_prefix) is None:
+                entries.append((path[len(root_prefix):], is_dir))
+        return entries
+
+    def read_member(self, path):
+        """
+        Returns the contents of the file at path, relative to the project
+        root, without extracting anything. Marker files come from the
+        inspection; other zip members are read directly and tarballs are
+        streamed up to the member.
+
+        Raises:
+            FileNotFoundError: If the archive has no such file.
+        """
+        inspection = self._get_inspection()
+        if path in inspection["markers"]:
+            return inspection["markers"][path]
+        name = inspection["root_prefix"] + path
+        if self._archive_type() == "zip":
+            with zipfile.ZipFile(self.archive_path, "r") as zip_ref:
+                for info in zip_ref.infolist():
+                    if info.filename.lstrip("/") == name and not info.is_dir():
+                        return zip_ref.read(info)
+        else:
+            with self._open_tar() as tar_ref:
+                for member in tar_ref:
+                    if member.isfile() and member.name.removeprefix("./").lstrip("/") == name:
+                        return tar_ref.extractfile(member).read()
+        raise FileNotFoundError(f"{path} is not in {self.original_filename}")
+
+    def _get_inspection(self):
+        if self._inspection is None:
+            self.inspect()
+        return self._inspection
+
+    def inspect(self):
+        """
+        Inspects an archive without extracting it.
+
+        Only the zip central directory or the tar headers are read, plus the
+        contents of the framework marker files (requirements.txt, package.json,
+        go.mod, pom.xml) found in the project root.
+
+        Returns:
+            dict: root_prefix (the nested project folder, "" if none),
+                  project_name, members (number of entries) and markers
+                  (file name -> bytes).
+        """
+        started = time.perf_counter()
+        try:
+            return self._inspect()
+        finally:
+            self._inspect_seconds = time.perf_counter() - started
+
+    def _inspect(self):
+        # A zip's central directory is read in milliseconds, far less than
+        # hashing the whole upload, so only tarballs (whose header pass reads
+        # the entire stream anyway) are looked up in the cache here; zips are
+        # hashed by extract(), which runs in the background
+        if self.cache is not None and self._archive_type() != "zip":
+            meta = self.cache.peek(self._get_cache_key())
+            if meta is not None:
+                self._inspection = self._load_inspection(meta["inspection"])
+                return self._inspection
+
+        if self._archive_type() == "zip":
+            names, markers, entries = self._scan_zip()
+        else:
+            names, markers, entries = self._scan_tar()
+
+        root_prefix = self._find_root_prefix(names)
+        # The limits extract() enforces, applied to the declared names and
+        # sizes, so a hostile upload fails validation before anything is
+        # written rather than later in the background extraction
+        guard = _ExtractionGuard(self.archive_path, self.limits)
+        for name, is_dir, size in entries:
+            guard.check_member(name)
+            if not is_dir and self._excluded_by(
+                name.removeprefix("./"), is_dir, root_prefix
+            ) is None:
+                guard.check_file(name, size)
+        self._inspection = {
+            "root_prefix": root_prefix,
+            "project_name": root_prefix.rstrip("/") or self._default_project_name(),
+            "members": len(names),
+            "names": names,
+            "markers": {
+                posixpath.basename(path): content
+                for path, content in markers.items()
+                if posixpath.dirname(path) == root_prefix.rstrip("/")
+            },
+        }
+        return self._inspection
+
+    def _archive_type(self):
+        """Returns "zip" or the tar suffix of the upload; raises if unsupported."""
+        name = self.original_filename.lower()
+        if name.endswith(".zip"):
+            return "zip"
+        for suffix in TAR_EXTENSIONS:
+            if name.endswith(suffix):
+                return suffix
+        raise ValueError("Unsupported archive format")
+
+    @contextlib.contextmanager
+    def _open_tar(self):
+        """
+        Opens the tarball as a stream ("r|*" style): members are read in one
+        sequential pass with bounded memory and the file is never seeked, so
+        multi-GB uploads cost no more than their decompression.
+        """
+        mode = TAR_EXTENSIONS[self._archive_type()]
+        with open(self.archive_path, "rb") as raw:
+            if mode == "zst":
+                with zstandard.ZstdDecompressor().stream_reader(raw) as stream:
+                    with tarfile.open(fileobj=stream, mode="r|") as tar_ref:
+                        yield tar_ref
+            else:
+                with tarfile.open(fileobj=raw, mode=mode) as tar_ref:
+                    yield tar_ref
+
+    def _scan_zip(self):
+        """
+        Returns the member names, marker candidates and (raw name, is_dir,
+        declared size) of every entry of a zip archive.
+        """
+        try:
+            with zipfile.ZipFile(self.archive_path, "r") as zip_ref:
+                infos = zip_ref.infolist()
+                names = [info.filename.lstrip("/") for info in infos]
+                entries = [(info.filename, info.is_dir(), info.file_size) for info in infos]
+                markers = {
+                    info.filename: zip_ref.read(info)
+                    for info in infos
+                    if self._is_marker_candidate(info.filename, info.file_size)
+                    and not info.is_dir()
+                }
+        except zipfile.BadZipFile as e:
+            raise ValueError(f"Invalid zip archive: {e}")
+        return names, markers, entries
+
+    def _scan_tar(self):
+        """
+        Returns the member names, marker candidates and (raw name, is_dir,
+        declared size) of every entry of a tar archive.
+
+        The headers are read in one pass; candidates are read as they are met
+        since the root isn't known until the end.
+        """
+        names = []
+        markers = {}
+        entries = []
+        try:
+            with self._open_tar() as tar_ref:
+                for member in tar_ref:
+                    entries.append((member.name, member.isdir(), member.size))
+                    name = member.name.removeprefix("./").lstrip("/")
+                    if not name or name == ".":
+                        continue
+                    names.append(name + "/" if member.isdir() else name)
+                    if member.isfile() and self._is_marker_candidate(name, member.size):
+                        markers[name] = tar_ref.extractfile(member).read()
+        except tarfile.TarError as e:
+            raise ValueError(f"Invalid tar archive: {e}")
+        return names, markers, entries
+
+    @staticmethod
+    def _is_marker_candidate(name, size):
+        """Markers may only be at the top level or one folder down."""
+        return (
+            posixpath.basename(name) in MARKER_FILES
+            and name.count("/") <= 1
+            and size <= MAX_MARKER_SIZE
+        )
+
+    @staticmethod
+    def _find_root_prefix(names):
+        """
+        Returns the folder the project is nested in: the only top-level entry
+        if it is a folder, ignoring hidden entries and __MACOSX, else "".
+        """
+        top_level = {}
+        for name in names:
+            head, sep, rest = name.lstrip("/").partition("/")
+            if not head or _is_hidden(head):
+                continue
+            # A top-level entry is a folder if anything is stored under it
+            top_level[head] = top_level.get(head, False) or bool(sep)
+        if len(top_level) == 1:
+            name, is_dir = next(iter(top_level.items()))
+            if is_dir:
+                return name + "/"
+        return ""
+
+    def _default_project_name(self):
+        name = self.original_filename
+        suffix = self._archive_type()
+        name = name[: -len(".zip" if suffix == "zip" else suffix)]
+        return (
+            name.replace("_", "-")
             .lower()
             .replace(" ", "-")
         )
-        return {"root_path": base_path, "project_name": project_name}
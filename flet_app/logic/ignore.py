@@ -0,0 +1,118 @@
+import os
+import re
+
+
+def _translate(pattern: str) -> str:
+    """Translates the glob part of a gitignore pattern into a regex."""
+    regex = ""
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            regex += "/.*"
+            i += 3
+        elif pattern.startswith("**", i):
+            regex += ".*"
+            i += 2
+        elif pattern[i] == "*":
+            regex += "[^/]*"
+            i += 1
+        elif pattern[i] == "?":
+            regex += "[^/]"
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 2 :]:
+            end = pattern.index("]", i + 2)
+            body = pattern[i + 1 : end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            regex += f"[{body}]"
+            i = end + 1
+        elif pattern[i] == "\\" and i + 1 < len(pattern):
+            regex += re.escape(pattern[i + 1])
+            i += 2
+        else:
+            regex += re.escape(pattern[i])
+            i += 1
+    return regex
+
+
+class IgnoreRules:
+    """
+    A set of .gitignore-style rules.
+
+    Supports comments, negation (!), directory-only patterns (trailing /),
+    anchoring (leading or inner /) and *, ?, [...] and ** globs. As in git,
+    the last matching rule wins and nothing inside an excluded directory can
+    be re-included.
+    """
+
+    def __init__(self, patterns=(), base: str = ""):
+        self.rules = []
+        self.add(patterns, base)
+
+    def add(self, patterns, base: str = ""):
+        """
+        Adds patterns, relative to base (a "/"-separated path inside the tree),
+        as a .gitignore file in that directory would.
+        """
+        base = base.strip("/")
+        for line in patterns:
+            line = line.rstrip("\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+            text = line.rstrip()
+            negate = text.startswith("!")
+            if negate:
+                text = text[1:]
+            dir_only = text.endswith("/")
+            # Only the trailing slash goes before anchoring is decided: a
+            # leading one still anchors "/build/" to base
+            text = text.rstrip("/")
+            anchored = "/" in text
+            text = text.lstrip("/")
+            if not text:
+                continue
+
+            prefix = re.escape(base) + "/" if base else ""
+            body = _translate(text)
+            regex = f"^{prefix}{body}$" if anchored else f"^{prefix}(?:.*/)?{body}$"
+            self.rules.append((re.compile(regex), negate, dir_only, line.strip()))
+
+    def add_file(self, path, base: str = ""):
+        """Adds the rules of a .gitignore file; missing files are ignored."""
+        try:
+            with open(path, "r", errors="replace") as f:
+                self.add(f.readlines(), base)
+        except FileNotFoundError:
+            pass
+
+    def _match(self, path: str, is_dir: bool) -> str | None:
+        decision = None
+        for regex, negate, dir_only, text in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(path):
+                decision = None if negate else text
+        return decision
+
+    def excluded_by(self, path: str, is_dir: bool = False) -> str | None:
+        """
+        Returns the pattern that excludes path, or None if it is included.
+
+        Args:
+            path (str): "/"-separated path relative to the tree root.
+            is_dir (bool): Whether path is a directory.
+        """
+        path = path.replace(os.sep, "/").strip("/")
+        parts = path.split("/")
+        # An excluded parent directory excludes everything below it
+        for depth in range(1, len(parts)):
+            rule = self._match("/".join(parts[:depth]), True)
+            if rule:
+                return rule
+        return self._match(path, is_dir)
+
+    def excludes(self, path: str, is_dir: bool = False) -> bool:
+        return self.excluded_by(path, is_dir) is not None
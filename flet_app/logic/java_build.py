@@ -0,0 +1,242 @@
+import posixpath
+import re
+import xml.etree.ElementTree as ET
+
+# Build files of the two supported build tools, in the order they are tried
+GRADLE_BUILD_FILES = ["build.gradle", "build.gradle.kts"]
+GRADLE_SETTINGS_FILES = ["settings.gradle", "settings.gradle.kts"]
+
+SPRING_BOOT_GROUP = "org.springframework.boot"
+
+# Modules listed by a root build are only followed this deep
+MAX_MODULE_DEPTH = 2
+
+_GRADLE_PLUGIN_RE = re.compile(
+    r"""(?:id\s*\(?\s*["']org\.springframework\.boot["']|apply\s+plugin:\s*["']org\.springframework\.boot["'])"""
+)
+_GRADLE_DEPENDENCY_RE = re.compile(
+    r"""^\s*(implementation|api|runtimeOnly|compileOnly|annotationProcessor|developmentOnly)\s*\(?\s*["']([^"':]+):([^"':]+)(?::([^"']+))?["']"""
+)
+_GRADLE_INCLUDE_RE = re.compile(r"""^\s*include\b\s*\(?\s*(.+?)\)?\s*$""")
+_GRADLE_QUOTED_RE = re.compile(r"""["']:?([^"']+)["']""")
+
+
+def _local(tag):
+    """Drops the namespace from an ElementTree tag ("{...}artifactId" -> "artifactId")."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def parse_pom(fileobj):
+    """
+    Parses a pom.xml incrementally with iterparse, keeping only the current
+    branch of the document in memory: every element is cleared once its end
+    is reached, so huge POMs cost no more than small ones.
+
+    Args:
+        fileobj: The POM opened in binary mode.
+
+    Returns:
+        dict: parent, artifact (groupId, artifactId, version), packaging,
+              final_name, modules, dependencies (list of {groupId,
+              artifactId, version, scope}), managed (dependencyManagement
+              entries), plugins (list of "groupId:artifactId").
+
+    Raises:
+        ValueError: If the POM isn't well-formed XML.
+    """
+    result = {
+        "parent": {},
+        "artifact": {},
+        "packaging": "jar",
+        "final_name": None,
+        "modules": [],
+        "dependencies": [],
+        "managed": [],
+        "plugins": [],
+    }
+    path = []
+    elements = []
+    # Fields of the <dependency> and <plugin> elements being read; plugins
+    # can declare dependencies of their own
+    items = []
+    try:
+        for event, element in ET.iterparse(fileobj, events=("start", "end")):
+            tag = _local(element.tag)
+            if event == "start":
+                path.append(tag)
+                elements.append(element)
+                if tag in ("dependency", "plugin"):
+                    items.append({})
+                continue
+
+            text = (element.text or "").strip()
+            parent = path[-2] if len(path) > 1 else None
+            where = "/".join(path[1:])
+            if parent == "parent" and len(path) == 3:
+                result["parent"][tag] = text
+            elif len(path) == 2 and tag in ("groupId", "artifactId", "version"):
+                result["artifact"][tag] = text
+            elif where == "packaging":
+                result["packaging"] = text
+            elif where == "build/finalName":
+                result["final_name"] = text
+            elif where == "modules/module":
+                result["modules"].append(text)
+            elif parent in ("dependency", "plugin") and tag in (
+                "groupId", "artifactId", "version", "scope",
+            ):
+                items[-1][tag] = text
+            elif tag in ("dependency", "plugin"):
+                item = items.pop()
+                if where == "dependencies/dependency":
+                    result["dependencies"].append(item)
+                elif where == "dependencyManagement/dependencies/dependency":
+                    result["managed"].append(item)
+                elif where in ("build/plugins/plugin", "build/pluginManagement/plugins/plugin"):
+                    # Maven plugins default to the org.apache.maven.plugins group
+                    group = item.get("groupId", "org.apache.maven.plugins")
+                    result["plugins"].append(f"{group}:{item.get('artifactId', '')}")
+
+            path.pop()
+            elements.pop()
+            # Nothing below the current branch is needed again: empty the
+            # element and detach it so the tree never grows
+            element.clear()
+            if elements:
+                elements[-1].remove(element)
+    except ET.ParseError as e:
+        raise ValueError(f"pom.xml is not valid XML: {e}")
+    return result
+
+
+def parse_gradle(lines):
+    """
+    Scans a Gradle build script (Groovy or Kotlin DSL) line by line.
+
+    Args:
+        lines: An iterable of the script's lines, e.g. the open file.
+
+    Returns:
+        dict: spring_boot_plugin (whether org.springframework.boot is
+              applied), dependencies (list of {groupId, artifactId, version,
+              scope}) and includes (subprojects named by include, for
+              settings scripts).
+    """
+    result = {"spring_boot_plugin": False, "dependencies": [], "includes": []}
+    for line in lines:
+        line = line.split("//")[0]
+        if _GRADLE_PLUGIN_RE.search(line):
+            result["spring_boot_plugin"] = True
+        match = _GRADLE_DEPENDENCY_RE.match(line)
+        if match:
+            scope, group, artifact, version = match.groups()
+            result["dependencies"].append(
+                {"groupId": group, "artifactId": artifact, "version": version or "", "scope": scope}
+            )
+            continue
+        match = _GRADLE_INCLUDE_RE.match(line)
+        if match:
+            result["includes"] += [
+                name.replace(":", "/") for name in _GRADLE_QUOTED_RE.findall(match.group(1))
+            ]
+    return result
+
+
+def _pom_evidence(pom):
+    evidence = []
+    if pom["parent"].get("artifactId") == "spring-boot-starter-parent":
+        evidence.append("spring-boot-starter-parent")
+    if f"{SPRING_BOOT_GROUP}:spring-boot-maven-plugin" in pom["plugins"]:
+        evidence.append("spring-boot-maven-plugin")
+    if any(d.get("artifactId") == "spring-boot-dependencies" for d in pom["managed"]):
+        evidence.append("spring-boot-dependencies import")
+    if any(d.get("groupId") == SPRING_BOOT_GROUP for d in pom["dependencies"]):
+        evidence.append("spring-boot dependency")
+    return evidence
+
+
+def _gradle_evidence(gradle):
+    evidence = []
+    if gradle["spring_boot_plugin"]:
+        evidence.append("org.springframework.boot plugin")
+    if any(d["groupId"] == SPRING_BOOT_GROUP for d in gradle["dependencies"]):
+        evidence.append("spring-boot dependency")
+    return evidence
+
+
+def read_java_build(view, folder="", depth=0):
+    """
+    Reads a Maven or Gradle project, following its modules, through a
+    project view.
+
+    Args:
+        view: A DirectoryProjectView, ProjectIndex or ArchiveProjectView.
+        folder (str): The (sub)project to read, relative to the root.
+
+    Returns:
+        dict | None: build_tool ("maven" or "gradle"), build_file,
+                     spring_boot (evidence found), evidence (list of
+                     "<file>: <reason>"), dependencies (total across
+                     modules), modules, packaging and final_name (the
+                     artifact size hints), or None if folder has no build
+                     file.
+
+    Raises:
+        ValueError: If a pom.xml isn't valid XML.
+    """
+    pom_path = posixpath.join(folder, "pom.xml")
+    if view.exists(pom_path):
+        with view.open(pom_path, "rb") as f:
+            pom = parse_pom(f)
+        info = {
+            "build_tool": "maven",
+            "build_file": pom_path,
+            "evidence": [f"{pom_path}: {reason}" for reason in _pom_evidence(pom)],
+            "dependencies": len(pom["dependencies"]),
+            "modules": [posixpath.join(folder, module) for module in pom["modules"]],
+            "packaging": pom["packaging"],
+            "final_name": pom["final_name"],
+        }
+    else:
+        build_path = next(
+            (
+                posixpath.join(folder, name)
+                for name in GRADLE_BUILD_FILES
+                if view.exists(posixpath.join(folder, name))
+            ),
+            None,
+        )
+        if build_path is None:
+            return None
+        with view.open(build_path, "r") as f:
+            gradle = parse_gradle(f)
+        modules = []
+        for name in GRADLE_SETTINGS_FILES:
+            settings_path = posixpath.join(folder, name)
+            if view.exists(settings_path):
+                with view.open(settings_path, "r") as f:
+                    modules = [
+                        posixpath.join(folder, include)
+                        for include in parse_gradle(f)["includes"]
+                    ]
+                break
+        info = {
+            "build_tool": "gradle",
+            "build_file": build_path,
+            "evidence": [f"{build_path}: {reason}" for reason in _gradle_evidence(gradle)],
+            "dependencies": len(gradle["dependencies"]),
+            "modules": modules,
+            "packaging": "jar",
+            "final_name": None,
+        }
+
+    # Aggregator builds often leave Spring Boot to their modules
+    if depth < MAX_MODULE_DEPTH:
+        for module in info["modules"]:
+            module_info = read_java_build(view, module, depth + 1)
+            if module_info is None:
+                continue
+            info["evidence"] += module_info["evidence"]
+            info["dependencies"] += module_info["dependencies"]
+    info["spring_boot"] = bool(info["evidence"])
+    return info
@@ -0,0 +1,107 @@
+import errno
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+# ioctl request number for FICLONE (Linux), which makes dst share src's blocks
+_FICLONE = 0x40049409
+
+# Errors that mean "this filesystem can't do that", not "something is broken"
+_UNSUPPORTED = {errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.EPERM}
+
+
+def reflink_file(src, dst):
+    """Creates dst as a copy-on-write clone of src. Raises OSError if unsupported."""
+    try:
+        import fcntl
+    except ImportError:  # Not available on Windows
+        raise OSError(errno.EOPNOTSUPP, "reflinks are not supported on this platform")
+
+    with open(src, "rb") as src_f, open(dst, "wb") as dst_f:
+        try:
+            fcntl.ioctl(dst_f.fileno(), _FICLONE, src_f.fileno())
+        except OSError:
+            dst_f.close()
+            os.remove(dst)
+            raise
+    shutil.copystat(src, dst)
+
+
+def link_files(pairs, hardlink=True, max_workers=None):
+    """
+    Materializes each (src, dst) file pair without copying contents if possible.
+
+    Files are reflinked when the filesystem supports it, otherwise hardlinked
+    (if allowed). Hardlinks share the inode with src, so files in dst must be
+    replaced rather than rewritten in place. When neither works, the remaining
+    files are copied on a thread pool, since copies are bound by I/O.
+
+    Args:
+        pairs: Iterable of (src, dst) paths; parent directories must exist.
+        hardlink (bool): Whether hardlinks may be used as a fallback.
+        max_workers (int, optional): Size of the copy pool.
+
+    Returns:
+        dict: Number of files materialized per method.
+    """
+    methods = ["reflink", "hardlink", "copy"] if hardlink else ["reflink", "copy"]
+    counts = {method: 0 for method in methods}
+    pairs = list(pairs)
+
+    # Methods that fail once are dropped for the rest of the files
+    index = 0
+    while index < len(pairs) and methods[0] != "copy":
+        src, dst = pairs[index]
+        try:
+            if methods[0] == "reflink":
+                reflink_file(src, dst)
+            else:
+                os.link(src, dst)
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED:
+                raise
+            methods.pop(0)
+            continue
+        counts[methods[0]] += 1
+        index += 1
+
+    remaining = pairs[index:]
+    if remaining:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # list() re-raises the first copy error, if any
+            list(executor.map(lambda pair: shutil.copy2(*pair), remaining))
+        counts["copy"] += len(remaining)
+
+    return counts
+
+
+def link_tree(src, dst, hardlink=True, max_workers=None):
+    """
+    Materializes the tree at src into dst with link_files().
+
+    Args:
+        src (str): The directory to materialize.
+        dst (str): The destination directory; created if missing.
+        hardlink (bool): Whether hardlinks may be used as a fallback.
+        max_workers (int, optional): Size of the copy pool.
+
+    Returns:
+        dict: Number of files materialized per method.
+    """
+    pairs = []
+    for dirpath, dirnames, filenames in os.walk(src):
+        rel_dir = os.path.relpath(dirpath, src)
+        out_dir = os.path.join(dst, rel_dir) if rel_dir != "." else dst
+        os.makedirs(out_dir, exist_ok=True)
+
+        for name in list(dirnames) + filenames:
+            src_path = os.path.join(dirpath, name)
+            dst_path = os.path.join(out_dir, name)
+            if os.path.islink(src_path):
+                os.symlink(os.readlink(src_path), dst_path)
+                if name in dirnames:
+                    dirnames.remove(name)  # Don't descend into linked dirs
+            elif name in filenames:
+                pairs.append((src_path, dst_path))
+
+    return link_files(pairs, hardlink=hardlink, max_workers=max_workers)
@@ -0,0 +1,81 @@
+import os
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+from logic.ignore import IgnoreRules
+from logic.linktree import link_files
+
+# Never worth copying into a job, whatever the .gitignore says
+DEFAULT_LOCAL_EXCLUDES = [".git/"]
+
+
+class LocalDirectorySource:
+    def __init__(self, path: str, excludes=None, use_gitignore: bool = True, max_workers=None):
+        """
+        Args:
+            path (str): A local directory, or a file:// URL pointing to one.
+            excludes (list[str], optional): Extra .gitignore-style patterns.
+            use_gitignore (bool): Whether to honor .gitignore files in the tree.
+            max_workers (int, optional): Size of the pool used when files have
+                                         to be copied.
+        """
+        if not path:
+            raise ValueError("Local directory path cannot be empty.")
+        if path.startswith("file://"):
+            path = unquote(urlparse(path).path)
+        self.path = os.path.abspath(os.path.expanduser(path))
+        if not os.path.isdir(self.path):
+            raise ValueError(f"Local directory not found: {self.path}")
+        self.excludes = DEFAULT_LOCAL_EXCLUDES + list(excludes or [])
+        self.use_gitignore = use_gitignore
+        self.max_workers = max_workers
+
+    def _collect(self, target_dir):
+        """
+        Walks the source once, creating directories and symlinks in target_dir
+        and returning the (src, dst) pairs of the files to materialize.
+        """
+        rules = IgnoreRules(self.excludes)
+        pairs = []
+        stack = [""]
+        while stack:
+            rel_dir = stack.pop()
+            src_dir = os.path.join(self.path, rel_dir)
+            if self.use_gitignore:
+                rules.add_file(os.path.join(src_dir, ".gitignore"), base=rel_dir)
+            os.makedirs(os.path.join(target_dir, rel_dir), exist_ok=True)
+
+            with os.scandir(src_dir) as entries:
+                for entry in entries:
+                    rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if rules.excludes(rel_path, is_dir):
+                        continue
+                    dst = os.path.join(target_dir, rel_path)
+                    if entry.is_symlink():
+                        os.symlink(os.readlink(entry.path), dst)
+                    elif is_dir:
+                        stack.append(rel_path)
+                    elif entry.is_file(follow_symlinks=False):
+                        pairs.append((entry.path, dst))
+        return pairs
+
+    def materialize(self, target_dir):
+        """
+        Materializes the local directory into target_dir.
+
+        Files are reflinked or hardlinked where the filesystem allows it and
+        copied in parallel otherwise; excluded paths are never touched.
+
+        Returns:
+            dict: root_path, project_name and the number of files per method.
+        """
+        os.makedirs(target_dir, exist_ok=True)
+        pairs = self._collect(target_dir)
+        methods = link_files(pairs, hardlink=True, max_workers=self.max_workers)
+        print(f"Materialized {len(pairs)} files from {self.path}: {methods}")
+
+        project_name = (
+            Path(self.path).name.replace("_", "-").lower().replace(" ", "-")
+        )
+        return {"root_path": target_dir, "project_name": project_name, "methods": methods}
@@ -1,12 +1,40 @@
-import os
 import json
-import re
+
+from logic.dependencies import normalize_name, resolve_dependencies
+from logic.java_build import read_java_build
+from logic.project_view import DirectoryProjectView
+
+# Read up front when an archive is inspected: the manifests the checks
+# and the framework detector look at in the project root
+MARKER_FILES = {
+    "requirements.txt",
+    "pyproject.toml",
+    "Pipfile",
+    "uv.lock",
+    "package.json",
+    "go.mod",
+    "pom.xml",
+    "build.gradle",
+    "build.gradle.kts",
+    "settings.gradle",
+    "settings.gradle.kts",
+}
 
 
 class ApplicationProcessor:
-    def __init__(self, project_path, framework):
+    def __init__(self, project_path, framework, view=None):
+        """
+        Args:
+            project_path (str): The project root on disk.
+            framework (str): The framework id selected in the wizard.
+            view (optional): What the checks read files through; defaults to a
+                             DirectoryProjectView of project_path. An
+                             ArchiveProjectView validates an upload without
+                             extracting it.
+        """
         self.project_path = project_path
         self.framework = framework
+        self.view = view or DirectoryProjectView(project_path)
 
     def check_project(self):
         """Runs validation checks based on the framework."""
@@ -25,7 +53,8 @@ class ApplicationProcessor:
                 self._check_expressjs()
             case "go":
                 self._check_go()
-            case "springboot":
+            # "springboot" is still accepted from older forms
+            case "spring-boot" | "springboot":
                 self._check_springboot()
             case _:
                 print(f"No specific validation for {self.framework}, assuming success.")
@@ -44,40 +73,40 @@ class ApplicationProcessor:
         return self._check_requirements("fastapi")
 
     def _check_requirements(self, package_name: str):
-        requirements_path = os.path.join(self.project_path, "requirements.txt")
-        if not os.path.exists(requirements_path):
+        if not self.view.exists("requirements.txt"):
             raise ValueError("Project is missing requirements.txt")
-        # Regex to match common package name terminators
-        # This will capture the name before '==', '>=', '<=', '>', '~=', '[', or '#'
-        package_pattern = re.compile(r"^[a-zA-Z0-9\-_.]+")
-
-        with open(requirements_path, "r") as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith("#"):
-                    continue  # Skip empty lines and comments
-
-                match = package_pattern.match(line)
-                if match:
-                    found_package = match.group(0)
-                    if package_name.lower() == found_package.lower():
-                        return True  # Found it!
-
-        return False  # Scanned the whole file, not found
+        # Follows -r includes and also reads pyproject.toml, Pipfile and
+        # uv.lock, with names normalized ("Flask_SQLAlchemy" == "flask-sqlalchemy")
+        return normalize_name(package_name) in resolve_dependencies(self.view)
 
     def _check_expressjs(self):
-        package_json_path = os.path.join(self.project_path, "package.json")
-        if not os.path.exists(package_json_path):
+        if not self.view.exists("package.json"):
             raise ValueError("Project is missing package.json")
-        with open(package_json_path, "r") as f:
-            data = json.load(f)
-            if "start" not in data.get("scripts", {}):
-                raise ValueError("package.json is missing a 'start' script")
+        with self.view.open("package.json", "r") as f:
+            self._check_package_json(json.load(f))
+
+    def _check_package_json(self, data):
+        if "start" not in data.get("scripts", {}):
+            raise ValueError("package.json is missing a 'start' script")
 
     def _check_go(self):
-        if not os.path.exists(os.path.join(self.project_path, "go.mod")):
+        if not self.view.exists("go.mod"):
             raise ValueError("Project is missing go.mod")
 
     def _check_springboot(self):
-        if not os.path.exists(os.path.join(self.project_path, "pom.xml")):
-            raise ValueError("Project is missing pom.xml")
+        # pom.xml is parsed incrementally and Gradle scripts line by line,
+        # following their modules, so huge multi-module builds stay cheap
+        build = read_java_build(self.view)
+        if build is None:
+            raise ValueError("Project is missing pom.xml or build.gradle")
+        if not build["spring_boot"]:
+            raise ValueError(
+                f"{build['build_file']} doesn't use Spring Boot: no spring-boot "
+                "parent, plugin or dependency found"
+            )
+        print(
+            f"Spring Boot project ({build['build_tool']}): "
+            f"{', '.join(build['evidence'])}; {build['dependencies']} dependencies, "
+            f"{len(build['modules'])} modules, packaged as {build['packaging']}"
+        )
+        return build
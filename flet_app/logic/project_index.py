@@ -0,0 +1,104 @@
+import hashlib
+import os
+
+
+class ProjectIndex:
+    """
+    An in-memory index of a project tree, built in a single os.scandir walk.
+
+    It offers the same read-only interface as DirectoryProjectView (exists,
+    isdir, open, listdir), answered from memory except for open(), plus
+    lookups by file name and size totals. Build it once per job and share it
+    between the validators, the framework detector and the estimators
+    instead of walking the tree again.
+
+    Entries map "/"-separated paths relative to the root to dicts with
+    is_dir, size, mtime and, if requested, sha256.
+    """
+
+    def __init__(self, root, hash_contents=False):
+        """
+        Args:
+            root (str): The project root on disk.
+            hash_contents (bool): Whether to store the SHA-256 of every file.
+                                  Otherwise hashes are computed on demand by
+                                  content_hash() and remembered.
+        """
+        self.root = root
+        self.entries = {}
+        self._children = {"": []}
+        self._by_name = {}
+        self.total_size = 0
+        self.file_count = 0
+        self._walk(hash_contents)
+
+    def _walk(self, hash_contents):
+        stack = [""]
+        while stack:
+            rel_dir = stack.pop()
+            with os.scandir(os.path.join(self.root, rel_dir)) as it:
+                for entry in it:
+                    rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                    # Symlinks are indexed as what they are, not followed
+                    stat = entry.stat(follow_symlinks=False)
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    info = {
+                        "is_dir": is_dir,
+                        "size": 0 if is_dir else stat.st_size,
+                        "mtime": stat.st_mtime,
+                    }
+                    self.entries[rel_path] = info
+                    self._children[rel_dir].append(entry.name)
+                    self._by_name.setdefault(entry.name, []).append(rel_path)
+                    if is_dir:
+                        self._children[rel_path] = []
+                        stack.append(rel_path)
+                    else:
+                        self.total_size += info["size"]
+                        self.file_count += 1
+                        if hash_contents and entry.is_file(follow_symlinks=False):
+                            info["sha256"] = self._hash(entry.path)
+
+    @staticmethod
+    def _hash(path):
+        with open(path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+    @staticmethod
+    def _key(path):
+        return path.replace(os.sep, "/").strip("/")
+
+    def exists(self, path):
+        path = self._key(path)
+        return not path or path in self.entries
+
+    def isdir(self, path):
+        return self._key(path) in self._children
+
+    def open(self, path, mode="r"):
+        if self._key(path) not in self.entries:
+            raise FileNotFoundError(f"No such file in the project: {path}")
+        return open(os.path.join(self.root, path), mode)
+
+    def listdir(self, path=""):
+        path = self._key(path)
+        if path not in self._children:
+            raise FileNotFoundError(f"No such folder in the project: {path}")
+        return list(self._children[path])
+
+    def find(self, name):
+        """Returns the paths of every entry called name, at any depth."""
+        return list(self._by_name.get(name, []))
+
+    def files(self):
+        """Yields (path, entry) for every file and symlink in the project."""
+        for path, info in self.entries.items():
+            if not info["is_dir"]:
+                yield path, info
+
+    def content_hash(self, path):
+        """Returns the SHA-256 of a file, hashing it only the first time."""
+        info = self.entries[self._key(path)]
+        if "sha256" not in info:
+            info["sha256"] = self._hash(os.path.join(self.root, path))
+        return info["sha256"]
@@ -0,0 +1,77 @@
+import io
+import os
+import posixpath
+
+
+class DirectoryProjectView:
+    """Read-only access to a project tree on disk, by relative path."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, path):
+        return os.path.join(self.root, path) if path else self.root
+
+    def exists(self, path):
+        return os.path.exists(self._path(path))
+
+    def isdir(self, path):
+        return os.path.isdir(self._path(path))
+
+    def open(self, path, mode="r"):
+        return open(self._path(path), mode)
+
+    def listdir(self, path=""):
+        return os.listdir(self._path(path))
+
+
+class ArchiveProjectView:
+    """
+    The same interface as DirectoryProjectView, answered from an uploaded
+    archive without extracting it.
+
+    Paths are relative to the project root and only entries that extract()
+    would write are visible, so checks against the view see the tree the
+    job will get.
+    """
+
+    def __init__(self, extractor):
+        """
+        Args:
+            extractor (ArchiveExtractor): The extractor of the upload.
+        """
+        self.extractor = extractor
+        self._files = set()
+        self._children = {"": set()}
+        for path, is_dir in extractor.members():
+            if is_dir:
+                self._children.setdefault(path, set())
+            else:
+                self._files.add(path)
+            # Folders are often only implied by the files stored in them
+            parent, name = posixpath.split(path)
+            while True:
+                self._children.setdefault(parent, set()).add(name)
+                if not parent:
+                    break
+                parent, name = posixpath.split(parent)
+
+    def exists(self, path):
+        path = path.strip("/")
+        return path in self._files or path in self._children
+
+    def isdir(self, path):
+        return path.strip("/") in self._children
+
+    def open(self, path, mode="r"):
+        path = path.strip("/")
+        if path not in self._files:
+            raise FileNotFoundError(f"No such file in the upload: {path}")
+        data = self.extractor.read_member(path)
+        return io.BytesIO(data) if "b" in mode else io.StringIO(data.decode())
+
+    def listdir(self, path=""):
+        path = path.strip("/")
+        if path not in self._children:
+            raise FileNotFoundError(f"No such folder in the upload: {path}")
+        return sorted(self._children[path])
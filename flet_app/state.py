@@ -1,11 +1,31 @@
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # --- App State Management ---
 # Moving these shared variables to their own file breaks the circular import.
 JOB_STORE = {}
+# ProjectIndex of each job's source tree, built once when the source is on disk
+JOB_INDEXES = {}
+# Jobs whose source is still being extracted, mapped to the Future of that
+# extraction. It resolves to the status messages to show once it's used.
+PENDING_JOBS = {}
+# Runs those extractions while the user goes through the remaining steps
+EXTRACTION_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="extract")
 
 # Use the system's temporary directory and create a specific folder for our app
 TEMP_STORAGE_PATH = Path(tempfile.gettempdir()) / "rock_charm_generator"
 
+# Bare mirrors of downloaded repositories, reused across jobs so that repeat
+# downloads only fetch what changed upstream.
+GIT_CACHE_PATH = TEMP_STORAGE_PATH / "git-cache"
 
+# Trees extracted from uploaded archives, keyed by the archive's digest, so
+# that re-uploading the same archive links the tree instead of extracting it.
+ARCHIVE_CACHE_PATH = TEMP_STORAGE_PATH / "archive-cache"
+
+# One JSON line of timings and byte counts per archive extraction
+EXTRACTION_METRICS_LOG = TEMP_STORAGE_PATH / "extraction-metrics.jsonl"
+
+# One JSON line per finished rock pack, used to calibrate pack estimates
+PACK_HISTORY_LOG = TEMP_STORAGE_PATH / "pack-history.jsonl"
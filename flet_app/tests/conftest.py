@@ -22,6 +22,20 @@ def temp_project_dir():
         shutil.rmtree(temp_dir, ignore_errors=True)
 
 
+@pytest.fixture
+def make_project():
+    """Fixture to write a project tree from {relative path: text}."""
+    def _make(root: Path, files: dict) -> Path:
+        """Write the files under root and return root."""
+        for name, content in files.items():
+            path = root / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+        return root
+
+    return _make
+
+
 @pytest.fixture
 def download_canonical_flask_minimal(temp_project_dir):
     """Fixture to download canonical/paas-charm flask-minimal example."""
@@ -0,0 +1,142 @@
+"""Unit tests for the Python dependency manifest resolver."""
+import os
+import zipfile
+
+import pytest
+
+import logic.dependencies as dependencies
+from logic.dependencies import normalize_name, parse_requirement, resolve_dependencies
+from logic.extractor import ArchiveExtractor
+from logic.processor import ApplicationProcessor
+from logic.project_view import ArchiveProjectView, DirectoryProjectView
+
+
+@pytest.mark.unit
+class TestParseRequirement:
+    """Test suite for single requirement parsing."""
+
+    def test_name_extras_specifier_and_marker(self):
+        """All parts of a PEP 508 requirement are split out."""
+        assert parse_requirement('Flask_Login[async, dev] >=0.6 ; python_version < "3.12"') == {
+            "name": "flask-login",
+            "extras": ["async", "dev"],
+            "specifier": ">=0.6",
+            "marker": 'python_version < "3.12"',
+        }
+
+    def test_egg_fragment_names_vcs_requirements(self):
+        """A VCS URL is named by its #egg= fragment."""
+        assert parse_requirement("git+https://github.com/x/y.git#egg=My.Pkg")["name"] == "my-pkg"
+
+    def test_bare_url_is_ignored(self):
+        """A URL without a name yields no requirement."""
+        assert parse_requirement("https://example.com/pkg.tar.gz") is None
+
+    def test_normalize_name(self):
+        """Names are normalized as PEP 503 does."""
+        assert normalize_name("Zope.Interface__x") == "zope-interface-x"
+
+
+@pytest.mark.unit
+class TestResolveDependencies:
+    """Test suite for resolve_dependencies."""
+
+    def test_requirements_includes_are_followed(self, tmp_path, make_project):
+        """-r includes are read relative to the including file."""
+        make_project(
+            tmp_path,
+            {
+                "requirements.txt": "-r requirements/base.txt\n-c constraints.txt\ngunicorn \\\n  ==22.0\n",
+                "requirements/base.txt": "# base\n--index-url https://pypi.org/simple\nFlask==3.0 --hash=sha256:abc\n-r ../requirements.txt\n",
+                "constraints.txt": "werkzeug<4\n",
+            },
+        )
+        deps = resolve_dependencies(DirectoryProjectView(str(tmp_path)))
+        assert set(deps) == {"flask", "gunicorn"}
+        assert deps["flask"]["specifiers"] == ["==3.0"]
+        assert deps["flask"]["sources"] == ["requirements/base.txt"]
+        assert deps["gunicorn"]["specifiers"] == ["==22.0"]
+
+    def test_constraints_narrow_declared_packages(self, tmp_path, make_project):
+        """-c files add constraints to declared packages without declaring any."""
+        make_project(
+            tmp_path,
+            {
+                "requirements.txt": "-c constraints/main.txt\nflask>=3\nWerkzeug\n",
+                "constraints/main.txt": "werkzeug<4\n-r pins.txt\n",
+                "constraints/pins.txt": "flask==3.0.3\nrequests==2.32.0\n",
+            },
+        )
+        deps = resolve_dependencies(DirectoryProjectView(str(tmp_path)))
+        assert set(deps) == {"flask", "werkzeug"}
+        assert deps["flask"]["specifiers"] == [">=3"]
+        assert deps["flask"]["constraints"] == ["==3.0.3"]
+        assert deps["flask"]["sources"] == ["requirements.txt"]
+        assert deps["werkzeug"]["constraints"] == ["<4"]
+
+    def test_all_manifests_are_merged(self, tmp_path, make_project):
+        """pyproject (PEP 621 and Poetry), Pipfile and uv.lock merge into one set."""
+        make_project(
+            tmp_path,
+            {
+                "requirements.txt": 'flask>=3 ; python_version >= "3.10"\n',
+                "pyproject.toml": (
+                    '[project]\nname = "app"\ndependencies = ["Flask[async]>=3.0", "redis"]\n'
+                    '[tool.poetry.dependencies]\npython = "^3.11"\n'
+                    'celery = {version = "^5", extras = ["redis"]}\n'
+                ),
+                "Pipfile": '[packages]\nrequests = "*"\n[dev-packages]\npytest = "*"\n',
+                "uv.lock": (
+                    '[[package]]\nname = "app"\nversion = "0.1.0"\nsource = { editable = "." }\n'
+                    '[[package]]\nname = "Flask"\nversion = "3.0.3"\n'
+                    'source = { registry = "https://pypi.org/simple" }\n'
+                ),
+            },
+        )
+        deps = resolve_dependencies(DirectoryProjectView(str(tmp_path)))
+        assert set(deps) == {"flask", "redis", "celery", "requests"}
+        assert deps["flask"]["sources"] == ["requirements.txt", "pyproject.toml", "uv.lock"]
+        assert deps["flask"]["specifiers"] == [">=3", ">=3.0", "==3.0.3"]
+        assert deps["flask"]["markers"] == ['python_version >= "3.10"']
+        assert deps["flask"]["extras"] == ["async"]
+        assert deps["celery"]["extras"] == ["redis"]
+
+    def test_invalid_toml_is_skipped(self, tmp_path, make_project):
+        """A broken manifest doesn't hide the others."""
+        make_project(tmp_path, {"pyproject.toml": "[project\n", "requirements.txt": "django\n"})
+        assert set(resolve_dependencies(DirectoryProjectView(str(tmp_path)))) == {"django"}
+
+    def test_unchanged_files_are_not_reparsed(self, tmp_path, monkeypatch, make_project):
+        """Parsing is memoized by content and skipped for an unchanged mtime."""
+        make_project(tmp_path, {"requirements.txt": "flask\n"})
+        view = DirectoryProjectView(str(tmp_path))
+        calls = []
+        parse = dependencies._PARSERS["requirements"]
+        monkeypatch.setitem(
+            dependencies._PARSERS, "requirements", lambda content: calls.append(content) or parse(content)
+        )
+        monkeypatch.setattr(dependencies, "_PARSE_CACHE", {})
+
+        resolve_dependencies(view)
+        resolve_dependencies(view)
+        assert len(calls) == 1
+
+        path = tmp_path / "requirements.txt"
+        path.write_text("django\n")
+        os.utime(path, ns=(0, 0))
+        assert set(resolve_dependencies(view)) == {"django"}
+        assert len(calls) == 2
+
+    def test_archive_view(self, tmp_path):
+        """Dependencies resolve from an upload without extracting it."""
+        archive = tmp_path / "app.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("app/requirements.txt", "-r req/prod.txt\n")
+            zf.writestr("app/req/prod.txt", "FastAPI\n")
+        view = ArchiveProjectView(ArchiveExtractor(str(archive), "app.zip"))
+        assert set(resolve_dependencies(view)) == {"fastapi"}
+
+    def test_processor_sees_included_requirements(self, tmp_path, make_project):
+        """The Flask check finds flask declared in an included file."""
+        make_project(tmp_path, {"requirements.txt": "-r base.txt\n", "base.txt": "Flask\n"})
+        assert ApplicationProcessor(str(tmp_path), "flask")._check_requirements("flask")
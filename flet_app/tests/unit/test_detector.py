@@ -0,0 +1,160 @@
+"""Unit tests for FrameworkDetector."""
+import json
+import time
+import zipfile
+
+import pytest
+
+from logic.detector import FrameworkDetector
+from logic.extractor import ArchiveExtractor
+from logic.project_index import ProjectIndex
+from logic.project_view import ArchiveProjectView, DirectoryProjectView
+
+
+@pytest.mark.unit
+class TestFrameworkDetector:
+    """Test suite for FrameworkDetector."""
+
+    @pytest.mark.parametrize(
+        "files,framework",
+        [
+            ({"requirements.txt": "Flask>=3\ngunicorn\n"}, "flask"),
+            ({"requirements.txt": "Django==5.0\n", "manage.py": ""}, "django"),
+            (
+                {"pyproject.toml": '[project]\nname = "x"\ndependencies = ["fastapi[all]>=0.110"]\n'},
+                "fastapi",
+            ),
+            (
+                {"pyproject.toml": '[tool.poetry.dependencies]\npython = "^3.11"\nFlask = "^3"\n'},
+                "flask",
+            ),
+            ({"Pipfile": '[packages]\ndjango = "*"\n'}, "django"),
+            ({"package.json": json.dumps({"dependencies": {"express": "^4"}})}, "expressjs"),
+            ({"go.mod": "module example.com/app\n"}, "go"),
+            (
+                {"pom.xml": "<project><parent><artifactId>spring-boot-starter-parent</artifactId></parent></project>"},
+                "spring-boot",
+            ),
+            (
+                {"build.gradle.kts": 'plugins { id("org.springframework.boot") version "3.2.0" }'},
+                "spring-boot",
+            ),
+        ],
+    )
+    def test_detects_framework(self, tmp_path, files, framework, make_project):
+        """Test that each framework is recognized from its manifests."""
+        view = DirectoryProjectView(str(make_project(tmp_path, files)))
+
+        result = FrameworkDetector(view).detect()
+
+        assert result["framework"] == framework
+        assert result["preselect"]
+        assert result["evidence"][framework]
+
+    def test_mixed_project_reports_confidence(self, tmp_path, make_project):
+        """Test that a Flask API with a bare frontend package.json still wins."""
+        view = DirectoryProjectView(
+            str(
+                make_project(
+                    tmp_path,
+                    {"requirements.txt": "flask\n", "package.json": "{}"},
+                )
+            )
+        )
+
+        result = FrameworkDetector(view).detect()
+
+        assert result["framework"] == "flask"
+        assert result["confidence"] == 0.75
+        assert result["scores"] == {"flask": 3, "expressjs": 1}
+
+    def test_ambiguous_project_is_not_preselected(self, tmp_path, make_project):
+        """Test that low confidence results aren't preselected."""
+        view = DirectoryProjectView(
+            str(make_project(tmp_path, {"requirements.txt": "flask\nfastapi\n"}))
+        )
+
+        result = FrameworkDetector(view).detect()
+
+        assert result["confidence"] == 0.5
+        assert not result["preselect"]
+
+    @pytest.mark.parametrize(
+        "files",
+        [
+            {"package.json": json.dumps({"dependencies": {"react": "^18", "react-dom": "^18"}})},
+            {"pom.xml": "<project><artifactId>lib</artifactId></project>"},
+            {"build.gradle": "plugins { id 'java' }\n"},
+        ],
+    )
+    def test_bare_manifest_is_not_preselected(self, tmp_path, files, make_project):
+        """Test that a manifest without framework dependencies stays below MIN_CONFIDENCE."""
+        view = DirectoryProjectView(str(make_project(tmp_path, files)))
+
+        result = FrameworkDetector(view).detect()
+
+        assert result["framework"] in ("expressjs", "spring-boot")
+        assert result["confidence"] == 0.33
+        assert not result["preselect"]
+
+    def test_entrypoint_alone_is_preselected(self, tmp_path, make_project):
+        """Test that manage.py without a declared Django dependency still counts."""
+        view = DirectoryProjectView(str(make_project(tmp_path, {"manage.py": ""})))
+
+        result = FrameworkDetector(view).detect()
+
+        assert result["framework"] == "django"
+        assert result["confidence"] == 0.67
+        assert result["preselect"]
+
+    @pytest.mark.parametrize(
+        "package_json",
+        ["[]", '{"dependencies": null}', '{"dependencies": [], "devDependencies": "x"}', "{broken"],
+    )
+    def test_malformed_package_json(self, tmp_path, package_json, make_project):
+        """Test that an odd package.json counts as bare and doesn't break detection."""
+        view = DirectoryProjectView(
+            str(make_project(tmp_path, {"requirements.txt": "flask\n", "package.json": package_json}))
+        )
+
+        result = FrameworkDetector(view).detect()
+
+        assert result["framework"] == "flask"
+        assert result["scores"] == {"flask": 3, "expressjs": 1}
+
+    def test_empty_project(self, tmp_path):
+        """Test that nothing is detected without manifests."""
+        result = FrameworkDetector(DirectoryProjectView(str(tmp_path))).detect()
+
+        assert result["framework"] is None
+        assert result["confidence"] == 0.0
+        assert not result["preselect"]
+
+    def test_only_manifests_are_read(self, tmp_path, make_project):
+        """Test that detection on a large tree opens only root manifests, quickly."""
+        files = {f"src/pkg{i // 100}/module{i}.py": "" for i in range(3000)}
+        files["requirements.txt"] = "fastapi\n"
+        files["src/pkg0/requirements.txt"] = "django\n"
+        index = ProjectIndex(str(make_project(tmp_path, files)))
+        opened = []
+        real_open = index.open
+        index.open = lambda path, mode="r": opened.append(path) or real_open(path, mode)
+
+        started = time.perf_counter()
+        result = FrameworkDetector(index).detect()
+        elapsed = time.perf_counter() - started
+
+        assert result["framework"] == "fastapi"
+        assert opened == ["requirements.txt"]
+        assert elapsed < 0.1
+
+    def test_detects_from_archive_view(self, tmp_path):
+        """Test detection straight from an upload, without extracting it."""
+        archive = tmp_path / "upload.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("svc/go.mod", "module x\n")
+            zf.writestr("svc/main.go", "package main\n")
+
+        view = ArchiveProjectView(ArchiveExtractor(str(archive), "upload.zip"))
+
+        assert FrameworkDetector(view).detect()["framework"] == "go"
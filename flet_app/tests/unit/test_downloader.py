@@ -0,0 +1,656 @@
+"""Unit tests for GithubDownloader against local git repositories."""
+import io
+import os
+import subprocess
+import tarfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from logic.downloader import (
+    BatchDownloader,
+    CancelToken,
+    DownloadCancelled,
+    GithubDownloader,
+    parse_git_progress,
+)
+
+
+def _git(args, cwd):
+    subprocess.run(["git"] + args, cwd=cwd, check=True, capture_output=True)
+
+
+def _missing_objects(git_args, cwd):
+    """Return the object ids that are referenced but not present locally."""
+    out = subprocess.run(
+        ["git"] + git_args + ["rev-list", "--objects", "--missing=print", "--all"],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return [line[1:] for line in out.splitlines() if line.startswith("?")]
+
+
+def _commit_all(repo, message):
+    _git(["add", "-A"], repo)
+    _git(
+        ["-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-qm", message],
+        repo,
+    )
+
+
+@pytest.fixture
+def source_repo(tmp_path):
+    """Create a local repository with a Flask app in a subfolder."""
+    repo = tmp_path / "monorepo"
+    app_dir = repo / "apps" / "flask_app"
+    app_dir.mkdir(parents=True)
+    (app_dir / "requirements.txt").write_text("Flask==3.0.0\n")
+    (app_dir / "app.py").write_text("from flask import Flask\n")
+    (repo / "README.md").write_text("monorepo\n")
+    (repo / "assets").mkdir()
+    (repo / "assets" / "video.bin").write_bytes(b"\0" * 200_000)
+    _git(["init", "-q", "-b", "main"], repo)
+    _commit_all(repo, "initial")
+    # Allow partial clones over file:// like GitHub does
+    _git(["config", "uploadpack.allowFilter", "true"], repo)
+    return repo
+
+
+@pytest.mark.unit
+class TestGithubDownloaderCache:
+    """Test suite for the mirror cache download path."""
+
+    def test_creates_mirror_and_checks_out_subfolder(self, source_repo, tmp_path):
+        """Test that the first download creates a mirror and materializes the subfolder."""
+        cache_dir = tmp_path / "cache"
+        downloader = GithubDownloader(
+            f"file://{source_repo}", "main", "apps/flask_app", cache_dir=cache_dir
+        )
+
+        result = downloader.download(str(tmp_path / "job1"))
+
+        assert Path(result["path"]) == tmp_path / "job1" / "apps" / "flask_app"
+        assert (Path(result["path"]) / "requirements.txt").read_text() == "Flask==3.0.0\n"
+        assert not (tmp_path / "job1" / "README.md").exists()
+        assert result["project_name"] == "flask-app"
+        mirrors = list((cache_dir / "mirrors").iterdir())
+        assert len(mirrors) == 1
+        assert mirrors[0].name.startswith("monorepo-")
+
+    def test_second_download_fetches_new_commits_into_same_mirror(self, source_repo, tmp_path):
+        """Test that a later download reuses the mirror and sees new upstream commits."""
+        cache_dir = tmp_path / "cache"
+        downloader = GithubDownloader(
+            f"file://{source_repo}", "main", "apps/flask_app", cache_dir=cache_dir
+        )
+        downloader.download(str(tmp_path / "job1"))
+
+        (source_repo / "apps" / "flask_app" / "requirements.txt").write_text("Flask==3.1.0\n")
+        _commit_all(source_repo, "bump flask")
+
+        result = downloader.download(str(tmp_path / "job2"))
+
+        assert (Path(result["path"]) / "requirements.txt").read_text() == "Flask==3.1.0\n"
+        assert len(list((cache_dir / "mirrors").iterdir())) == 1
+
+    def test_full_checkout_without_subfolder(self, source_repo, tmp_path):
+        """Test that the whole tree is checked out when no subfolder is given."""
+        downloader = GithubDownloader(
+            f"file://{source_repo}", "main", None, cache_dir=tmp_path / "cache"
+        )
+
+        result = downloader.download(str(tmp_path / "job"))
+
+        assert Path(result["path"]) == tmp_path / "job"
+        assert (tmp_path / "job" / "README.md").exists()
+        assert (tmp_path / "job" / "apps" / "flask_app" / "app.py").exists()
+        assert result["project_name"] == "monorepo"
+
+    def test_same_commit_is_served_from_snapshot(self, source_repo, tmp_path, monkeypatch):
+        """Test that a commit downloaded before is linked without touching the mirror."""
+        cache_dir = tmp_path / "cache"
+        downloader = GithubDownloader(
+            f"file://{source_repo}", "main", "apps/flask_app", cache_dir=cache_dir
+        )
+        first = downloader.download(str(tmp_path / "job1"))
+
+        def fail_update_mirror():
+            raise AssertionError("mirror should not be fetched for a known commit")
+
+        monkeypatch.setattr(downloader, "update_mirror", fail_update_mirror)
+        second = downloader.download(str(tmp_path / "job2"))
+
+        assert second["commit"] == first["commit"]
+        assert (Path(second["path"]) / "requirements.txt").read_text() == "Flask==3.0.0\n"
+        assert len(list((cache_dir / "snapshots").iterdir())) == 1
+
+    def test_resolve_commit_matches_remote_head(self, source_repo, tmp_path):
+        """Test that the branch is resolved to the SHA the remote advertises."""
+        expected = subprocess.run(
+            ["git", "rev-parse", "main"], cwd=source_repo, capture_output=True, text=True
+        ).stdout.strip()
+        downloader = GithubDownloader(
+            f"file://{source_repo}", "main", None, cache_dir=tmp_path / "cache"
+        )
+
+        assert downloader.resolve_commit() == expected
+
+    def test_unknown_branch_raises(self, source_repo, tmp_path):
+        """Test that a branch missing from the mirror gives a clear error."""
+        downloader = GithubDownloader(
+            f"file://{source_repo}", "does-not-exist", None, cache_dir=tmp_path / "cache"
+        )
+
+        with pytest.raises(ValueError, match="does-not-exist"):
+            downloader.download(str(tmp_path / "job"))
+
+
+@pytest.mark.unit
+class TestGithubDownloaderPartialClone:
+    """Test suite for the blob-less partial clone paths."""
+
+    def test_partial_clone_only_fetches_subfolder_blobs(self, source_repo, tmp_path):
+        """Test that blobs outside the subfolder are never transferred."""
+        target = tmp_path / "job"
+        downloader = GithubDownloader(
+            f"file://{source_repo}", "main", "apps/flask_app", partial_clone=True
+        )
+
+        result = downloader.download(str(target))
+
+        assert (Path(result["path"]) / "requirements.txt").exists()
+        assert (Path(result["path"]) / "app.py").exists()
+        assert not (target / "assets").exists()
+        # The large asset is referenced by the tree but was never downloaded
+        assert len(_missing_objects([], target)) == 1
+
+    def test_partial_clone_uses_cone_mode(self, source_repo, tmp_path):
+        """Test that the sparse checkout is configured in cone mode."""
+        target = tmp_path / "job"
+        GithubDownloader(
+            f"file://{source_repo}", "main", "apps/flask_app", partial_clone=True
+        ).download(str(target))
+
+        cone = subprocess.run(
+            ["git", "config", "core.sparseCheckoutCone"],
+            cwd=target,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+        assert cone == "true"
+
+    def test_partial_mirror_fetches_blobs_lazily(self, source_repo, tmp_path):
+        """Test that a blob-less mirror only gains the blobs that were checked out."""
+        cache_dir = tmp_path / "cache"
+        downloader = GithubDownloader(
+            f"file://{source_repo}",
+            "main",
+            "apps/flask_app",
+            cache_dir=cache_dir,
+            partial_clone=True,
+        )
+
+        result = downloader.download(str(tmp_path / "job"))
+
+        assert (Path(result["path"]) / "requirements.txt").exists()
+        mirror = next((cache_dir / "mirrors").iterdir())
+        # README.md and the asset stay on the remote
+        assert len(_missing_objects(["--git-dir", str(mirror)], tmp_path)) == 2
+
+
+@pytest.mark.unit
+class TestGithubDownloaderSubfolderCheck:
+    """Test suite for the subfolder verification done before checkout."""
+
+    @pytest.mark.parametrize(
+        "options",
+        [{}, {"partial_clone": True}, {"cache_dir": "cache"}],
+        ids=["sparse", "partial", "cached"],
+    )
+    def test_missing_subfolder_fails_before_checkout(self, source_repo, tmp_path, options):
+        """Test that every download path rejects a missing subfolder with a hint."""
+        if "cache_dir" in options:
+            options = {"cache_dir": tmp_path / options["cache_dir"]}
+        downloader = GithubDownloader(
+            f"file://{source_repo}", "main", "apps/flask-app", **options
+        )
+
+        with pytest.raises(ValueError, match="Subfolder 'apps/flask-app' not found") as exc:
+            downloader.download(str(tmp_path / "job"))
+
+        assert "Did you mean 'apps/flask_app'?" in str(exc.value)
+        assert not (tmp_path / "job" / "apps").exists()
+
+    def test_file_instead_of_folder_is_rejected(self, source_repo, tmp_path):
+        """Test that pointing the subfolder at a file gives a precise error."""
+        downloader = GithubDownloader(f"file://{source_repo}", "main", "README.md")
+
+        with pytest.raises(ValueError, match="is a file, not a folder"):
+            downloader.download(str(tmp_path / "job"))
+
+    def test_sparse_checkout_still_downloads_subfolder(self, source_repo, tmp_path):
+        """Test that the legacy sparse path checks out the subfolder after verifying it."""
+        result = GithubDownloader(
+            f"file://{source_repo}", "main", "apps/flask_app"
+        ).download(str(tmp_path / "job"))
+
+        assert (Path(result["path"]) / "requirements.txt").exists()
+        assert not (tmp_path / "job" / "assets").exists()
+
+
+@pytest.mark.unit
+class TestGitProgress:
+    """Test suite for git progress parsing and streaming."""
+
+    def test_parses_receiving_objects_with_rate(self):
+        """Test that counts, bytes and throughput are parsed from a transfer line."""
+        progress = parse_git_progress(
+            "Receiving objects:  45% (450/1000), 1.50 MiB | 512.00 KiB/s"
+        )
+
+        assert progress == {
+            "phase": "Receiving objects",
+            "percent": 45,
+            "objects": 450,
+            "total_objects": 1000,
+            "bytes": int(1.5 * 1024**2),
+            "bytes_per_second": 512 * 1024,
+            "done": False,
+        }
+
+    def test_parses_remote_counter_without_percent(self):
+        """Test that remote-side counters without a total are parsed."""
+        progress = parse_git_progress("remote: Enumerating objects: 5, done.")
+
+        assert progress["phase"] == "Enumerating objects"
+        assert progress["objects"] == 5
+        assert progress["percent"] is None
+        assert progress["done"] is True
+
+    def test_ignores_non_progress_lines(self):
+        """Test that regular git messages are not mistaken for progress."""
+        assert parse_git_progress("Cloning into 'repo'...") is None
+        assert parse_git_progress("fatal: repository not found") is None
+
+    def test_download_streams_progress_to_callback(self, source_repo, tmp_path):
+        """Test that progress updates reach the callback during the download."""
+        updates = []
+        messages = []
+
+        GithubDownloader(f"file://{source_repo}", "main", "apps/flask_app").download(
+            str(tmp_path / "job"),
+            status_callback=messages.append,
+            progress_callback=updates.append,
+        )
+
+        assert messages[0].startswith("Performing sparse checkout")
+        # Tiny transfers skip "Receiving objects", but the remote phases report
+        assert {"Enumerating objects", "Counting objects"} <= {u["phase"] for u in updates}
+        assert any(update["done"] for update in updates)
+
+    def test_streamed_failure_keeps_stderr(self, tmp_path):
+        """Test that a failing command still reports git's error message."""
+        downloader = GithubDownloader(f"file://{tmp_path}/missing", "main", None)
+
+        with pytest.raises(subprocess.CalledProcessError) as exc:
+            downloader.download(str(tmp_path / "job"), progress_callback=lambda p: None)
+
+        assert "missing" in exc.value.stderr
+
+
+def _make_tarball(files, top_dir="monorepo-main"):
+    """Build a GitHub-style .tar.gz with every path under top_dir."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for name, content in files.items():
+            info = tarfile.TarInfo(f"{top_dir}/{name}")
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def archive_server():
+    """Serve fixture tarballs over HTTP on localhost, like github.com/<o>/<r>/archive/."""
+    archives = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = archives.get(self.path)
+            if body is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.archives = archives
+    server.base_url = f"http://127.0.0.1:{server.server_port}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.unit
+class TestGithubDownloaderTarball:
+    """Test suite for the HTTP tarball download path."""
+
+    FILES = {
+        "README.md": b"monorepo\n",
+        "apps/flask_app/requirements.txt": b"Flask==3.0.0\n",
+        "apps/flask_app/app.py": b"from flask import Flask\n",
+        "assets/video.bin": b"\0" * 1000,
+    }
+
+    def test_extracts_only_the_subfolder(self, archive_server, tmp_path):
+        """Test that only members under the subfolder are written to disk."""
+        archive_server.archives["/acme/monorepo/archive/main.tar.gz"] = _make_tarball(self.FILES)
+        downloader = GithubDownloader(
+            f"{archive_server.base_url}/acme/monorepo",
+            "main",
+            "apps/flask_app",
+            method="tarball",
+        )
+
+        result = downloader.download(str(tmp_path / "job"))
+
+        assert Path(result["path"]) == tmp_path / "job" / "apps" / "flask_app"
+        assert (Path(result["path"]) / "requirements.txt").read_bytes() == b"Flask==3.0.0\n"
+        assert sorted(p.name for p in (tmp_path / "job").iterdir()) == ["apps"]
+
+    def test_full_archive_without_subfolder(self, archive_server, tmp_path):
+        """Test that the wrapper folder is stripped when extracting everything."""
+        archive_server.archives["/acme/monorepo/archive/main.tar.gz"] = _make_tarball(self.FILES)
+        downloader = GithubDownloader(
+            f"{archive_server.base_url}/acme/monorepo.git", "main", None, method="tarball"
+        )
+
+        result = downloader.download(str(tmp_path / "job"))
+
+        assert (tmp_path / "job" / "README.md").exists()
+        assert (tmp_path / "job" / "assets" / "video.bin").stat().st_size == 1000
+        assert result["project_name"] == "monorepo"
+
+    def test_reports_download_progress(self, archive_server, tmp_path):
+        """Test that the final progress update covers the whole response."""
+        body = _make_tarball(self.FILES)
+        archive_server.archives["/acme/monorepo/archive/main.tar.gz"] = body
+        updates = []
+
+        GithubDownloader(
+            f"{archive_server.base_url}/acme/monorepo", "main", None, method="tarball"
+        ).download(str(tmp_path / "job"), progress_callback=updates.append)
+
+        assert updates[-1]["done"] is True
+        assert updates[-1]["bytes"] == len(body)
+        assert updates[-1]["percent"] == 100
+        assert updates[-1]["objects"] == len(self.FILES)
+
+    def test_missing_subfolder_raises(self, archive_server, tmp_path):
+        """Test that a subfolder absent from the archive is reported."""
+        archive_server.archives["/acme/monorepo/archive/main.tar.gz"] = _make_tarball(self.FILES)
+        downloader = GithubDownloader(
+            f"{archive_server.base_url}/acme/monorepo", "main", "apps/nope", method="tarball"
+        )
+
+        with pytest.raises(ValueError, match="Subfolder 'apps/nope' not found"):
+            downloader.download(str(tmp_path / "job"))
+
+
+@pytest.mark.unit
+class TestBatchDownloader:
+    """Test suite for BatchDownloader."""
+
+    def test_downloads_manifest_and_reports_per_entry(self, source_repo, tmp_path):
+        """Test that results come back in manifest order with errors and timings."""
+        url = f"file://{source_repo}"
+        batch = BatchDownloader(
+            [
+                (url, "main", "apps/flask_app"),
+                {"repo_url": url, "branch": "main", "subfolder": "apps/missing"},
+                (url, "main", None),
+            ],
+            max_workers=2,
+            cache_dir=tmp_path / "cache",
+        )
+
+        results = batch.download(str(tmp_path / "batch"))
+
+        assert [r["subfolder"] for r in results] == ["apps/flask_app", "apps/missing", None]
+        assert results[0]["error"] is None
+        assert (Path(results[0]["path"]) / "requirements.txt").exists()
+        assert "not found" in results[1]["error"]
+        assert not Path(results[1]["target_dir"]).exists()
+        assert results[2]["project_name"] == "monorepo"
+        assert all(r["seconds"] > 0 for r in results)
+
+    def test_worker_limit_is_respected(self, tmp_path, monkeypatch):
+        """Test that no more than max_workers downloads run at the same time."""
+        lock = threading.Lock()
+        running = {"now": 0, "peak": 0}
+        release = threading.Event()
+
+        def fake_download(self, target_dir, status_callback=None, progress_callback=None):
+            with lock:
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+            release.wait(0.2)
+            with lock:
+                running["now"] -= 1
+            return {"path": target_dir, "project_name": "x", "commit": None}
+
+        monkeypatch.setattr(GithubDownloader, "download", fake_download)
+        entries = [(f"https://example.com/repo{i}", "main", None) for i in range(8)]
+        finished = []
+
+        BatchDownloader(entries, max_workers=3).download(
+            str(tmp_path / "batch"), result_callback=finished.append
+        )
+
+        assert running["peak"] == 3
+        assert len(finished) == 8
+
+    def test_rejects_zero_workers(self):
+        """Test that the worker limit must be positive."""
+        with pytest.raises(ValueError):
+            BatchDownloader([], max_workers=0)
+
+
+def _process_alive(pid):
+    """Return True if pid is running (zombies awaiting reaping count as dead)."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().split(")")[-1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+@pytest.fixture
+def hanging_git(tmp_path, monkeypatch):
+    """Put a fake git on PATH that never finishes and spawns a child process."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    pid_file = tmp_path / "child.pid"
+    script = bin_dir / "git"
+    script.write_text(f"#!/bin/sh\nsleep 60 &\necho $! > {pid_file}\nwait\n")
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    return pid_file
+
+
+@pytest.mark.unit
+class TestGithubDownloaderCancellation:
+    """Test suite for deadlines and cancellation."""
+
+    def test_phase_deadline_kills_process_group(self, hanging_git, tmp_path):
+        """Test that an expired deadline kills git and its children and cleans up."""
+        downloader = GithubDownloader(
+            "https://example.com/acme/repo",
+            "main",
+            None,
+            cache_dir=tmp_path / "cache",
+            timeouts={"resolve": 0.5},
+        )
+
+        started = time.monotonic()
+        with pytest.raises(subprocess.TimeoutExpired):
+            downloader.download(str(tmp_path / "job"))
+
+        assert time.monotonic() - started < 5
+        assert not (tmp_path / "job").exists()
+        child_pid = int(hanging_git.read_text())
+        for _ in range(50):
+            if not _process_alive(child_pid):
+                break
+            time.sleep(0.1)
+        assert not _process_alive(child_pid)
+
+    def test_cancel_token_stops_running_download(self, hanging_git, tmp_path):
+        """Test that cancelling from another thread aborts the download."""
+        token = CancelToken()
+        downloader = GithubDownloader(
+            "https://example.com/acme/repo", "main", "app", cancel_token=token
+        )
+        threading.Timer(0.3, token.cancel).start()
+
+        with pytest.raises(DownloadCancelled):
+            downloader.download(str(tmp_path / "job"))
+
+        assert not (tmp_path / "job").exists()
+
+    def test_cancelled_token_prevents_any_git_command(self, tmp_path):
+        """Test that an already cancelled download doesn't start git at all."""
+        token = CancelToken()
+        token.cancel()
+
+        with pytest.raises(DownloadCancelled):
+            GithubDownloader(
+                "https://example.com/acme/repo", "main", None, cancel_token=token
+            ).download(str(tmp_path / "job"))
+
+
+LFS_POINTER = (
+    "version https://git-lfs.github.com/spec/v1\n"
+    "oid sha256:4d7a214614ab2935c943f9e0ff69d22eadbb8f32b1258daaa5e2ca24d17e2393\n"
+    "size 524288000\n"
+)
+
+
+@pytest.mark.unit
+class TestLargeFilePolicy:
+    """Test suite for LFS and blob size limit handling."""
+
+    @pytest.fixture
+    def repo_with_large_files(self, source_repo):
+        app_dir = source_repo / "apps" / "flask_app"
+        (source_repo / ".gitattributes").write_text("*.bin filter=lfs diff=lfs merge=lfs -text\n")
+        (app_dir / "weights.bin").write_text(LFS_POINTER)
+        (app_dir / "model.bin").write_bytes(b"\1" * 300_000)
+        _commit_all(source_repo, "add large files")
+        return source_repo
+
+    def test_reports_lfs_pointers(self, repo_with_large_files, tmp_path):
+        """Test that LFS pointer files are reported with the size they stand for."""
+        result = GithubDownloader(
+            f"file://{repo_with_large_files}", "main", "apps/flask_app"
+        ).download(str(tmp_path / "job"))
+
+        assert result["skipped"]["files"] == [
+            {"path": "apps/flask_app/weights.bin", "reason": "lfs", "size": 524288000}
+        ]
+        assert result["skipped"]["bytes_saved"] == 524288000
+
+    def test_pointers_outside_lfs_attributes_are_not_reported(self, source_repo, tmp_path):
+        """Test that without filter=lfs in .gitattributes no file is taken for a pointer."""
+        (source_repo / "apps" / "flask_app" / "pointer.txt").write_text(LFS_POINTER)
+        _commit_all(source_repo, "add a file that only looks like a pointer")
+
+        result = GithubDownloader(
+            f"file://{source_repo}", "main", "apps/flask_app"
+        ).download(str(tmp_path / "job"))
+
+        assert result["skipped"]["files"] == []
+
+    def test_lfs_report_is_stored_with_the_snapshot(self, repo_with_large_files, tmp_path):
+        """Test that a snapshot hit reports LFS pointers without listing the tree again."""
+        downloader = GithubDownloader(
+            f"file://{repo_with_large_files}", "main", "apps/flask_app", cache_dir=tmp_path / "cache"
+        )
+        first = downloader.download(str(tmp_path / "job1"))
+
+        with patch.object(downloader, "_lfs_pointers", side_effect=AssertionError("tree listed")):
+            second = downloader.download(str(tmp_path / "job2"))
+
+        assert [f["path"] for f in first["skipped"]["files"]] == ["apps/flask_app/weights.bin"]
+        assert second["skipped"] == first["skipped"]
+
+    def test_tarball_reports_lfs_pointers(self, archive_server, tmp_path):
+        """Test that the tarball method finds pointers from the member list."""
+        archive_server.archives["/acme/monorepo/archive/main.tar.gz"] = _make_tarball(
+            {
+                ".gitattributes": b"*.bin filter=lfs -text\n",
+                "apps/flask_app/app.py": b"print('hi')\n",
+                "apps/flask_app/weights.bin": LFS_POINTER.encode(),
+                "apps/other/weights.bin": LFS_POINTER.encode(),
+            }
+        )
+        result = GithubDownloader(
+            f"{archive_server.base_url}/acme/monorepo", "main", "apps/flask_app", method="tarball"
+        ).download(str(tmp_path / "job"))
+
+        assert result["skipped"]["files"] == [
+            {"path": "apps/flask_app/weights.bin", "reason": "lfs", "size": 524288000}
+        ]
+
+    @pytest.mark.parametrize("cached", [False, True], ids=["partial", "cached"])
+    def test_blob_limit_skips_oversized_files(self, repo_with_large_files, tmp_path, cached):
+        """Test that blobs above max_blob_size are neither fetched nor checked out."""
+        options = {"cache_dir": tmp_path / "cache"} if cached else {}
+        downloader = GithubDownloader(
+            f"file://{repo_with_large_files}",
+            "main",
+            "apps/flask_app",
+            partial_clone=True,
+            max_blob_size=100_000,
+            **options,
+        )
+
+        result = downloader.download(str(tmp_path / "job"))
+
+        app_dir = Path(result["path"])
+        assert (app_dir / "requirements.txt").exists()
+        assert not (app_dir / "model.bin").exists()
+        size_limited = [f for f in result["skipped"]["files"] if f["reason"] == "size-limit"]
+        assert size_limited == [
+            {"path": "apps/flask_app/model.bin", "reason": "size-limit", "size": None}
+        ]
+        assert result["skipped"]["bytes_saved"] >= 524288000 + 100_001
+
+    def test_blob_limit_report_survives_snapshot_reuse(self, repo_with_large_files, tmp_path):
+        """Test that a snapshot hit reports the same skipped files as the first download."""
+        downloader = GithubDownloader(
+            f"file://{repo_with_large_files}",
+            "main",
+            "apps/flask_app",
+            cache_dir=tmp_path / "cache",
+            partial_clone=True,
+            max_blob_size=100_000,
+        )
+        first = downloader.download(str(tmp_path / "job1"))
+        second = downloader.download(str(tmp_path / "job2"))
+
+        assert second["skipped"] == first["skipped"]
@@ -0,0 +1,158 @@
+"""Unit tests for PackEstimator and the resource checks."""
+import json
+
+import pytest
+
+from logic.estimator import (
+    DEPENDENCY_COSTS,
+    FRAMEWORK_BASELINES,
+    NATIVE_PACKAGE_COST,
+    PackEstimator,
+    available_memory,
+    check_resources,
+)
+from logic.project_index import ProjectIndex
+
+
+def write_meminfo(path, available_kib, swap_kib=0):
+    path.write_text(
+        f"MemTotal:       16000000 kB\nMemAvailable:   {available_kib} kB\nSwapFree:       {swap_kib} kB\n"
+    )
+    return str(path)
+
+
+@pytest.mark.unit
+class TestPackEstimator:
+    """Test suite for PackEstimator."""
+
+    def test_python_features(self, tmp_path, make_project):
+        """Python dependencies come from the manifests and native ones are flagged."""
+        make_project(
+            tmp_path / "app",
+            {
+                "requirements.txt": "flask\n-r more.txt\n",
+                "more.txt": "numpy\nlxml\n",
+                ".git/objects/pack": "x" * 1000,
+            },
+        )
+        index = ProjectIndex(str(tmp_path / "app"))
+        features = PackEstimator(index, "flask").features()
+        assert features["dependencies"] == 3
+        assert features["native_dependencies"] == ["lxml", "numpy"]
+        assert features["source_bytes"] == index.total_size - 1000
+
+    def test_node_go_and_java_dependency_counts(self, tmp_path, make_project):
+        """Each ecosystem counts the dependencies of its own manifest."""
+        make_project(
+            tmp_path / "node",
+            {
+                "package.json": json.dumps({"dependencies": {"express": "^4", "pg": "^8"}}),
+                "node_modules/express/index.js": "x" * 500,
+            },
+        )
+        node = ProjectIndex(str(tmp_path / "node"))
+        features = PackEstimator(node, "expressjs").features()
+        assert features["dependencies"] == 2
+        assert features["node_modules_bytes"] == 500
+
+        make_project(
+            tmp_path / "go",
+            {"go.mod": "module x\n\nrequire (\n\ta v1\n\tb v2 // indirect\n)\nrequire c v3\n"},
+        )
+        go = ProjectIndex(str(tmp_path / "go"))
+        assert PackEstimator(go, "go").features()["dependencies"] == 3
+
+        make_project(
+            tmp_path / "java",
+            {
+                "pom.xml": (
+                    "<project><dependencies><dependency/><dependency></dependency>"
+                    "<dependency></dependency></dependencies>"
+                    "<build><plugins><plugin><dependencies><dependency/></dependencies>"
+                    "</plugin></plugins></build></project>"
+                )
+            },
+        )
+        java = ProjectIndex(str(tmp_path / "java"))
+        assert PackEstimator(java, "spring-boot").features()["dependencies"] == 3
+
+    @pytest.mark.parametrize(
+        "package_json", ["[]", '{"dependencies": null}', '{"dependencies": ["express"]}', "{broken"]
+    )
+    def test_malformed_package_json(self, tmp_path, package_json, make_project):
+        """A package.json of an unexpected shape counts no dependencies."""
+        index = ProjectIndex(str(make_project(tmp_path / "app", {"package.json": package_json})))
+        assert PackEstimator(index, "expressjs").features()["dependencies"] == 0
+
+    def test_model_without_history(self, tmp_path, make_project):
+        """With no history the estimate is the model itself."""
+        index = ProjectIndex(str(make_project(tmp_path / "app", {"requirements.txt": "flask\nnumpy\n"})))
+        estimate = PackEstimator(index, "flask", history_path=tmp_path / "none.jsonl").estimate()
+        base, dep = FRAMEWORK_BASELINES["python"], DEPENDENCY_COSTS["python"]
+        assert estimate["samples"] == 0
+        assert estimate["peak_rss"] == base["peak_rss"] + 2 * dep["peak_rss"] + NATIVE_PACKAGE_COST["peak_rss"]
+        assert estimate["seconds"] == int(estimate["model"]["seconds"])
+
+    def test_history_calibrates_the_estimate(self, tmp_path, make_project):
+        """Recorded packs scale later estimates of the same ecosystem."""
+        history = tmp_path / "history.jsonl"
+        index = ProjectIndex(str(make_project(tmp_path / "app", {"requirements.txt": "flask\n"})))
+        estimator = PackEstimator(index, "flask", history_path=history)
+        first = estimator.estimate()
+        estimator.record(first, first["model"]["seconds"] * 2, first["model"]["output_bytes"] // 2)
+        # A pack of another ecosystem doesn't count
+        PackEstimator(index, "go", history_path=history).record(first, 1, 1)
+
+        second = PackEstimator(index, "django", history_path=history).estimate()
+        assert second["samples"] == 1
+        assert second["seconds"] == int(second["model"]["seconds"] * 2)
+        assert second["output_bytes"] == int(second["model"]["output_bytes"] * 0.5)
+
+    def test_describe(self, tmp_path, make_project):
+        """The summary gives minutes, memory and rock size."""
+        index = ProjectIndex(str(make_project(tmp_path / "app", {"go.mod": "module x\n"})))
+        summary = PackEstimator.describe(PackEstimator(index, "go").estimate())
+        assert summary.startswith("Estimated pack: about 4 min")
+        assert "no previous packs" in summary
+
+
+@pytest.mark.unit
+class TestCheckResources:
+    """Test suite for check_resources."""
+
+    ESTIMATE = {"peak_rss": 2 * 1024**3, "output_bytes": 1024**2, "seconds": 60}
+
+    def test_enough_memory(self, tmp_path):
+        """Enough memory and disk pass without warnings."""
+        meminfo = write_meminfo(tmp_path / "meminfo", 4 * 1024**2)
+        result = check_resources(self.ESTIMATE, str(tmp_path), meminfo_path=meminfo)
+        assert result["ok"] and not result["warnings"]
+        assert result["memory_available"] == 4 * 1024**3
+
+    def test_low_memory_warns(self, tmp_path):
+        """Less memory than the estimate warns; swap counts as available."""
+        meminfo = write_meminfo(tmp_path / "meminfo", 1024**2, swap_kib=512 * 1024)
+        result = check_resources(self.ESTIMATE, str(tmp_path), meminfo_path=meminfo)
+        assert result["ok"]
+        assert "out of memory" in result["warnings"][0]
+
+    def test_far_too_little_memory_refuses(self, tmp_path):
+        """Under half the estimated memory refuses the pack."""
+        meminfo = write_meminfo(tmp_path / "meminfo", 512 * 1024)
+        result = check_resources(self.ESTIMATE, str(tmp_path), meminfo_path=meminfo)
+        assert not result["ok"]
+        assert "memory" in result["errors"][0]
+
+    def test_too_little_disk_refuses(self, tmp_path):
+        """A rock bigger than the free disk space refuses the pack."""
+        meminfo = write_meminfo(tmp_path / "meminfo", 64 * 1024**2)
+        estimate = dict(self.ESTIMATE, output_bytes=1024**5)
+        result = check_resources(estimate, str(tmp_path), meminfo_path=meminfo)
+        assert not result["ok"]
+        assert "disk space" in result["errors"][0]
+
+    def test_missing_meminfo(self, tmp_path):
+        """Without /proc/meminfo memory is unknown and not checked."""
+        assert available_memory(str(tmp_path / "missing")) is None
+        result = check_resources(self.ESTIMATE, str(tmp_path), meminfo_path=str(tmp_path / "missing"))
+        assert result["ok"] and result["memory_available"] is None
@@ -0,0 +1,623 @@
+"""Unit tests for ArchiveExtractor."""
+import io
+import json
+import os
+import tarfile
+import threading
+import zipfile
+
+import pytest
+import zstandard
+
+from logic import extractor
+from logic.extractor import ArchiveExtractor, ExtractionLimitError
+
+
+def make_zip(path, files, compression=zipfile.ZIP_STORED):
+    """Write a zip archive with the given {name: text} members."""
+    with zipfile.ZipFile(path, "w", compression=compression) as zf:
+        for name, content in files.items():
+            zf.writestr(name, content)
+    return str(path)
+
+
+def make_tar(path, files, mode="w:gz"):
+    """Write a tarball (gzipped by default) with the given {name: text} members."""
+    with tarfile.open(path, mode) as tf:
+        for name, content in files.items():
+            data = content.encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+    return str(path)
+
+
+@pytest.mark.unit
+class TestArchiveInspection:
+    """Test suite for ArchiveExtractor.inspect."""
+
+    def test_zip_with_nested_root(self, tmp_path):
+        """Test that the nested folder and its markers are found."""
+        archive = make_zip(
+            tmp_path / "upload.zip",
+            {
+                "my_app/requirements.txt": "flask\n",
+                "my_app/app.py": "",
+                "my_app/sub/go.mod": "module x\n",
+                "__MACOSX/my_app/._app.py": "",
+            },
+        )
+
+        result = ArchiveExtractor(archive, "upload.zip").inspect()
+
+        assert result["root_prefix"] == "my_app/"
+        assert result["project_name"] == "my_app"
+        assert result["markers"] == {"requirements.txt": b"flask\n"}
+
+    def test_tar_without_nested_root(self, tmp_path):
+        """Test that top-level markers are read from a flat tarball."""
+        archive = make_tar(
+            tmp_path / "upload.tar.gz",
+            {"./go.mod": "module x\n", "./main.go": "", "./cmd/requirements.txt": ""},
+        )
+
+        result = ArchiveExtractor(archive, "My_Service.tar.gz").inspect()
+
+        assert result["root_prefix"] == ""
+        assert result["project_name"] == "my-service"
+        assert result["markers"] == {"go.mod": b"module x\n"}
+        assert result["members"] == 3
+
+    def test_matches_extracted_root(self, tmp_path):
+        """Test that inspection agrees with the root found after extraction."""
+        archive = make_tar(
+            tmp_path / "upload.tar.gz",
+            {"project/package.json": "{}", "project/index.js": ""},
+        )
+        extractor = ArchiveExtractor(archive, "upload.tar.gz")
+
+        inspection = extractor.inspect()
+        extracted = extractor.extract(str(tmp_path / "out"))
+
+        assert extracted["root_path"].endswith(inspection["root_prefix"].rstrip("/"))
+        assert extracted["project_name"] == inspection["project_name"]
+
+    def test_invalid_archive_raises(self, tmp_path):
+        """Test that a corrupt upload is rejected with a ValueError."""
+        archive = tmp_path / "upload.zip"
+        archive.write_bytes(b"not a zip")
+
+        with pytest.raises(ValueError, match="Invalid zip archive"):
+            ArchiveExtractor(str(archive), "upload.zip").inspect()
+
+
+@pytest.mark.unit
+class TestSelectiveExtraction:
+    """Test suite for exclude and include rules during extraction."""
+
+    @pytest.fixture
+    def node_upload(self, tmp_path):
+        """A zip with a wrapper folder, vendored modules and junk."""
+        return make_zip(
+            tmp_path / "upload.zip",
+            {
+                "web/package.json": "{}",
+                "web/index.js": "x" * 10,
+                "web/node_modules/react/index.js": "r" * 100,
+                "web/node_modules/react/package.json": "{}",
+                "web/.git/HEAD": "ref",
+                "web/lib/__pycache__/a.cpython-311.pyc": "p" * 7,
+                "__MACOSX/web/._index.js": "m",
+            },
+        )
+
+    def test_default_excludes_are_never_written(self, node_upload, tmp_path):
+        """Test that vendored trees are skipped and reported per rule."""
+        out = tmp_path / "out"
+
+        result = ArchiveExtractor(node_upload, "upload.zip").extract(str(out))
+
+        files = sorted(
+            str(p.relative_to(out)) for p in out.rglob("*") if p.is_file()
+        )
+        assert files == ["web/index.js", "web/package.json"]
+        assert result["root_path"] == str(out / "web")
+        excluded = result["excluded"]
+        assert excluded["rules"]["node_modules/"] == {"files": 2, "bytes": 102}
+        assert excluded["rules"]["__pycache__/"] == {"files": 1, "bytes": 7}
+        assert excluded["rules"]["__MACOSX/"] == {"files": 1, "bytes": 1}
+        assert excluded["files"] == 5
+
+    def test_custom_rules_relative_to_project_root(self, node_upload, tmp_path):
+        """Test that anchored rules and includes apply below the wrapper folder."""
+        out = tmp_path / "out"
+
+        result = ArchiveExtractor(
+            node_upload,
+            "upload.zip",
+            excludes=["__MACOSX/", "/index.js"],
+            includes=["*.js"],
+        ).extract(str(out))
+
+        files = sorted(
+            str(p.relative_to(out)) for p in out.rglob("*") if p.is_file()
+        )
+        assert files == ["web/node_modules/react/index.js"]
+        assert result["excluded"]["rules"]["/index.js"]["files"] == 1
+
+    def test_tar_members_are_filtered(self, tmp_path):
+        """Test that the same rules apply to tarballs."""
+        archive = make_tar(
+            tmp_path / "upload.tar.gz",
+            {"./main.go": "", "./go.mod": "", "./.venv/bin/python": "bin"},
+        )
+        out = tmp_path / "out"
+
+        result = ArchiveExtractor(archive, "upload.tar.gz").extract(str(out))
+
+        assert (out / "main.go").exists()
+        assert not (out / ".venv").exists()
+        assert result["excluded"]["rules"][".venv/"] == {"files": 1, "bytes": 3}
+
+
+@pytest.mark.unit
+class TestParallelZipExtraction:
+    """Test suite for the threaded zip extraction engine."""
+
+    def test_many_small_files_are_extracted_intact(self, tmp_path):
+        """Test that every member is written with its own content."""
+        files = {f"app/src/module_{i}/file_{i}.js": f"export {i};\n" * i for i in range(300)}
+        files["app/package.json"] = "{}"
+        archive = make_zip(tmp_path / "upload.zip", files)
+        out = tmp_path / "out"
+
+        ArchiveExtractor(archive, "upload.zip", max_workers=8).extract(str(out))
+
+        for name, content in files.items():
+            assert (out / name).read_text() == content
+
+    def test_each_worker_uses_its_own_handle(self, tmp_path, monkeypatch):
+        """Test that worker threads don't share a ZipFile handle."""
+        archive = make_zip(
+            tmp_path / "upload.zip",
+            {f"f{i}.txt": "x" for i in range(200)},
+            compression=zipfile.ZIP_DEFLATED,
+        )
+        opened = []
+        real_zipfile = zipfile.ZipFile
+
+        def tracking_zipfile(*args, **kwargs):
+            handle = real_zipfile(*args, **kwargs)
+            opened.append(threading.current_thread().name)
+            return handle
+
+        monkeypatch.setattr(extractor.zipfile, "ZipFile", tracking_zipfile)
+
+        ArchiveExtractor(archive, "upload.zip", max_workers=4).extract(
+            str(tmp_path / "out")
+        )
+
+        worker_handles = [name for name in opened if name != "MainThread"]
+        assert len(worker_handles) == len(set(worker_handles))
+        assert 1 <= len(worker_handles) <= 4
+
+
+@pytest.mark.unit
+class TestStreamingTar:
+    """Test suite for sequential tar extraction."""
+
+    @pytest.mark.parametrize(
+        "filename,mode",
+        [
+            ("app.tar", "w"),
+            ("app.tgz", "w:gz"),
+            ("app.tar.xz", "w:xz"),
+            ("app.tar.bz2", "w:bz2"),
+        ],
+    )
+    def test_compression_formats(self, tmp_path, filename, mode):
+        """Test that each supported format is inspected and extracted."""
+        archive = tmp_path / filename
+        with tarfile.open(archive, mode) as tf:
+            data = b"module example.com/app\n"
+            info = tarfile.TarInfo("go.mod")
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+        out = tmp_path / "out"
+        extractor = ArchiveExtractor(str(archive), filename)
+
+        assert extractor.inspect()["markers"] == {"go.mod": data}
+        result = extractor.extract(str(out))
+
+        assert (out / "go.mod").read_bytes() == data
+        assert result["project_name"] == "app"
+
+    def test_archive_is_never_seeked(self, tmp_path, monkeypatch):
+        """Test that the upload is read front to back in a single pass."""
+        archive = make_tar(
+            tmp_path / "upload.tar.gz",
+            {f"app/f{i}.txt": "x" * 1000 for i in range(50)},
+        )
+        seeks = []
+        real_open = open
+
+        class NoSeek(io.BufferedReader):
+            def seek(self, *args):
+                seeks.append(args)
+                raise io.UnsupportedOperation("seek")
+
+        def no_seek_open(path, mode="r", *args, **kwargs):
+            if path == archive and mode == "rb":
+                return NoSeek(real_open(path, "rb", buffering=0))
+            return real_open(path, mode, *args, **kwargs)
+
+        monkeypatch.setattr("builtins.open", no_seek_open)
+
+        ArchiveExtractor(archive, "upload.tar.gz").extract(str(tmp_path / "out"))
+
+        assert seeks == []
+        assert (tmp_path / "out" / "app" / "f49.txt").exists()
+
+    def test_zstd_tarball(self, tmp_path):
+        """Test that .tar.zst uploads are extracted."""
+        plain = make_tar(
+            tmp_path / "plain.tar", {"app/main.go": "package main\n"}, mode="w"
+        )
+        archive = tmp_path / "app.tar.zst"
+        with open(plain, "rb") as src, open(archive, "wb") as dst:
+            zstandard.ZstdCompressor().copy_stream(src, dst)
+
+        ArchiveExtractor(str(archive), "app.tar.zst").extract(str(tmp_path / "out"))
+
+        assert (tmp_path / "out" / "app" / "main.go").read_text() == "package main\n"
+
+    def test_unsupported_format(self, tmp_path):
+        """Test that unknown extensions are rejected."""
+        with pytest.raises(ValueError, match="Unsupported archive format"):
+            ArchiveExtractor(str(tmp_path / "app.rar"), "app.rar").inspect()
+
+
+@pytest.mark.unit
+class TestArchiveCache:
+    """Test suite for reusing extracted trees across uploads."""
+
+    def test_reupload_is_linked_from_cache(self, tmp_path, monkeypatch):
+        """Test that a second upload of the same bytes isn't decompressed."""
+        archive = make_zip(
+            tmp_path / "upload.zip",
+            {"app/requirements.txt": "flask\n", "app/node_modules/x.js": "x"},
+        )
+        cache_dir = tmp_path / "cache"
+        first = ArchiveExtractor(archive, "upload.zip", cache_dir=cache_dir).extract(
+            str(tmp_path / "job1")
+        )
+
+        def fail(*args, **kwargs):
+            raise AssertionError("archive was read again")
+
+        monkeypatch.setattr(ArchiveExtractor, "_extract_zip_members", fail)
+        extractor = ArchiveExtractor(archive, "upload.zip", cache_dir=cache_dir)
+        inspection = extractor.inspect()
+        second = extractor.extract(str(tmp_path / "job2"))
+
+        assert inspection["markers"] == {"requirements.txt": b"flask\n"}
+        assert second["root_path"] == str(tmp_path / "job2" / "app")
+        assert second["project_name"] == first["project_name"] == "app"
+        assert second["excluded"] == first["excluded"]
+        job1_file = tmp_path / "job1" / "app" / "requirements.txt"
+        job2_file = tmp_path / "job2" / "app" / "requirements.txt"
+        assert job2_file.read_text() == "flask\n"
+        assert job1_file.stat().st_ino == job2_file.stat().st_ino
+
+    def test_zip_inspection_does_not_hash_the_upload(self, tmp_path, monkeypatch):
+        """Test that inspecting a zip reads its central directory, not every byte."""
+        archive = make_zip(tmp_path / "upload.zip", {"app/requirements.txt": "flask\n"})
+
+        def fail(path):
+            raise AssertionError("upload was hashed")
+
+        monkeypatch.setattr(extractor, "file_digest", fail)
+        inspection = ArchiveExtractor(
+            archive, "upload.zip", cache_dir=tmp_path / "cache"
+        ).inspect()
+
+        assert inspection["markers"] == {"requirements.txt": b"flask\n"}
+
+    def test_tar_reinspection_is_answered_from_cache(self, tmp_path, monkeypatch):
+        """Test that a cached tarball is neither scanned nor decompressed again."""
+        archive = make_tar(tmp_path / "upload.tar.gz", {"app/requirements.txt": "flask\n"})
+        cache_dir = tmp_path / "cache"
+        ArchiveExtractor(archive, "upload.tar.gz", cache_dir=cache_dir).extract(
+            str(tmp_path / "job1")
+        )
+
+        def fail(*args, **kwargs):
+            raise AssertionError("archive was read again")
+
+        monkeypatch.setattr(ArchiveExtractor, "_scan_tar", fail)
+        monkeypatch.setattr(ArchiveExtractor, "_extract_tar_file", fail)
+        reupload = ArchiveExtractor(archive, "upload.tar.gz", cache_dir=cache_dir)
+
+        assert reupload.inspect()["markers"] == {"requirements.txt": b"flask\n"}
+        assert reupload.extract(str(tmp_path / "job2"))["project_name"] == "app"
+
+    def test_evicted_entry_is_scanned_again(self, tmp_path):
+        """Test that inspection falls back to a scan once its entry is gone."""
+        archive = make_tar(tmp_path / "upload.tar.gz", {"app/go.mod": "module x\n"})
+        cache_dir = tmp_path / "cache"
+        first = ArchiveExtractor(archive, "upload.tar.gz", cache_dir=cache_dir)
+        first.extract(str(tmp_path / "job1"))
+        key = first._get_cache_key()
+        assert first.cache.peek(key)["inspection"]
+
+        (cache_dir / key / "meta.json").unlink()
+        reupload = ArchiveExtractor(archive, "upload.tar.gz", cache_dir=cache_dir)
+
+        assert reupload.cache.peek(key) is None
+        assert reupload.inspect()["markers"] == {"go.mod": b"module x\n"}
+
+    def test_different_rules_use_different_entries(self, tmp_path):
+        """Test that the cache key covers the include and exclude rules."""
+        archive = make_zip(tmp_path / "upload.zip", {"a.py": "", "node_modules/b.js": ""})
+        cache_dir = tmp_path / "cache"
+
+        ArchiveExtractor(archive, "upload.zip", cache_dir=cache_dir).extract(
+            str(tmp_path / "job1")
+        )
+        ArchiveExtractor(
+            archive, "upload.zip", excludes=[], cache_dir=cache_dir
+        ).extract(str(tmp_path / "job2"))
+
+        assert not (tmp_path / "job1" / "node_modules").exists()
+        assert (tmp_path / "job2" / "node_modules" / "b.js").exists()
+        assert len(list(cache_dir.iterdir())) == 2
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        """Test that the cache stays within its size bound."""
+        cache_dir = tmp_path / "cache"
+        archives = [
+            make_zip(tmp_path / f"upload{i}.zip", {"data.bin": str(i) * 1000})
+            for i in range(3)
+        ]
+
+        for i, archive in enumerate(archives):
+            ArchiveExtractor(
+                archive, "upload.zip", cache_dir=cache_dir, cache_max_bytes=2500
+            ).extract(str(tmp_path / f"job{i}"))
+            # Entry ages are compared by mtime
+            entries = sorted(cache_dir.iterdir(), key=lambda p: p.stat().st_mtime)
+            for age, entry in enumerate(reversed(entries)):
+                os.utime(entry, (1000 - age, 1000 - age))
+
+        cached = {
+            (entry / "tree" / "data.bin").read_text()[0] for entry in cache_dir.iterdir()
+        }
+        assert cached == {"1", "2"}
+        # Jobs keep their files after the tree they were linked from is evicted
+        assert (tmp_path / "job0" / "data.bin").read_text() == "0" * 1000
+
+
+@pytest.mark.unit
+class TestExtractionGuard:
+    """Test suite for the limits enforced while extracting."""
+
+    @pytest.mark.parametrize("name", ["../evil.txt", "/abs/file.txt", "a/../../evil.txt"])
+    def test_zip_path_traversal_is_rejected(self, tmp_path, name):
+        """Test that entries escaping the target abort before anything is written."""
+        archive = make_zip(tmp_path / "upload.zip", {"ok.txt": "", name: "x"})
+        out = tmp_path / "out"
+
+        with pytest.raises(ExtractionLimitError) as error:
+            ArchiveExtractor(archive, "upload.zip").extract(str(out))
+
+        assert error.value.report["limit"] == "path"
+        assert not (out / "ok.txt").exists()
+        assert not (tmp_path / "evil.txt").exists()
+
+    def test_tar_link_outside_target_is_rejected(self, tmp_path):
+        """Test that the tar data filter stops links pointing out of the target."""
+        archive = tmp_path / "upload.tar"
+        with tarfile.open(archive, "w") as tf:
+            info = tarfile.TarInfo("app/passwd")
+            info.type = tarfile.SYMTYPE
+            info.linkname = "/etc/passwd"
+            tf.addfile(info)
+
+        with pytest.raises(ExtractionLimitError, match="outside"):
+            ArchiveExtractor(str(archive), "upload.tar").extract(str(tmp_path / "out"))
+
+    def test_total_size_limit(self, tmp_path):
+        """Test that the declared uncompressed size is bounded."""
+        archive = make_zip(
+            tmp_path / "upload.zip", {f"f{i}.bin": "x" * 600 for i in range(3)}
+        )
+
+        with pytest.raises(ExtractionLimitError) as error:
+            ArchiveExtractor(
+                archive, "upload.zip", limits={"max_bytes": 1000}
+            ).extract(str(tmp_path / "out"))
+
+        assert error.value.report == {
+            "limit": "max_bytes",
+            "value": 1200,
+            "maximum": 1000,
+            "member": "f1.bin",
+        }
+
+    def test_compression_ratio_limit(self, tmp_path):
+        """Test that a highly compressed bomb is stopped from its headers."""
+        archive = tmp_path / "bomb.tar.gz"
+        with tarfile.open(archive, "w:gz") as tf:
+            info = tarfile.TarInfo("zeros.bin")
+            info.size = 32 * 1024 * 1024
+            tf.addfile(info, io.BytesIO(bytes(info.size)))
+        out = tmp_path / "out"
+
+        with pytest.raises(ExtractionLimitError) as error:
+            ArchiveExtractor(str(archive), "bomb.tar.gz").extract(str(out))
+
+        assert error.value.report["limit"] == "max_ratio"
+        assert not (out / "zeros.bin").exists()
+
+    def test_member_count_and_depth_limits(self, tmp_path):
+        """Test that entry count and nesting depth are bounded."""
+        many = make_zip(tmp_path / "many.zip", {f"f{i}": "" for i in range(11)})
+        deep = make_zip(tmp_path / "deep.zip", {"/".join("d" * 6) + "/f": ""})
+
+        with pytest.raises(ExtractionLimitError, match="more than 10 entries"):
+            ArchiveExtractor(many, "many.zip", limits={"max_members": 10}).extract(
+                str(tmp_path / "out1")
+            )
+        with pytest.raises(ExtractionLimitError, match="deeper than 5"):
+            ArchiveExtractor(deep, "deep.zip", limits={"max_depth": 5}).extract(
+                str(tmp_path / "out2")
+            )
+
+    def test_inspection_enforces_the_limits(self, tmp_path):
+        """Test that validation rejects hostile uploads from their listing alone."""
+        traversal = make_zip(tmp_path / "traversal.zip", {"app/ok.txt": "", "../evil.txt": "x"})
+        many = make_zip(tmp_path / "many.zip", {f"f{i}": "" for i in range(11)})
+        bomb = tmp_path / "bomb.tar.gz"
+        with tarfile.open(bomb, "w:gz") as tf:
+            info = tarfile.TarInfo("app/zeros.bin")
+            info.size = 32 * 1024 * 1024
+            tf.addfile(info, io.BytesIO(bytes(info.size)))
+
+        with pytest.raises(ExtractionLimitError, match="outside"):
+            ArchiveExtractor(traversal, "traversal.zip").inspect()
+        with pytest.raises(ExtractionLimitError, match="more than 10 entries"):
+            ArchiveExtractor(many, "many.zip", limits={"max_members": 10}).inspect()
+        with pytest.raises(ExtractionLimitError) as error:
+            ArchiveExtractor(str(bomb), "bomb.tar.gz").inspect()
+        assert error.value.report["limit"] == "max_ratio"
+
+    def test_inspection_skips_excluded_sizes(self, tmp_path):
+        """Test that excluded files don't count towards the size limit at inspection."""
+        archive = make_zip(
+            tmp_path / "upload.zip",
+            {"app/main.py": "x" * 100, "app/node_modules/big.js": "x" * 5000},
+        )
+
+        inspection = ArchiveExtractor(
+            archive, "upload.zip", limits={"max_bytes": 1000}
+        ).inspect()
+
+        assert inspection["root_prefix"] == "app/"
+
+
+@pytest.mark.unit
+class TestExtractionMetrics:
+    """Test suite for the metrics reported by extract."""
+
+    def test_metrics_are_reported_and_logged(self, tmp_path):
+        """Test that the callback and the JSON-lines log get the same metrics."""
+        archive = make_zip(
+            tmp_path / "upload.zip",
+            {"app/big.bin": "b" * 5000, "app/small.txt": "s", "app/node_modules/x.js": "x"},
+        )
+        reported = []
+        log = tmp_path / "metrics.jsonl"
+
+        ArchiveExtractor(
+            archive, "upload.zip", metrics_callback=reported.append, metrics_log=log
+        ).extract(str(tmp_path / "out"))
+
+        metrics = reported[0]
+        assert metrics["files_written"] == 2
+        assert metrics["bytes_written"] == 5001
+        assert metrics["members"] == 3
+        assert metrics["excluded_files"] == 1
+        assert metrics["cache_hit"] is False
+        assert 0 < metrics["bytes_read"] <= metrics["archive_bytes"]
+        assert set(metrics["seconds"]) == {"inspect", "decompress", "write", "link", "total"}
+        slowest = metrics["slowest_members"]
+        assert {m["name"] for m in slowest} == {"app/big.bin", "app/small.txt"}
+        assert slowest[0]["seconds"] >= slowest[1]["seconds"]
+        logged = json.loads(log.read_text().splitlines()[0])
+        assert logged.pop("timestamp") > 0
+        assert logged == metrics
+
+    def test_tar_files_keep_mode_and_report_timings(self, tmp_path):
+        """Test that timed tar extraction preserves permissions."""
+        archive = tmp_path / "upload.tar.gz"
+        with tarfile.open(archive, "w:gz") as tf:
+            data = b"#!/bin/sh\n"
+            info = tarfile.TarInfo("run.sh")
+            info.size = len(data)
+            info.mode = 0o755
+            tf.addfile(info, io.BytesIO(data))
+        reported = []
+
+        ArchiveExtractor(
+            str(archive), "upload.tar.gz", metrics_callback=reported.append
+        ).extract(str(tmp_path / "out"))
+
+        assert os.stat(tmp_path / "out" / "run.sh").st_mode & 0o777 == 0o755
+        assert reported[0]["files_written"] == 1
+        assert reported[0]["bytes_read"] == os.path.getsize(archive)
+        assert reported[0]["slowest_members"][0]["name"] == "run.sh"
+
+    def test_cache_hits_are_flagged(self, tmp_path):
+        """Test that a linked re-upload reports a cache hit and no writes."""
+        archive = make_zip(tmp_path / "upload.zip", {"a.py": "print(1)\n"})
+        reported = []
+        for job in ("job1", "job2"):
+            ArchiveExtractor(
+                archive,
+                "upload.zip",
+                cache_dir=tmp_path / "cache",
+                metrics_callback=reported.append,
+            ).extract(str(tmp_path / job))
+
+        assert [m["cache_hit"] for m in reported] == [False, True]
+        assert reported[1]["files_written"] == 0
+
+
+@pytest.mark.unit
+class TestStoredZipMembers:
+    """Test suite for the zero-copy path of stored zip members."""
+
+    def test_stored_members_skip_zipfile(self, tmp_path, monkeypatch):
+        """Test that stored members are copied from the mapping, not inflated."""
+        files = {f"app/f{i}.bin": chr(65 + i % 26) * (i * 100) for i in range(80)}
+        archive = make_zip(tmp_path / "upload.zip", files)
+        reported = []
+
+        def fail(*args, **kwargs):
+            raise AssertionError("stored member went through ZipFile.open")
+
+        monkeypatch.setattr(zipfile.ZipFile, "open", fail)
+        ArchiveExtractor(
+            archive, "upload.zip", metrics_callback=reported.append
+        ).extract(str(tmp_path / "out"))
+
+        for name, content in files.items():
+            assert (tmp_path / "out" / name).read_text() == content
+        assert reported[0]["zero_copy_files"] == 80
+
+    def test_mixed_archive_without_kernel_copy(self, tmp_path, monkeypatch):
+        """Test the plain-write fallback next to deflated members."""
+        archive = tmp_path / "upload.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("stored.txt", "s" * 1000, compress_type=zipfile.ZIP_STORED)
+            zf.writestr("deflated.txt", "d" * 1000, compress_type=zipfile.ZIP_DEFLATED)
+        monkeypatch.setattr(extractor, "_kernel_copy", lambda *args: False)
+        reported = []
+
+        ArchiveExtractor(
+            str(archive), "upload.zip", metrics_callback=reported.append
+        ).extract(str(tmp_path / "out"))
+
+        assert (tmp_path / "out" / "stored.txt").read_text() == "s" * 1000
+        assert (tmp_path / "out" / "deflated.txt").read_text() == "d" * 1000
+        assert reported[0]["zero_copy_files"] == 1
+
+    def test_corrupt_stored_member_fails_crc(self, tmp_path):
+        """Test that a damaged stored member is caught by the CRC check."""
+        archive = tmp_path / "upload.zip"
+        make_zip(archive, {"data.txt": "hello world"})
+        raw = archive.read_bytes()
+        archive.write_bytes(raw.replace(b"hello world", b"hello WORLD", 1))
+
+        with pytest.raises(ValueError, match="Bad CRC-32"):
+            ArchiveExtractor(str(archive), "upload.zip").extract(str(tmp_path / "out"))
@@ -0,0 +1,90 @@
+"""Unit tests for IgnoreRules."""
+import pytest
+
+from logic.ignore import IgnoreRules
+
+
+@pytest.mark.unit
+class TestIgnoreRules:
+    """Test suite for .gitignore-style matching."""
+
+    def test_unanchored_name_matches_at_any_depth(self):
+        """Test that a bare name matches files in every directory."""
+        rules = IgnoreRules(["*.pyc"])
+
+        assert rules.excludes("module.pyc")
+        assert rules.excludes("pkg/sub/module.pyc")
+        assert not rules.excludes("module.py")
+
+    def test_anchored_pattern_only_matches_from_root(self):
+        """Test that a leading slash anchors the pattern to the tree root."""
+        rules = IgnoreRules(["/build"])
+
+        assert rules.excludes("build", is_dir=True)
+        assert not rules.excludes("src/build", is_dir=True)
+
+    def test_anchored_directory_only_pattern(self):
+        """Test that a leading slash anchors a directory-only pattern too."""
+        rules = IgnoreRules(["/build/"])
+
+        assert rules.excludes("build", is_dir=True)
+        assert rules.excludes("build/app.js")
+        assert not rules.excludes("src/build", is_dir=True)
+        assert not rules.excludes("app/static/build/app.js")
+
+    def test_anchored_directory_only_pattern_in_nested_file(self):
+        """Test that "/dist/" in a nested .gitignore is anchored to its folder."""
+        rules = IgnoreRules(["/dist/"], base="web")
+
+        assert rules.excludes("web/dist", is_dir=True)
+        assert not rules.excludes("web/src/dist", is_dir=True)
+        assert not rules.excludes("dist", is_dir=True)
+
+    def test_directory_only_pattern(self):
+        """Test that a trailing slash only matches directories and their contents."""
+        rules = IgnoreRules(["node_modules/"])
+
+        assert rules.excludes("node_modules", is_dir=True)
+        assert rules.excludes("web/node_modules/react/index.js")
+        assert not rules.excludes("node_modules")  # a file with that name
+
+    def test_double_star_patterns(self):
+        """Test that ** matches across directory levels."""
+        rules = IgnoreRules(["docs/**/*.png", "**/fixtures"])
+
+        assert rules.excludes("docs/a/b/diagram.png")
+        assert rules.excludes("docs/diagram.png")
+        assert rules.excludes("tests/unit/fixtures", is_dir=True)
+        assert not rules.excludes("src/diagram.png")
+
+    def test_negation_and_last_match_wins(self):
+        """Test that later negated rules re-include files."""
+        rules = IgnoreRules(["*.log", "!keep.log", "# comment", ""])
+
+        assert rules.excludes("debug.log")
+        assert not rules.excludes("keep.log")
+
+    def test_excluded_parent_cannot_be_reincluded(self):
+        """Test that a file under an excluded directory stays excluded."""
+        rules = IgnoreRules(["vendor/", "!vendor/keep.txt"])
+
+        assert rules.excludes("vendor/keep.txt")
+
+    def test_excluded_by_reports_the_rule(self):
+        """Test that the deciding pattern is returned."""
+        rules = IgnoreRules([".venv/", "*.pyc"])
+
+        assert rules.excluded_by(".venv/lib/site.py") == ".venv/"
+        assert rules.excluded_by("a.pyc") == "*.pyc"
+        assert rules.excluded_by("a.py") is None
+
+    def test_rules_with_base_apply_below_it(self):
+        """Test that rules from a nested .gitignore only apply in its directory."""
+        rules = IgnoreRules()
+        rules.add(["*.tmp", "/out"], base="web")
+
+        assert rules.excludes("web/a.tmp")
+        assert rules.excludes("web/deep/a.tmp")
+        assert rules.excludes("web/out", is_dir=True)
+        assert not rules.excludes("a.tmp")
+        assert not rules.excludes("web/deep/out", is_dir=True)
@@ -0,0 +1,160 @@
+"""Unit tests for the Maven and Gradle build file parsers."""
+import io
+
+import pytest
+
+from logic.java_build import parse_gradle, parse_pom, read_java_build
+from logic.processor import ApplicationProcessor
+from logic.project_view import DirectoryProjectView
+
+POM = """<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <parent>
+    <groupId>org.springframework.boot</groupId>
+    <artifactId>spring-boot-starter-parent</artifactId>
+    <version>3.2.0</version>
+  </parent>
+  <groupId>com.example</groupId>
+  <artifactId>demo</artifactId>
+  <version>0.1.0</version>
+  <packaging>war</packaging>
+  <dependencies>
+    <dependency>
+      <groupId>org.springframework.boot</groupId>
+      <artifactId>spring-boot-starter-web</artifactId>
+      <exclusions><exclusion><groupId>x</groupId><artifactId>y</artifactId></exclusion></exclusions>
+    </dependency>
+    <dependency>
+      <groupId>org.postgresql</groupId>
+      <artifactId>postgresql</artifactId>
+      <scope>runtime</scope>
+    </dependency>
+  </dependencies>
+  <build>
+    <finalName>demo-app</finalName>
+    <plugins>
+      <plugin>
+        <groupId>org.springframework.boot</groupId>
+        <artifactId>spring-boot-maven-plugin</artifactId>
+        <dependencies><dependency><groupId>a</groupId><artifactId>b</artifactId></dependency></dependencies>
+      </plugin>
+      <plugin><artifactId>maven-surefire-plugin</artifactId></plugin>
+    </plugins>
+  </build>
+</project>
+"""
+
+
+@pytest.mark.unit
+class TestParsePom:
+    """Test suite for parse_pom."""
+
+    def test_fields(self):
+        """Parent, coordinates, size hints, dependencies and plugins are read."""
+        pom = parse_pom(io.BytesIO(POM.encode()))
+        assert pom["parent"]["artifactId"] == "spring-boot-starter-parent"
+        assert pom["artifact"] == {"groupId": "com.example", "artifactId": "demo", "version": "0.1.0"}
+        assert pom["packaging"] == "war"
+        assert pom["final_name"] == "demo-app"
+        assert [d["artifactId"] for d in pom["dependencies"]] == ["spring-boot-starter-web", "postgresql"]
+        assert pom["dependencies"][1]["scope"] == "runtime"
+        assert pom["plugins"] == [
+            "org.springframework.boot:spring-boot-maven-plugin",
+            "org.apache.maven.plugins:maven-surefire-plugin",
+        ]
+
+    def test_large_pom_keeps_no_tree(self):
+        """Thousands of dependencies are counted without the tree growing."""
+        dependency = "<dependency><groupId>g</groupId><artifactId>a{}</artifactId></dependency>"
+        body = "".join(dependency.format(i) for i in range(5000))
+        pom = parse_pom(io.BytesIO(f"<project><dependencies>{body}</dependencies></project>".encode()))
+        assert len(pom["dependencies"]) == 5000
+        assert pom["dependencies"][-1]["artifactId"] == "a4999"
+
+    def test_invalid_xml(self):
+        """A malformed POM raises ValueError."""
+        with pytest.raises(ValueError, match="not valid XML"):
+            parse_pom(io.BytesIO(b"<project><dependencies></project>"))
+
+
+@pytest.mark.unit
+class TestParseGradle:
+    """Test suite for parse_gradle."""
+
+    def test_groovy_and_kotlin_dsl(self):
+        """Plugins and dependencies are found in both script dialects."""
+        groovy = parse_gradle(
+            [
+                "plugins {\n",
+                "    id 'org.springframework.boot' version '3.2.0'\n",
+                "}\n",
+                "dependencies {\n",
+                "    implementation 'org.springframework.boot:spring-boot-starter-web'\n",
+                "    runtimeOnly 'org.postgresql:postgresql:42.7.1' // driver\n",
+                "}\n",
+            ]
+        )
+        assert groovy["spring_boot_plugin"]
+        assert [d["artifactId"] for d in groovy["dependencies"]] == ["spring-boot-starter-web", "postgresql"]
+        assert groovy["dependencies"][1]["version"] == "42.7.1"
+
+        kotlin = parse_gradle(['plugins { id("org.springframework.boot") version "3.2.0" }\n'])
+        assert kotlin["spring_boot_plugin"]
+
+    def test_settings_includes(self):
+        """include lines name the subprojects; includeBuild is not one."""
+        settings = parse_gradle(["include 'app', ':lib:core'\n", 'include(":web")\n', 'includeBuild("tools")\n'])
+        assert settings["includes"] == ["app", "lib/core", "web"]
+
+
+@pytest.mark.unit
+class TestReadJavaBuild:
+    """Test suite for read_java_build and the Spring Boot check."""
+
+    def test_maven_modules_are_followed(self, tmp_path, make_project):
+        """An aggregator POM finds Spring Boot in its modules."""
+        make_project(
+            tmp_path,
+            {
+                "pom.xml": "<project><packaging>pom</packaging><modules><module>api</module></modules></project>",
+                "api/pom.xml": POM,
+            },
+        )
+        view = DirectoryProjectView(str(tmp_path))
+        build = read_java_build(view)
+        assert build["build_tool"] == "maven"
+        assert build["modules"] == ["api"]
+        assert build["spring_boot"]
+        assert "api/pom.xml: spring-boot-starter-parent" in build["evidence"]
+        assert build["dependencies"] == 2
+
+    def test_gradle_subprojects(self, tmp_path, make_project):
+        """Gradle subprojects come from settings.gradle."""
+        make_project(
+            tmp_path,
+            {
+                "build.gradle": "",
+                "settings.gradle": "include 'service'\n",
+                "service/build.gradle.kts": 'plugins { id("org.springframework.boot") }\n',
+            },
+        )
+        view = DirectoryProjectView(str(tmp_path))
+        build = read_java_build(view)
+        assert build["build_tool"] == "gradle"
+        assert build["evidence"] == ["service/build.gradle.kts: org.springframework.boot plugin"]
+
+    def test_processor_accepts_spring_boot_id(self, tmp_path, make_project):
+        """The wizard's spring-boot id runs the Spring Boot check."""
+        make_project(tmp_path, {"pom.xml": POM})
+        assert ApplicationProcessor(str(tmp_path), "spring-boot").check_project()
+
+    def test_processor_rejects_plain_java(self, tmp_path, make_project):
+        """A Maven project without Spring Boot fails validation."""
+        make_project(tmp_path, {"pom.xml": "<project><artifactId>x</artifactId></project>"})
+        with pytest.raises(ValueError, match="doesn't use Spring Boot"):
+            ApplicationProcessor(str(tmp_path), "spring-boot").check_project()
+
+    def test_processor_requires_a_build_file(self, tmp_path):
+        """A project with neither pom.xml nor build.gradle fails validation."""
+        with pytest.raises(ValueError, match="missing pom.xml or build.gradle"):
+            ApplicationProcessor(str(tmp_path), "springboot").check_project()
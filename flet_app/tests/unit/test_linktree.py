@@ -0,0 +1,60 @@
+"""Unit tests for link_tree."""
+import os
+
+import pytest
+
+from logic import linktree
+from logic.linktree import link_tree
+
+
+@pytest.fixture
+def source_tree(tmp_path):
+    """Create a small tree with a nested directory and a symlink."""
+    src = tmp_path / "src"
+    (src / "pkg").mkdir(parents=True)
+    (src / "app.py").write_text("print('hi')\n")
+    (src / "pkg" / "module.py").write_text("VALUE = 1\n")
+    os.symlink("app.py", src / "main.py")
+    return src
+
+
+@pytest.mark.unit
+class TestLinkTree:
+    """Test suite for link_tree."""
+
+    def test_materializes_all_files(self, source_tree, tmp_path):
+        """Test that every file and directory appears in the destination."""
+        dst = tmp_path / "dst"
+
+        counts = link_tree(str(source_tree), str(dst))
+
+        assert (dst / "app.py").read_text() == "print('hi')\n"
+        assert (dst / "pkg" / "module.py").read_text() == "VALUE = 1\n"
+        assert os.readlink(dst / "main.py") == "app.py"
+        assert sum(counts.values()) == 2
+
+    def test_falls_back_to_hardlinks_without_reflinks(self, source_tree, tmp_path, monkeypatch):
+        """Test that files are hardlinked when reflinks are not supported."""
+        def no_reflink(src, dst):
+            raise OSError(95, "Operation not supported")
+
+        monkeypatch.setattr(linktree, "reflink_file", no_reflink)
+        dst = tmp_path / "dst"
+
+        counts = link_tree(str(source_tree), str(dst))
+
+        assert counts["hardlink"] == 2
+        assert (dst / "app.py").stat().st_ino == (source_tree / "app.py").stat().st_ino
+
+    def test_copies_when_hardlinks_disallowed(self, source_tree, tmp_path, monkeypatch):
+        """Test that files are copied when neither reflinks nor hardlinks are allowed."""
+        def no_reflink(src, dst):
+            raise OSError(95, "Operation not supported")
+
+        monkeypatch.setattr(linktree, "reflink_file", no_reflink)
+        dst = tmp_path / "dst"
+
+        counts = link_tree(str(source_tree), str(dst), hardlink=False)
+
+        assert counts["copy"] == 2
+        assert (dst / "app.py").stat().st_ino != (source_tree / "app.py").stat().st_ino
@@ -0,0 +1,88 @@
+"""Unit tests for LocalDirectorySource."""
+import os
+
+import pytest
+
+from logic import linktree
+from logic.local_source import LocalDirectorySource
+
+
+@pytest.fixture
+def local_project(tmp_path):
+    """Create a working tree with ignored and vendored content."""
+    project = tmp_path / "My_App"
+    (project / "src").mkdir(parents=True)
+    (project / "src" / "app.py").write_text("app = None\n")
+    (project / "requirements.txt").write_text("flask\n")
+    (project / ".gitignore").write_text("*.log\n.venv/\n")
+    (project / "debug.log").write_text("noise\n")
+    (project / ".venv" / "lib").mkdir(parents=True)
+    (project / ".venv" / "lib" / "site.py").write_text("")
+    (project / ".git").mkdir()
+    (project / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+    (project / "web").mkdir()
+    (project / "web" / ".gitignore").write_text("dist/\n")
+    (project / "web" / "dist").mkdir()
+    (project / "web" / "dist" / "bundle.js").write_text("")
+    (project / "web" / "index.js").write_text("")
+    return project
+
+
+@pytest.mark.unit
+class TestLocalDirectorySource:
+    """Test suite for LocalDirectorySource."""
+
+    def test_materializes_tree_honoring_gitignore(self, local_project, tmp_path):
+        """Test that ignored paths and .git are never materialized."""
+        target = tmp_path / "job"
+
+        result = LocalDirectorySource(str(local_project)).materialize(str(target))
+
+        files = sorted(
+            str(p.relative_to(target)) for p in target.rglob("*") if p.is_file()
+        )
+        assert files == [
+            ".gitignore",
+            "requirements.txt",
+            "src/app.py",
+            "web/.gitignore",
+            "web/index.js",
+        ]
+        assert result["root_path"] == str(target)
+        assert result["project_name"] == "my-app"
+        assert sum(result["methods"].values()) == 5
+
+    def test_accepts_file_url_and_extra_excludes(self, local_project, tmp_path):
+        """Test that file:// URLs work and extra patterns are applied."""
+        target = tmp_path / "job"
+
+        LocalDirectorySource(
+            f"file://{local_project}", excludes=["web/"]
+        ).materialize(str(target))
+
+        assert (target / "src" / "app.py").exists()
+        assert not (target / "web").exists()
+
+    def test_falls_back_to_parallel_copy(self, local_project, tmp_path, monkeypatch):
+        """Test that files are copied when the filesystem can't share blocks."""
+        def unsupported(*args):
+            raise OSError(18, "Invalid cross-device link")
+
+        monkeypatch.setattr(linktree, "reflink_file", unsupported)
+        monkeypatch.setattr(linktree.os, "link", unsupported)
+        target = tmp_path / "job"
+
+        result = LocalDirectorySource(str(local_project), max_workers=4).materialize(
+            str(target)
+        )
+
+        assert result["methods"]["copy"] == 5
+        assert (target / "src" / "app.py").read_text() == "app = None\n"
+        assert (target / "src" / "app.py").stat().st_ino != (
+            local_project / "src" / "app.py"
+        ).stat().st_ino
+
+    def test_missing_directory_raises(self, tmp_path):
+        """Test that a path that isn't a directory is rejected."""
+        with pytest.raises(ValueError, match="not found"):
+            LocalDirectorySource(str(tmp_path / "nope"))
@@ -0,0 +1,85 @@
+"""Unit tests for ProjectIndex."""
+import hashlib
+import os
+
+import pytest
+
+from logic import project_index
+from logic.processor import ApplicationProcessor
+from logic.project_index import ProjectIndex
+
+
+@pytest.fixture
+def flask_project(tmp_path):
+    """A small Flask project with a nested package."""
+    root = tmp_path / "app"
+    (root / "pkg" / "sub").mkdir(parents=True)
+    (root / "requirements.txt").write_text("Flask==3.0\n")
+    (root / "app.py").write_text("app = None\n")
+    (root / "pkg" / "__init__.py").write_text("")
+    (root / "pkg" / "sub" / "requirements.txt").write_text("requests\n")
+    return root
+
+
+@pytest.mark.unit
+class TestProjectIndex:
+    """Test suite for ProjectIndex."""
+
+    def test_tree_is_walked_once(self, flask_project, monkeypatch):
+        """Test that building and querying the index scans each folder once."""
+        scanned = []
+        real_scandir = os.scandir
+
+        def counting_scandir(path):
+            scanned.append(path)
+            return real_scandir(path)
+
+        monkeypatch.setattr(project_index.os, "scandir", counting_scandir)
+
+        index = ProjectIndex(str(flask_project))
+        ApplicationProcessor(str(flask_project), "flask", view=index).check_project()
+        index.find("requirements.txt")
+        index.listdir("pkg")
+
+        assert len(scanned) == 3
+
+    def test_entries_and_totals(self, flask_project):
+        """Test that sizes, counts and name lookups are recorded."""
+        index = ProjectIndex(str(flask_project))
+
+        assert index.file_count == 4
+        assert index.total_size == len("Flask==3.0\n") + len("app = None\n") + len(
+            "requests\n"
+        )
+        assert index.entries["app.py"]["size"] == len("app = None\n")
+        assert index.entries["pkg"]["is_dir"]
+        assert sorted(index.find("requirements.txt")) == [
+            "pkg/sub/requirements.txt",
+            "requirements.txt",
+        ]
+        assert sorted(path for path, _ in index.files())[:2] == ["app.py", "pkg/__init__.py"]
+
+    def test_view_interface(self, flask_project):
+        """Test the methods shared with DirectoryProjectView."""
+        index = ProjectIndex(str(flask_project))
+
+        assert index.exists("pkg/sub/requirements.txt")
+        assert index.isdir("pkg/sub")
+        assert not index.exists("missing.py")
+        assert sorted(index.listdir()) == ["app.py", "pkg", "requirements.txt"]
+        with index.open("app.py") as f:
+            assert f.read() == "app = None\n"
+        with pytest.raises(FileNotFoundError):
+            index.open("missing.py")
+
+    def test_content_hashes(self, flask_project):
+        """Test that hashes are computed eagerly or on demand."""
+        expected = hashlib.sha256(b"app = None\n").hexdigest()
+
+        eager = ProjectIndex(str(flask_project), hash_contents=True)
+        lazy = ProjectIndex(str(flask_project))
+
+        assert eager.entries["app.py"]["sha256"] == expected
+        assert "sha256" not in lazy.entries["app.py"]
+        assert lazy.content_hash("app.py") == expected
+        assert lazy.entries["app.py"]["sha256"] == expected
@@ -0,0 +1,85 @@
+"""Unit tests for the project views used by ApplicationProcessor."""
+import io
+import json
+import tarfile
+import zipfile
+
+import pytest
+
+from logic.extractor import ArchiveExtractor
+from logic.processor import ApplicationProcessor
+from logic.project_view import ArchiveProjectView, DirectoryProjectView
+
+
+@pytest.fixture
+def express_upload(tmp_path):
+    """A zipped Express.js project nested in a folder, with vendored modules."""
+    archive = tmp_path / "upload.zip"
+    with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(
+            "shop/package.json", json.dumps({"scripts": {"start": "node app.js"}})
+        )
+        zf.writestr("shop/app.js", "console.log('hi')\n")
+        zf.writestr("shop/routes/index.js", "module.exports = {}\n")
+        zf.writestr("shop/node_modules/express/index.js", "")
+    return str(archive)
+
+
+@pytest.mark.unit
+class TestArchiveProjectView:
+    """Test suite for ArchiveProjectView."""
+
+    def test_queries_without_extracting(self, express_upload, tmp_path, monkeypatch):
+        """Test exists, isdir, listdir and open against the archive."""
+        monkeypatch.setattr(
+            ArchiveExtractor,
+            "extract",
+            lambda *args: pytest.fail("the archive was extracted"),
+        )
+        view = ArchiveProjectView(ArchiveExtractor(express_upload, "upload.zip"))
+
+        assert view.exists("package.json")
+        assert view.isdir("routes")
+        assert not view.exists("node_modules")
+        assert view.listdir() == ["app.js", "package.json", "routes"]
+        assert view.listdir("routes") == ["index.js"]
+        with view.open("routes/index.js") as f:
+            assert f.read() == "module.exports = {}\n"
+        with view.open("package.json", "rb") as f:
+            assert json.load(f)["scripts"]["start"] == "node app.js"
+        with pytest.raises(FileNotFoundError):
+            view.open("missing.txt")
+
+    def test_matches_the_extracted_tree(self, express_upload, tmp_path):
+        """Test that the view lists what extraction writes."""
+        extractor = ArchiveExtractor(express_upload, "upload.zip")
+        view = ArchiveProjectView(extractor)
+
+        result = extractor.extract(str(tmp_path / "out"))
+        on_disk = DirectoryProjectView(result["root_path"])
+
+        assert sorted(on_disk.listdir()) == view.listdir()
+        assert sorted(on_disk.listdir("routes")) == view.listdir("routes")
+
+    def test_processor_validates_through_the_view(self, express_upload):
+        """Test that ApplicationProcessor checks run against an archive view."""
+        view = ArchiveProjectView(ArchiveExtractor(express_upload, "upload.zip"))
+
+        assert ApplicationProcessor(None, "expressjs", view=view).check_project()
+        with pytest.raises(ValueError, match="missing go.mod"):
+            ApplicationProcessor(None, "go", view=view).check_project()
+
+    def test_tar_members_are_read_on_demand(self, tmp_path):
+        """Test that non-marker files are streamed out of a tarball."""
+        archive = tmp_path / "upload.tar.gz"
+        with tarfile.open(archive, "w:gz") as tf:
+            for name, text in {"main.go": "package main\n", "go.mod": "module x\n"}.items():
+                data = text.encode()
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tf.addfile(info, io.BytesIO(data))
+
+        view = ArchiveProjectView(ArchiveExtractor(str(archive), "upload.tar.gz"))
+
+        with view.open("main.go") as f:
+            assert f.read() == "package main\n"
@@ -2,18 +2,26 @@
 # Import logic modules
 # Import state
 import shutil
+import os
 import subprocess
 import threading
+import time
 from pathlib import Path
 
 import flet as ft
 from logic.bundler import BundleArtifacts
 from logic.charmcraft import CharmcraftGenerator
+from logic.estimator import PackEstimator, check_resources
+from logic.project_index import ProjectIndex
 from logic.rockcraft import RockcraftGenerator
-from state import JOB_STORE
+from state import JOB_INDEXES, JOB_STORE, PACK_HISTORY_LOG, PENDING_JOBS
 
 from .AccordionStep import AccordionStep
 
+# Rock and charm init may both wait on the same extraction; only the first
+# one to finish waiting reports it
+_PENDING_LOCK = threading.Lock()
+
 
 class GenerateFiles(AccordionStep):
     def __init__(self, app_state):
@@ -225,11 +233,45 @@ class GenerateFiles(AccordionStep):
         self.log_view.update()
         self.page.update()
 
+    def _wait_for_source(self, job_id):
+        """
+        Returns the job's project path, waiting for the background extraction
+        of its source if that is still running. Re-raises its error, if any.
+        """
+        future = PENDING_JOBS.get(job_id)
+        if future is not None:
+            if not future.done():
+                self.update_status("Waiting for the uploaded archive to finish extracting...")
+            messages = future.result()
+            with _PENDING_LOCK:
+                first = PENDING_JOBS.pop(job_id, None) is not None
+            if first:
+                for message in messages:
+                    self.update_status(message)
+        return JOB_STORE.get(job_id)
+
+    def _estimate_pack(self, job_id, project_path, framework):
+        """
+        Estimates the cost of packing the job's rock and checks it against
+        this machine's free memory and disk space. Logs the estimate and any
+        warnings, and returns (estimator, estimate, resources).
+        """
+        index = JOB_INDEXES.get(job_id)
+        if index is None:
+            index = JOB_INDEXES[job_id] = ProjectIndex(project_path)
+        estimator = PackEstimator(index, framework, history_path=PACK_HISTORY_LOG)
+        estimate = estimator.estimate()
+        resources = check_resources(estimate, project_path)
+        self.update_status(PackEstimator.describe(estimate))
+        for warning in resources["warnings"]:
+            self.update_status(f"WARNING: {warning}")
+        return estimator, estimate, resources
+
     # --- Rock Init ---
     def rock_init(self):
         try:
             data = self.app_state["get_form_data"]()
-            project_path = JOB_STORE.get(data.get("jobId"))
+            project_path = self._wait_for_source(data.get("jobId"))
             if not project_path:
                 raise ValueError("Job not found or expired.")
             rock_gen = RockcraftGenerator(
@@ -238,6 +280,14 @@ class GenerateFiles(AccordionStep):
             self._rockcraft_yaml_path = rock_gen.init_rockcraft(
                 status_callback=self.update_status
             )
+            # Show what packing will cost before the user asks for it; an
+            # estimate that fails must not fail the init
+            try:
+                self._estimate_pack(
+                    data.get("jobId"), project_path, data.get("framework", "")
+                )
+            except Exception as ex:
+                print(f"Pack estimate failed: {ex}")
             # Enable rock-specific next steps
             self.edit_rock_button.disabled = False
             self.pack_rock_button.disabled = False
@@ -253,10 +303,12 @@ class GenerateFiles(AccordionStep):
         finally:
             self.page.update()
 
-    def rock_pack(self, framework, project_path, project_name):
+    def rock_pack(self, framework, project_path, project_name, estimator=None, estimate=None):
         """
         Process target function for packing the rock.
         Wraps the pack operation with better error detection.
+        When an estimator and its estimate are given, the pack's duration and
+        rock size are recorded to calibrate later estimates.
         """
 
         if not project_path:
@@ -264,7 +316,14 @@ class GenerateFiles(AccordionStep):
 
         try:
             rock_gen = RockcraftGenerator(project_path, project_name, framework)
+            started = time.monotonic()
             self._rock_file_path = rock_gen.pack_rockcraft(status_callback=self.update_status)
+            if estimator and estimate:
+                estimator.record(
+                    estimate,
+                    time.monotonic() - started,
+                    os.path.getsize(self._rock_file_path),
+                )
             
             # Mark rock pack as complete
             self._rock_pack_complete = True
@@ -363,17 +422,36 @@ class GenerateFiles(AccordionStep):
             try:
                 data = self.app_state["get_form_data"]()
                 job_id = data.get("jobId")
-                project_path = JOB_STORE.get(job_id)
+                project_path = self._wait_for_source(job_id)
                 project_name = data.get("sourceProjectName", "my-rock")
                 if not project_path:
                     raise ValueError("Job not found or expired.")
 
+                # Refuse up front when this machine clearly can't afford the
+                # pack, rather than diagnosing an OOM kill afterwards; an
+                # estimate that fails doesn't stop the pack
+                try:
+                    estimator, estimate, resources = self._estimate_pack(
+                        job_id, project_path, data.get("framework", "")
+                    )
+                except Exception as ex:
+                    print(f"Pack estimate failed: {ex}")
+                    estimator = estimate = None
+                    resources = {"ok": True}
+                if not resources["ok"]:
+                    for error in resources["errors"]:
+                        self.update_status(f"**ERROR:** {error}", is_log=False)
+                    self.pack_rock_button.disabled = False
+                    return
+
                 p_rock = threading.Thread(
                     target=self.rock_pack,
                     args=(
                         data.get("framework", ""),
                         project_path,
                         project_name,
+                        estimator,
+                        estimate,
                     ),
                 )
                 p_rock.start()
@@ -472,7 +550,7 @@ class GenerateFiles(AccordionStep):
                     else:
                         project_name = "my-charm"  # Final fallback
                 project_name = project_name.replace("_", "-").lower().replace(" ", "-")
-                project_path = JOB_STORE.get(job_id)
+                project_path = self._wait_for_source(job_id)
 
                 p_charm = threading.Thread(
                     target=self.charm_init,
@@ -696,6 +774,8 @@ class GenerateFiles(AccordionStep):
             # Clean up job directory (rock source) - only if bundling succeeded or failed here
             # Maybe keep it if only charm packing failed? Decision needed.
             # For now, let's assume we clean up rock source if we reached this point.
+            PENDING_JOBS.pop(job_id, None)
+            JOB_INDEXES.pop(job_id, None)
             if job_id and job_id in JOB_STORE:
                 job_path_to_clean = JOB_STORE.pop(
                     job_id
@@ -7,6 +7,7 @@ class SelectFramework(AccordionStep):
     def __init__(self, app_state):
         # 1. Define the content for this specific step first
         frameworks = [
+            {"id": "auto", "name": "Detect automatically", "logo_path": None},
             {"id": "flask", "name": "Flask", "logo_path": "flask.svg"},
             {"id": "django", "name": "Django", "logo_path": "django.svg"},
             {"id": "fastapi", "name": "FastAPI", "logo_path": "fastapi.svg"},
@@ -18,8 +19,13 @@ class SelectFramework(AccordionStep):
         def on_framework_select(e):
             fw_id = e.control.data["id"]
             fw_name = e.control.data["name"]
+            # With "auto", the framework is detected once the source is provided
             app_state["update_form_data"](
-                {"framework": fw_id, "frameworkName": fw_name}
+                {
+                    "framework": fw_id,
+                    "frameworkName": fw_name,
+                    "frameworkAuto": fw_id == "auto",
+                }
             )
             self.update_summary(f"Framework: {fw_name}")
             app_state["set_active_step"](2)
@@ -34,7 +40,9 @@ class SelectFramework(AccordionStep):
                             width=40,
                             height=40,
                             fit=ft.ImageFit.CONTAIN,
-                        ),
+                        )
+                        if fw["logo_path"]
+                        else ft.Icon(ft.Icons.AUTO_AWESOME, size=40),
                         ft.Text(fw["name"], weight=ft.FontWeight.BOLD),
                     ],
                     horizontal_alignment=ft.CrossAxisAlignment.CENTER,
@@ -79,7 +87,10 @@ class SelectFramework(AccordionStep):
     def before_update(self):
         """Handle component-specific updates before re-rendering."""
         # Update the selected card's background color
-        selected_fw_id = self.app_state["get_form_data"]()["framework"]
+        form_data = self.app_state["get_form_data"]()
+        selected_fw_id = "auto" if form_data.get("frameworkAuto") else form_data["framework"]
+        if form_data.get("frameworkAuto") and form_data["framework"] != "auto":
+            self.update_summary(f"Framework: {form_data['frameworkName']} (detected)")
         grid_view = self.content_control.controls[1]  # GridView is the second control
         for card in grid_view.controls:
             if card.data["id"] == selected_fw_id:
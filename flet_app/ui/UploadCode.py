@@ -1,14 +1,28 @@
 import flet as ft
 import shutil
+import time
 import uuid
 
 from .AccordionStep import AccordionStep
-from logic.downloader import GithubDownloader
+from logic.downloader import CancelToken, GithubDownloader
 from logic.extractor import ArchiveExtractor
+from logic.local_source import LocalDirectorySource
+from logic.detector import FrameworkDetector
 from logic.processor import ApplicationProcessor
+from logic.project_index import ProjectIndex
+from logic.project_view import ArchiveProjectView
 
 # Import from the new state management file
-from state import TEMP_STORAGE_PATH, JOB_STORE
+from state import (
+    ARCHIVE_CACHE_PATH,
+    EXTRACTION_EXECUTOR,
+    EXTRACTION_METRICS_LOG,
+    GIT_CACHE_PATH,
+    TEMP_STORAGE_PATH,
+    JOB_INDEXES,
+    JOB_STORE,
+    PENDING_JOBS,
+)
 
 
 class UploadCode(AccordionStep):
@@ -27,6 +41,10 @@ class UploadCode(AccordionStep):
         )
         repo_branch_field = ft.TextField(label="GitHub branch", hint_text="main")
         repo_folder_field = ft.TextField(label="Subfolder name", hint_text="app")
+        tarball_switch = ft.Switch(
+            label="Download as archive (faster for one-off validations, no git)",
+            value=False,
+        )
 
         # The FilePicker needs to be in the page's overlay
         file_picker = ft.FilePicker(on_result=lambda e: on_file_picked(e))
@@ -35,7 +53,19 @@ class UploadCode(AccordionStep):
         file_picker_button = ft.ElevatedButton(
             "Select Archive...",
             on_click=lambda _: file_picker.pick_files(
-                allow_multiple=False, allowed_extensions=["zip", "tar", "gz"]
+                allow_multiple=False,
+                allowed_extensions=[
+                    "zip",
+                    "tar",
+                    "gz",
+                    "tgz",
+                    "xz",
+                    "txz",
+                    "bz2",
+                    "tbz2",
+                    "zst",
+                    "tzst",
+                ],
             ),
         )
         selected_file_text = ft.Text("No file selected.")
@@ -46,10 +76,56 @@ class UploadCode(AccordionStep):
                 repo_url_field,
                 repo_branch_field,
                 repo_folder_field,
+                tarball_switch,
             ],
             visible=True,
         )
-        upload_view = ft.Column([file_picker_button, selected_file_text], visible=False)
+        upload_view = ft.Column(
+            [
+                ft.Text(
+                    "node_modules, virtualenvs, .git, __pycache__ and target/ "
+                    "folders are not extracted.",
+                    size=15,
+                    italic=True,
+                ),
+                file_picker_button,
+                selected_file_text,
+            ],
+            visible=False,
+        )
+
+        local_path_field = ft.TextField(
+            label="Local project folder",
+            hint_text="/home/user/my-app or file:///home/user/my-app",
+            expand=True,
+        )
+        dir_picker = ft.FilePicker(on_result=lambda e: on_dir_picked(e))
+        page.overlay.append(dir_picker)
+        local_view = ft.Column(
+            [
+                ft.Text(
+                    "Files ignored by .gitignore are skipped. The folder is "
+                    "linked, not copied, where possible.",
+                    size=15,
+                    italic=True,
+                ),
+                ft.Row(
+                    [
+                        local_path_field,
+                        ft.ElevatedButton(
+                            "Browse...",
+                            on_click=lambda _: dir_picker.get_directory_path(),
+                        ),
+                    ]
+                ),
+            ],
+            visible=False,
+        )
+
+        def on_dir_picked(e: ft.FilePickerResultEvent):
+            if e.path:
+                local_path_field.value = e.path
+                page.update()
 
         def on_file_picked(e: ft.FilePickerResultEvent):
             if e.files:
@@ -60,20 +136,114 @@ class UploadCode(AccordionStep):
             page.update()
 
         def switch_tabs(e):
-            is_github = e.control.selected_index == 0
-            github_view.visible = is_github
-            upload_view.visible = not is_github
+            github_view.visible = e.control.selected_index == 0
+            upload_view.visible = e.control.selected_index == 1
+            local_view.visible = e.control.selected_index == 2
             page.update()
 
         tabs = ft.Tabs(
             selected_index=0,
             on_change=switch_tabs,
-            tabs=[ft.Tab(text="From GitHub"), ft.Tab(text="Upload Archive")],
+            tabs=[
+                ft.Tab(text="From GitHub"),
+                ft.Tab(text="Upload Archive"),
+                ft.Tab(text="Local Folder"),
+            ],
         )
 
         progress_ring = ft.ProgressRing(visible=False)
+        progress_bar = ft.ProgressBar(width=400, visible=False)
+        progress_text = ft.Text(size=12, visible=False)
         error_text = ft.Text(color=ft.Colors.RED, visible=False)
 
+        def format_bytes(num):
+            for unit in ["B", "KiB", "MiB"]:
+                if num < 1024:
+                    return f"{num:.1f} {unit}"
+                num /= 1024
+            return f"{num:.1f} GiB"
+
+        last_progress_update = [0.0]
+        # Token of the download in progress, if any
+        current_cancel_token = [None]
+
+        def on_cancel(e):
+            if current_cancel_token[0]:
+                current_cancel_token[0].cancel()
+                cancel_button.disabled = True
+                progress_text.value = "Cancelling..."
+                page.update()
+
+        cancel_button = ft.OutlinedButton(
+            "Cancel", on_click=on_cancel, icon=ft.Icons.CANCEL, visible=False
+        )
+
+        def on_status(message):
+            progress_text.value = message
+            progress_text.visible = True
+            page.update()
+
+        def on_progress(progress):
+            # git reports many times per second; redraw at most ~10 times
+            now = time.monotonic()
+            if not progress["done"] and now - last_progress_update[0] < 0.1:
+                return
+            last_progress_update[0] = now
+
+            details = [progress["phase"]]
+            if progress["percent"] is not None:
+                details.append(
+                    f"{progress['percent']}% "
+                    f"({progress['objects']}/{progress['total_objects']})"
+                )
+            else:
+                details.append(str(progress["objects"]))
+            if progress["bytes"] is not None:
+                details.append(format_bytes(progress["bytes"]))
+            if progress["bytes_per_second"] is not None:
+                details.append(f"{format_bytes(progress['bytes_per_second'])}/s")
+
+            progress_bar.value = (
+                progress["percent"] / 100 if progress["percent"] is not None else None
+            )
+            progress_bar.visible = True
+            progress_text.value = " | ".join(details)
+            progress_text.visible = True
+            page.update()
+
+        def make_background_extraction(extractor, job_id, job_dir, source_info):
+            """
+            Returns the task that extracts the upload in the background. It
+            returns the status messages to show once GenerateFiles uses the tree.
+            """
+
+            def extract():
+                result = extractor.extract(str(job_dir))
+                JOB_INDEXES[job_id] = ProjectIndex(result["root_path"])
+                source_info["excluded"] = result["excluded"]
+                metrics = source_info["metrics"]
+                seconds = metrics["seconds"]
+                if metrics["cache_hit"]:
+                    messages = [
+                        f"Reused a previous extraction in {seconds['total']:.2f}s"
+                    ]
+                else:
+                    messages = [
+                        f"Extracted {metrics['files_written']} files "
+                        f"({format_bytes(metrics['bytes_written'])}) "
+                        f"in {seconds['total']:.2f}s: "
+                        f"decompress {seconds['decompress']:.2f}s, "
+                        f"write {seconds['write']:.2f}s"
+                    ]
+                if result["excluded"]["files"]:
+                    messages.append(
+                        f"Skipped {result['excluded']['files']} vendored or "
+                        f"cached file(s) ({format_bytes(result['excluded']['bytes'])})."
+                    )
+                return messages
+
+            return extract
+
         def on_validate(e):
             progress_ring.visible = True
             error_text.visible = False
@@ -87,15 +257,29 @@ class UploadCode(AccordionStep):
             project_path = ""
             project_name = ""
             source_info = {}
+            view = None
+            background_extraction = None
 
             try:
                 if tabs.selected_index == 0:
+                    current_cancel_token[0] = CancelToken()
+                    cancel_button.visible = True
+                    cancel_button.disabled = False
+                    page.update()
                     downloader = GithubDownloader(
                         repo_url_field.value,
                         repo_branch_field.value,
                         repo_folder_field.value if repo_folder_field.value else None,
+                        cache_dir=GIT_CACHE_PATH,
+                        partial_clone=True,
+                        method="tarball" if tarball_switch.value else "git",
+                        cancel_token=current_cancel_token[0],
+                    )
+                    result = downloader.download(
+                        str(job_dir),
+                        status_callback=on_status,
+                        progress_callback=on_progress,
                     )
-                    result = downloader.download(str(job_dir))
                     project_path = result["path"]
                     project_name = (
                         result["project_name"]
@@ -103,28 +287,140 @@ class UploadCode(AccordionStep):
                         .replace(" ", "-")
                         .lower()
                     )
-                    source_info = {"type": "github", "projectName": project_name}
+                    source_info = {
+                        "type": "github",
+                        "projectName": project_name,
+                        "skipped": result["skipped"],
+                    }
+                    skipped = result["skipped"]
+                    if skipped["files"]:
+                        page.open(
+                            ft.SnackBar(
+                                ft.Text(
+                                    f"Skipped {len(skipped['files'])} large file(s), "
+                                    "saving at least "
+                                    f"{format_bytes(skipped['bytes_saved'])}."
+                                ),
+                                duration=5000,
+                            )
+                        )
+                elif tabs.selected_index == 2:
+                    source = LocalDirectorySource(local_path_field.value)
+                    result = source.materialize(str(job_dir))
+                    project_path = result["root_path"]
+                    project_name = result["project_name"]
+                    source_info = {"type": "local", "projectName": project_name}
                 else:
                     file_data = selected_file_text.data
                     if not file_data:
                         raise ValueError("No file selected for upload.")
-                    extractor = ArchiveExtractor(file_data.path, file_data.name)
-                    result = extractor.extract(str(job_dir))
-                    project_path = result["root_path"]
+                    extraction_metrics = {}
+                    extractor = ArchiveExtractor(
+                        file_data.path,
+                        file_data.name,
+                        cache_dir=ARCHIVE_CACHE_PATH,
+                        metrics_callback=extraction_metrics.update,
+                        metrics_log=EXTRACTION_METRICS_LOG,
+                    )
+                    # Validation reads the few files it needs from the archive;
+                    # the tree is only extracted once a later step needs it
+                    view = ArchiveProjectView(extractor)
+                    inspection = extractor.inspect()
+                    project_path = str(job_dir / inspection["root_prefix"])
                     project_name = (
-                        result["project_name"]
+                        inspection["project_name"]
                         .replace("_", "-")
                         .replace(" ", "-")
                         .lower()
                     )
-                    source_info = {"type": "upload", "projectName": project_name}
+                    source_info = {
+                        "type": "upload",
+                        "projectName": project_name,
+                        "metrics": extraction_metrics,
+                    }
+                    background_extraction = make_background_extraction(
+                        extractor, job_id, job_dir, source_info
+                    )
+
+                if view is None:
+                    # Walked once here, then shared by every later step
+                    view = JOB_INDEXES[job_id] = ProjectIndex(project_path)
+
+                form_data = self.app_state["form_data"]
+                try:
+                    detection = FrameworkDetector(view).detect()
+                except Exception as e:
+                    # Detection is only a hint: a failure here blocks
+                    # validation only when the user asked for auto-detection,
+                    # which then reports that nothing was detected
+                    print(f"Framework detection failed: {e}")
+                    detection = {
+                        "framework": None,
+                        "name": None,
+                        "confidence": 0.0,
+                        "preselect": False,
+                        "evidence": {},
+                    }
+                source_info["detection"] = {
+                    "framework": detection["framework"],
+                    "confidence": detection["confidence"],
+                    "evidence": detection["evidence"],
+                }
+                if form_data.get("frameworkAuto"):
+                    if not detection["preselect"]:
+                        guess = (
+                            f" (best guess: {detection['name']}, "
+                            f"{detection['confidence']:.0%} confidence)"
+                            if detection["framework"]
+                            else ""
+                        )
+                        raise ValueError(
+                            f"Could not detect the framework{guess}. "
+                            "Please select it in step 1."
+                        )
+                    self.app_state["update_form_data"](
+                        {
+                            "framework": detection["framework"],
+                            "frameworkName": detection["name"],
+                        }
+                    )
+                    page.open(
+                        ft.SnackBar(
+                            ft.Text(
+                                f"Detected {detection['name']} "
+                                f"({detection['confidence']:.0%} confidence)."
+                            ),
+                            duration=5000,
+                        )
+                    )
+                elif (
+                    detection["preselect"]
+                    and detection["framework"] != form_data["framework"]
+                ):
+                    page.open(
+                        ft.SnackBar(
+                            ft.Text(
+                                f"This looks like a {detection['name']} project "
+                                f"({detection['confidence']:.0%} confidence), "
+                                f"but {form_data['frameworkName']} is selected."
+                            ),
+                            duration=5000,
+                        )
+                    )
 
                 processor = ApplicationProcessor(
-                    project_path, self.app_state["form_data"]["framework"]
+                    project_path, self.app_state["form_data"]["framework"], view=view
                 )
+                validation_started = time.monotonic()
                 processor.check_project()
+                print(f"Validation took {time.monotonic() - validation_started:.3f}s")
 
                 JOB_STORE[job_id] = project_path
+                if background_extraction:
+                    # Extract while the user goes through the next steps
+                    PENDING_JOBS[job_id] = EXTRACTION_EXECUTOR.submit(
+                        background_extraction
+                    )
                 self.app_state["update_form_data"](
                     {"jobId": job_id, "source": source_info}
                 )
@@ -134,9 +430,14 @@ class UploadCode(AccordionStep):
             except Exception as ex:
                 error_text.value = f"Error: {ex}"
                 error_text.visible = True
+                JOB_INDEXES.pop(job_id, None)
                 shutil.rmtree(job_dir, ignore_errors=True)
             finally:
+                current_cancel_token[0] = None
+                cancel_button.visible = False
                 progress_ring.visible = False
+                progress_bar.visible = False
+                progress_text.visible = False
                 page.update()
 
         content_control = ft.Column(
@@ -144,10 +445,13 @@ class UploadCode(AccordionStep):
                 tabs,
                 github_view,
                 upload_view,
+                local_view,
                 ft.ElevatedButton(
                     "Validate & Continue", on_click=on_validate, icon=ft.Icons.CHECK
                 ),
-                progress_ring,
+                ft.Row([progress_ring, cancel_button], spacing=10),
+                progress_bar,
+                progress_text,
                 error_text,
             ],
             spacing=15,